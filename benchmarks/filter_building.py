@@ -0,0 +1,49 @@
+"""
+Micro-benchmark of filter and aggregation building.
+
+Compares the operator resolution of `F.parse_key` with the previous linear scan over the operators,
+and times the construction of typical dynamic filters.
+
+    python -m benchmarks.filter_building
+"""
+import timeit
+
+from py_directus import F
+from py_directus.aggregator import Agg
+from py_directus.operators import FILTER_OPERATORS
+
+
+KEYS = ["age__gt", "user__name__icontains", "status", "tags__intersects_bbox", "created__between", "__or"]
+
+
+def linear_parse_key(key):
+    for _operator in FILTER_OPERATORS:
+        if key.endswith("_" + _operator):
+            return key[:-len("_" + _operator)].replace("__", ".") or None, _operator
+    return key.replace("__", "."), "_eq"
+
+
+def build_filter():
+    return (
+        F(status="published", date_created__gte="2024-01-01", author__role__name__in=["editor", "admin"])
+        & (F(title__icontains="directus") | F(tags__contains="python"))
+    )
+
+
+def build_aggregation():
+    return Agg("id__count") + Agg(sum="price", avg=["price", "quantity"])
+
+
+if __name__ == "__main__":
+    number = 100_000
+
+    benchmarks = {
+        "parse_key (linear scan)": lambda: [linear_parse_key(key) for key in KEYS],
+        "parse_key (compiled)": lambda: [F.parse_key(key) for key in KEYS],
+        "F building": build_filter,
+        "Agg building": build_aggregation,
+    }
+
+    for name, func in benchmarks.items():
+        seconds = min(timeit.repeat(func, number=number, repeat=5))
+        print(f"{name:<28} {seconds / number * 1e6:8.2f} us/op")
@@ -0,0 +1,34 @@
+"""
+Micro-benchmark of query building, a request built and serialized per call against a prepared query.
+
+    python -m benchmarks.prepared_query
+"""
+import json
+import timeit
+
+from py_directus import Directus, F, Param
+
+
+directus = Directus("http://directus.local", token="token")
+
+
+def build_request(post_id, statuses, limit):
+    return directus.collection("posts").fields("id", "title", "author.name").filter(
+        F(id=post_id) & F(status__in=statuses)
+    ).sort("date_created", asc=False).limit(limit)
+
+
+prepared = build_request(Param("id"), Param("statuses"), Param("limit")).prepare()
+
+
+if __name__ == "__main__":
+    number = 20_000
+
+    benchmarks = {
+        "build request + serialize": lambda: json.dumps({"query": build_request(5, ["draft", "review"], 10).params}),
+        "prepared query bind": lambda: prepared.bind(id=5, statuses=["draft", "review"], limit=10),
+    }
+
+    for name, func in benchmarks.items():
+        seconds = min(timeit.repeat(func, number=number, repeat=5))
+        print(f"{name:<28} {seconds / number * 1e6:8.2f} us/op")
@@ -6,6 +6,8 @@ from . import models as _models
 from .models.directus import *
 
 from .filter import F
+from .query import Param
+from .projection import get_model_fields
 from .directus import Directus
 
 try:
@@ -71,6 +73,9 @@ def rebuild_models():
     for var_name in global_var_names:
         globals_ref[var_name].model_rebuild(raise_errors=False)
 
+    # Fields of the rebuilt models may reference other models now
+    get_model_fields.cache_clear()
+
 
 def setup_models(directus_models: Type['BaseDirectusModels'] = BaseDirectusModels):
     """
@@ -108,7 +113,7 @@ def setup_models(directus_models: Type['BaseDirectusModels'] = BaseDirectusModel
 
 async def async_init(directus_base_url: str, directus_admin_token: str = None, 
                      directus_models: Type[BaseDirectusModels] = BaseDirectusModels, 
-                     load_translations: bool = False):
+                     load_translations: bool = False, translations_refresh_interval: Optional[float] = None):
     global directus_admin
     global directus_public
     global directus_url
@@ -124,9 +129,12 @@ async def async_init(directus_base_url: str, directus_admin_token: str = None,
     if directus_admin_token:
         directus_admin = await Directus(directus_url, token=directus_admin_token, connection=directus_session)
 
-    # Load Directus translations at startup
+    # Load Directus translations at startup, kept up to date when a refresh interval is given
+    # (incrementally with the administrator client, which has access to the activity)
     if load_translations:
-        translations = await directus_public.get_translations(clean=True)
+        translations = await (directus_admin or directus_public).translation_store(
+            refresh_interval=translations_refresh_interval
+        )
 
 
 rebuild_models()
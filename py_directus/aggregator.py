@@ -1,8 +1,30 @@
 import json
-from typing import Union, List
+from functools import lru_cache
+from typing import Optional, Union, List, Tuple
 
 from py_directus.expression import Expression
-from py_directus.operators import AGGREGATION_OPERATORS, AggregationOperators
+from py_directus.operators import AGGREGATION_OPERATORS, AggregationOperators, compile_operator_pattern
+
+
+AGGREGATION_KEY_PATTERN = compile_operator_pattern(AGGREGATION_OPERATORS)
+
+
+@lru_cache(maxsize=1024)
+def _parse_aggregation_key(key: str) -> Tuple[Optional[str], str]:
+    """
+    Split an aggregation key (`price__sum`) into its field and operator.
+    """
+    match = AGGREGATION_KEY_PATTERN.match(key)
+
+    # No operator matched, which we assume was not provided.
+    # Thus we use the default 'count' operator.
+    if match is None:
+        return key.replace("__", "."), "count"
+
+    field, operator = match.groups()
+
+    # Deep fields
+    return (field.replace("__", ".") or None), operator[1:]
 
 
 class Agg(Expression):
@@ -62,31 +84,7 @@ class Agg(Expression):
 
     @staticmethod
     def parse_key(key):
-        field = None
-        operator = None
-
-        for _operator in AGGREGATION_OPERATORS:
-            if key.endswith("_" + _operator):
-                field = key[:-len("_" + _operator)]
-                operator = _operator
-                break
-
-        # No operator matched, which we assume was not provided.
-        # Thus we use the default 'count' operator.
-        if field is None:
-            operator = "count"
-            field = key.replace("__", ".")
-            return field, operator
-
-        # Deep fields
-        field = field.replace("__", ".")
-
-        if operator:
-            operator = operator[1:]
-
-        if field == "":
-            field = None
-        return field, operator
+        return _parse_aggregation_key(key)
 
     def _add(self, operator: Union[AggregationOperators, str, None] = None, fields: Union[str, List[str], None] = None):
         if operator and fields:
@@ -1,5 +1,5 @@
 # Based on the cache implementation in Zeep: https://github.com/mvantellingen/python-zeep/blob/4.2.1/src/zeep/cache.py
-import base64
+import hashlib
 import logging
 from abc import ABC, abstractmethod
 from typing import Dict, Tuple, Union, Optional
@@ -41,6 +41,9 @@ class SimpleMemoryCache(Base):
     # cache persistent throughout class instances, thread-safe by default
     _cache: Dict[str, Tuple[datetime, Union[str, bytes]]] = {}
 
+    # Original queries of the keys, only kept while debug logging is enabled
+    _queries: Dict[str, str] = {}
+
     def __init__(self, unique_id: str, timeout: int=3600):
         self._timeout = timeout
 
@@ -57,6 +60,10 @@ class SimpleMemoryCache(Base):
             )
 
         self._cache[q_key] = (datetime.utcnow(), content)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            self._queries[q_key] = query
+
         return True
 
     async def get(self, query: str):
@@ -90,6 +97,7 @@ class SimpleMemoryCache(Base):
     async def clear(self, select_all: bool=False):
         if select_all:
             self._cache.clear()
+            self._queries.clear()
         else:
             for key in list(self._cache):
                 if key.startswith(self.unique_id):
@@ -100,6 +108,8 @@ class SimpleMemoryCache(Base):
         return True
 
     def _delete(self, q_key: str):
+        self._queries.pop(q_key, None)
+
         if self._cache.pop(q_key, None) is not None:
             return True
         return False
@@ -133,12 +143,20 @@ class SimpleMemoryCache(Base):
     def _get_query_key(self, query: str) -> str:
         """
         Expose the version prefix to be used in content serialization.
+
+        The query is stored as a fixed-size digest, whatever its length.
         """
-        q_key = base64.b64encode(query.encode('utf-8'))
+        q_key = hashlib.blake2b(query.encode('utf-8'), digest_size=16).hexdigest()
 
-        prefix = f"{self.unique_id}:{q_key.decode('utf-8')}"
+        prefix = f"{self.unique_id}:{q_key}"
         return prefix
 
+    def get_query(self, q_key: str) -> Optional[str]:
+        """
+        The original query of a key, available while debug logging is enabled.
+        """
+        return self._queries.get(q_key)
+
 
 def _is_expired(value: datetime, timeout: int) -> bool:
     """
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Optional, Union, Any, Dict, List, Set, Iterable, AsyncIterator
+
+from py_directus.filter import F
+
+if TYPE_CHECKING:
+    from py_directus import Directus
+
+
+logger = logging.getLogger(__name__)
+
+# Number of activity entries requested at once
+CHANGES_BATCH_SIZE = 100
+
+# Actions of the activity changing items
+CHANGE_ACTIONS = ("create", "update", "delete")
+
+# Ids below the last entry given that are read again, entries of concurrent transactions commit out of id order
+CHANGES_OVERLAP = 100
+
+
+class Change:
+    """
+    Activity entry of a change of an item, with its revision when requested.
+    """
+
+    def __init__(self, activity: Dict[str, Any], revision: Optional[Dict[str, Any]] = None):
+        self.activity: Dict[str, Any] = activity
+        self.revision: Optional[Dict[str, Any]] = revision
+
+    @property
+    def id(self) -> int:
+        return int(self.activity["id"])
+
+    @property
+    def action(self) -> str:
+        return self.activity.get("action")
+
+    @property
+    def collection(self) -> str:
+        return self.activity.get("collection")
+
+    @property
+    def item(self) -> str:
+        return self.activity.get("item")
+
+    @property
+    def timestamp(self) -> Optional[str]:
+        return self.activity.get("timestamp")
+
+    @property
+    def data(self) -> Optional[Dict[str, Any]]:
+        """
+        The item after the change (from the revision).
+        """
+        return self.revision.get("data") if self.revision else None
+
+    @property
+    def delta(self) -> Optional[Dict[str, Any]]:
+        """
+        The changed fields of the item (from the revision).
+        """
+        return self.revision.get("delta") if self.revision else None
+
+    @property
+    def cursor(self) -> str:
+        """
+        Resume the changes after this one with `since=change.cursor`.
+        """
+        return str(self.id)
+
+    def __repr__(self):
+        return f"<Change {self.id} {self.action} {self.collection}/{self.item}>"
+
+
+class ChangeFeed:
+    """
+    Changes of items in activity order, after a cursor.
+
+    Entries are requested in batches by their id (never with an offset), so resuming from a cursor
+    costs the same whatever the number of earlier entries.
+
+    Entries committed after entries with higher ids are given late, as long as they are within `overlap`
+    ids of the last entry given. The window is read again while the feed runs, without the entries already
+    given, so no entry is given twice. Entries committed later than that, or below the cursor a feed is
+    resumed from, are missed (at-most-once delivery).
+    """
+
+    def __init__(
+            self, directus: 'Directus', collections: Optional[Iterable[str]] = None,
+            since: Optional[Union[str, int]] = None, actions: Iterable[str] = CHANGE_ACTIONS,
+            revisions: bool = False, batch_size: int = CHANGES_BATCH_SIZE,
+            follow: bool = False, poll_interval: float = 5, overlap: int = CHANGES_OVERLAP
+    ):
+        self.directus: 'Directus' = directus
+        self.collections: Optional[List[str]] = list(collections) if collections else None
+        self.actions: List[str] = list(actions)
+        self.revisions: bool = revisions
+        self.batch_size: int = batch_size
+        self.follow: bool = follow
+        self.poll_interval: float = poll_interval
+        self.overlap: int = overlap
+
+        # Id of the last entry given, as an opaque string
+        self.cursor: Optional[str] = str(since) if since is not None else None
+
+        # Entries up to the starting cursor are never read, the ones given since within the overlap are skipped
+        self._since: Optional[int] = int(since) if since is not None else None
+        self._given: Set[int] = set()
+
+    def _window_start(self) -> Optional[int]:
+        if self.cursor is None:
+            return None
+
+        start = int(self.cursor) - self.overlap
+        return start if self._since is None else max(start, self._since)
+
+    def _filter(self) -> F:
+        query = F(action__in=self.actions)
+        if self.collections:
+            query &= F(collection__in=self.collections)
+
+        start = self._window_start()
+        if start is not None:
+            query &= F(id__gt=start)
+
+            given = sorted(id for id in self._given if id > start)
+            if given:
+                query &= F(id__nin=given)
+
+        return query
+
+    async def _read_batch(self) -> List[Change]:
+        response = await self.directus.collection("directus_activity") \
+            .filter(self._filter()) \
+            .fields("id", "action", "collection", "item", "timestamp", "user") \
+            .sort("id").limit(self.batch_size).read()
+        activities = response.items_as_dict() or []
+
+        revisions = {}
+        if self.revisions and activities:
+            response = await self.directus.collection("directus_revisions") \
+                .filter(activity__in=[activity["id"] for activity in activities]) \
+                .fields("id", "activity", "collection", "item", "data", "delta") \
+                .limit(-1).read()
+
+            for revision in response.items_as_dict() or []:
+                activity_id = revision["activity"]["id"] if isinstance(revision["activity"], dict) else revision["activity"]
+                revisions[str(activity_id)] = revision
+
+        return [Change(activity, revisions.get(str(activity["id"]))) for activity in activities]
+
+    async def __aiter__(self) -> AsyncIterator[Change]:
+        while True:
+            changes = await self._read_batch()
+
+            for change in changes:
+                self._given.add(change.id)
+                if self.cursor is None or change.id > int(self.cursor):
+                    self.cursor = change.cursor
+                yield change
+
+            # Only the entries within the overlap are skipped by id
+            start = self._window_start()
+            self._given = {id for id in self._given if start is None or id > start}
+
+            if len(changes) < self.batch_size:
+                if not self.follow:
+                    return
+
+                # Caught up, wait for new changes
+                await asyncio.sleep(self.poll_interval)
+
+    async def latest(self) -> Optional[str]:
+        """
+        The cursor of the last change, e.g. to only follow the changes made from now on.
+        """
+        response = await self.directus.collection("directus_activity") \
+            .filter(self._filter()).fields("id").sort("id", asc=False).limit(1).read()
+        activity = response.item_as_dict()
+
+        return str(activity["id"]) if activity else self.cursor
@@ -0,0 +1,212 @@
+import copy
+import json
+import logging
+from datetime import datetime
+from typing import Optional, Any, Dict, List
+
+from py_directus.cache import _is_expired
+from py_directus.predicate import UnsupportedQuery, compile_filter, sort_items
+from py_directus.projection import get_field_tree, project_item
+from py_directus.query import normalize_query
+
+
+logger = logging.getLogger(__name__)
+
+# Number of items Directus returns when no limit is given (`QUERY_LIMIT_DEFAULT`)
+DEFAULT_QUERY_LIMIT = 100
+
+# Items of the complete results kept at most, the oldest results are dropped first
+CONTAINMENT_MAX_ITEMS = 10000
+
+# Parameters of queries which are never evaluated locally
+UNSUPPORTED_PARAMS = ("search", "aggregate", "groupBy", "deep", "meta", "alias", "backlink")
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _operands(query: Dict[str, Any]) -> List[str]:
+    if list(query) == ["_and"]:
+        return [_canonical(operand) for operand in query["_and"]]
+    return [_canonical(query)]
+
+
+def _is_contained(narrower: Optional[Dict[str, Any]], broader: Optional[Dict[str, Any]]) -> bool:
+    """
+    Whether the items matching the narrower filter are all matching the broader one,
+    the broader filter being none, the same filter or a part of a conjunction of the narrower one.
+    """
+    if not broader:
+        return True
+    if not narrower:
+        return False
+
+    return set(_operands(broader)).issubset(_operands(narrower))
+
+
+class _CompleteResult:
+    """
+    Every item matching a query.
+    """
+
+    def __init__(self, params: Dict[str, Any], items: List[Dict[Any, Any]]):
+        self.params: Dict[str, Any] = params
+        self.items: List[Dict[Any, Any]] = items
+        self.fields: Dict[str, Any] = get_field_tree(params.get("fields"))
+        self.created: datetime = datetime.utcnow()
+
+
+class ContainmentCache:
+    """
+    Answer queries locally from cached results which hold every item matching a broader query.
+
+    A result is complete when it was not limited (`limit=-1`, or fewer items than the limit). A later query
+    of the collection is evaluated on the items of such a result, without a request, when its filter narrows
+    the filter of the result, and the fields it filters, sorts and requests are part of the result.
+
+    The results hold `max_items` items at most, the oldest results are dropped first.
+    """
+
+    def __init__(
+            self, timeout: Optional[int] = 3600, key: str = "id", default_limit: int = DEFAULT_QUERY_LIMIT,
+            max_items: int = CONTAINMENT_MAX_ITEMS
+    ):
+        self._timeout: Optional[int] = timeout
+        self.key: str = key
+        self.default_limit: int = default_limit
+        self.max_items: int = max_items
+
+        self._results: Dict[str, Dict[str, _CompleteResult]] = {}
+
+        # Items of every kept result
+        self._size: int = 0
+
+    def _limit(self, params: Dict[str, Any]) -> int:
+        limit = params.get("limit")
+        return self.default_limit if limit is None else int(limit)
+
+    def add(self, collection: str, params: Dict[Any, Any], data: Any) -> bool:
+        """
+        Keep the result of a query, when it is complete.
+
+        :return: Whether the result was kept
+        """
+        params = normalize_query(params)
+
+        if any(params.get(name) for name in UNSUPPORTED_PARAMS) or not isinstance(data, list):
+            return False
+        if params.get("offset") or (params.get("page") or 1) != 1:
+            return False
+
+        limit = self._limit(params)
+        if limit != -1 and len(data) >= limit:
+            return False
+        if len(data) > self.max_items:
+            return False
+
+        params = {name: value for name, value in params.items() if name not in ("limit", "offset", "page")}
+        result_key = _canonical(params)
+
+        self._remove(collection, result_key)
+        self._make_room(len(data))
+
+        self._results.setdefault(collection, {})[result_key] = _CompleteResult(params, copy.deepcopy(data))
+        self._size += len(data)
+
+        logger.debug("Caching the complete result of %s (%d items)", collection, len(data))
+        return True
+
+    def get(self, collection: str, params: Dict[Any, Any], id: Any = None) -> Optional[Any]:
+        """
+        The result of a query evaluated on a cached complete result, `None` when no result contains it.
+
+        :param id: Read a single item by its primary key
+        """
+        params = normalize_query(params)
+
+        if any(params.get(name) for name in UNSUPPORTED_PARAMS):
+            return None
+
+        query_filter = params.get("filter") or None
+        if id is not None:
+            query_filter = {"_and": [query_filter, {self.key: {"_eq": id}}]} if query_filter else {self.key: {"_eq": id}}
+
+        for result_key, result in list(self._results.get(collection, {}).items()):
+            if _is_expired(result.created, self._timeout):
+                self._remove(collection, result_key)
+                continue
+
+            if not _is_contained(query_filter, result.params.get("filter")):
+                continue
+
+            try:
+                data = self._evaluate(result, params, query_filter, id is not None)
+            except UnsupportedQuery as exc:
+                logger.debug("Query of %s not evaluated locally: %s", collection, exc)
+                continue
+
+            if id is not None and data is None:
+                # Missing items are left to Directus to report
+                continue
+
+            logger.debug("Containment cache HIT for %s", collection)
+            return data
+
+        return None
+
+    def _evaluate(
+            self, result: _CompleteResult, params: Dict[str, Any], query_filter: Optional[Dict[str, Any]], single: bool
+    ) -> Any:
+        predicate = compile_filter(query_filter, key=self.key)
+        items = [item for item in result.items if predicate(item)]
+
+        # Items of the same query come in the same order, else they are sorted by the primary key by default
+        sort = params.get("sort") or [self.key]
+        if sort != (result.params.get("sort") or [self.key]):
+            items = sort_items(items, sort, key=self.key)
+
+        fields = get_field_tree(params.get("fields"))
+        if single:
+            return project_item(items[0], fields, result.fields, self.key) if items else None
+
+        limit = self._limit(params)
+        offset = params.get("offset") or 0
+        if params.get("page"):
+            offset = (int(params["page"]) - 1) * limit
+
+        items = items[int(offset):]
+        if limit != -1:
+            items = items[:limit]
+
+        return [project_item(item, fields, result.fields, self.key) for item in items]
+
+    def _remove(self, collection: str, result_key: str):
+        result = self._results.get(collection, {}).pop(result_key, None)
+        if result is not None:
+            self._size -= len(result.items)
+
+    def _make_room(self, size: int):
+        # Expired results first, then the oldest ones
+        results = sorted(
+            ((result.created, collection, result_key) for collection, collection_results in self._results.items()
+             for result_key, result in collection_results.items()),
+            key=lambda entry: entry[0]
+        )
+
+        for created, collection, result_key in results:
+            if self._size + size <= self.max_items and not _is_expired(created, self._timeout):
+                break
+            self._remove(collection, result_key)
+
+    def invalidate(self, collection: str):
+        """
+        Forget the results of a collection, e.g. when its items change.
+        """
+        for result_key in list(self._results.get(collection, {})):
+            self._remove(collection, result_key)
+        self._results.pop(collection, None)
+
+    def clear(self):
+        self._results.clear()
+        self._size = 0
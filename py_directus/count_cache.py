@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional, Any, Dict, Tuple, Callable, Awaitable
+
+from py_directus.cache import _is_expired
+from py_directus.query import get_query_digest
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds a count is kept, counts of paginated lists may lag behind for a while
+COUNT_CACHE_TIMEOUT = 300
+
+# Parameters of a request deciding which items are counted
+COUNT_PARAMS = ("filter", "search")
+
+
+def get_count_params(params: Dict[Any, Any]) -> Dict[Any, Any]:
+    """
+    The parameters of a request counting its items, without its page, sort or fields.
+    """
+    return {key: params[key] for key in COUNT_PARAMS if key in params}
+
+
+class CountCache:
+    """
+    Item counts by collection and normalized filter, kept apart from the pages they are shown with.
+
+    Pages of a list share the count of their filter, whatever their sort, fields or position.
+    Concurrent reads of the same count share a single request.
+    """
+
+    def __init__(self, timeout: Optional[int] = COUNT_CACHE_TIMEOUT):
+        self._timeout: Optional[int] = timeout
+
+        # Counts by collection and digest of the count parameters
+        self._counts: Dict[str, Dict[str, Tuple[datetime, int]]] = {}
+        self._pending: Dict[Tuple[str, str], asyncio.Future] = {}
+
+        # Incremented when the counts of a collection are invalidated, counts read meanwhile are not kept
+        self._generations: Dict[str, int] = {}
+
+    def get(self, collection: str, params: Dict[Any, Any]) -> Optional[int]:
+        digest = get_query_digest(get_count_params(params))
+        entry = self._counts.get(collection, {}).get(digest)
+
+        if entry is None:
+            return None
+
+        created, count = entry
+        if _is_expired(created, self._timeout):
+            del self._counts[collection][digest]
+            return None
+
+        return count
+
+    def add(self, collection: str, params: Dict[Any, Any], count: int):
+        digest = get_query_digest(get_count_params(params))
+        self._counts.setdefault(collection, {})[digest] = (datetime.utcnow(), count)
+
+    async def get_or_read(
+            self, collection: str, params: Dict[Any, Any], read: Callable[[], Awaitable[int]]
+    ) -> int:
+        """
+        The cached count of the parameters, else read once for all the concurrent callers.
+        """
+        count = self.get(collection, params)
+        if count is not None:
+            logger.debug("Count HIT for %s", collection)
+            return count
+
+        key = (collection, get_query_digest(get_count_params(params)))
+        if key in self._pending:
+            return await asyncio.shield(self._pending[key])
+
+        logger.debug("Count MISS for %s", collection)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        generation = self._generations.get(collection, 0)
+
+        try:
+            count = await read()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Retrieved, only the callers waiting for it re-raise it
+            future.exception()
+            raise
+        else:
+            future.set_result(count)
+            if self._generations.get(collection, 0) == generation:
+                self.add(collection, params, count)
+        finally:
+            del self._pending[key]
+
+        return count
+
+    def invalidate(self, collection: str):
+        """
+        Forget the counts of a collection, e.g. when items are created or deleted.
+        """
+        self._counts.pop(collection, None)
+        self._generations[collection] = self._generations.get(collection, 0) + 1
+
+    def clear(self):
+        for collection in {*self._counts, *(collection for collection, _ in self._pending)}:
+            self.invalidate(collection)
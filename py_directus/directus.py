@@ -1,27 +1,45 @@
 import os
 import re
+import json
 import asyncio
+import hashlib
 import datetime
 import inspect
-from io import BytesIO
-# import aiofiles
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import (
     TYPE_CHECKING, 
     Union, Optional, 
-    Type, Any, List, Dict, Tuple
+    Type, Any, List, Dict, Set, Tuple, Callable, Iterable, Iterator, AsyncIterable
 )
 
-import magic
+import aiofiles
+import aiofiles.os
+
 from httpx import AsyncClient, Auth, Response
 from pydantic import BaseModel
 
 import py_directus
 from py_directus.cache import SimpleMemoryCache
+from py_directus.changes import CHANGE_ACTIONS, CHANGES_BATCH_SIZE, CHANGES_OVERLAP, ChangeFeed
+from py_directus.containment import ContainmentCache
+from py_directus.count_cache import CountCache
 from py_directus.directus_request import DirectusRequest
 from py_directus.directus_response import DirectusResponse
-from py_directus.storage import save_file
-from py_directus.transformation import ImageFileTransform
-from py_directus.utils import parse_translations
+from py_directus.entity_cache import EntityCache
+from py_directus.filter import F
+from py_directus.folders import FolderIndex, normalize_folder_path
+from py_directus.loader import DataLoader
+from py_directus.mirror import AssetMirror, SyncResult
+from py_directus.replica import Replica
+from py_directus.query import get_query_digest
+from py_directus.multipart import UPLOAD_CHUNK_SIZE, prepare_upload, sniff_file_mime
+from py_directus.storage import Storage, default_storage
+from py_directus.translation_store import TranslationStore
+from py_directus.transformation import ImageFileTransform, PresetRegistry, image_presets
+from py_directus.transfers import TRANSFER_CONCURRENCY, TransferResult, run_transfers
+from py_directus.tus import TUS_CHUNK_SIZE, TUS_CHUNK_TIMEOUT, TusUpload
+from py_directus.utils import parse_translations, retry_async
 
 try:
     from starlette.datastructures import UploadFile
@@ -29,6 +47,62 @@ except ImportError:
     UploadFile = None
 
 
+# Size of the chunks written to disk while streaming a download
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Smallest byte range fetched by a single connection of a ranged download
+DOWNLOAD_MIN_PART_SIZE = 4 * 1024 * 1024
+
+# Loaders of the current loader scope, by client (see `Directus.loader_scope`)
+_loader_scopes: ContextVar[Optional[Dict[int, Dict[str, DataLoader]]]] = ContextVar("loader_scopes", default=None)
+
+
+def _get_file_name(response: Response, default: str) -> str:
+    """
+    Get the file name from the `content-disposition` header of an asset response.
+    """
+    d = response.headers.get('content-disposition', "")
+    fname = re.findall("filename=[\"\'](.+)[\"\']", d)
+    return fname[0] if fname else default
+
+
+def _get_range_validator(response: Response) -> Optional[str]:
+    """
+    Validator of an asset response usable in `If-Range`, its strong ETag or else its Last-Modified date.
+    """
+    etag = response.headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return response.headers.get("last-modified")
+
+
+async def _read_validator(partial_path: str) -> Optional[str]:
+    validator_path = f"{partial_path}.validator"
+    if not await aiofiles.os.path.exists(validator_path):
+        return None
+
+    async with aiofiles.open(validator_path, 'r') as f:
+        return (await f.read()).strip() or None
+
+
+async def _write_validator(partial_path: str, validator: Optional[str]):
+    validator_path = f"{partial_path}.validator"
+    if validator:
+        async with aiofiles.open(validator_path, 'w') as f:
+            await f.write(validator)
+    elif await aiofiles.os.path.exists(validator_path):
+        await aiofiles.os.remove(validator_path)
+
+
+async def _notify_progress(
+        progress: Optional[Callable[[int, Optional[int]], Any]], downloaded: int, total: Optional[int]
+):
+    if progress is not None:
+        progress_res = progress(downloaded, total)
+        if inspect.isawaitable(progress_res):
+            await progress_res
+
+
 class BearerAuth(Auth):
     def __init__(self, token: str):
         self.token = token
@@ -47,7 +121,10 @@ class Directus:
     def __init__(
             self, url: str, email: str = None, password: str = None,
             token: str = None, refresh_token: str = None,
-            connection: AsyncClient = None
+            connection: AsyncClient = None, storage: Optional[Storage] = None,
+            entity_cache: Union[bool, EntityCache] = False,
+            containment_cache: Union[bool, ContainmentCache] = False,
+            count_cache: Union[bool, CountCache] = False
     ):
         self.expires = None
         self.expiration_time = None
@@ -70,10 +147,47 @@ class Directus:
 
         # Cache
         self.cache: Union[SimpleMemoryCache, None] = None
+        self.folders: FolderIndex = FolderIndex(self)
+
+        # Normalized cache of the items, by collection and primary key
+        self.entities: Optional[EntityCache] = None
+        if isinstance(entity_cache, EntityCache):
+            self.entities = entity_cache
+        elif entity_cache:
+            self.entities = EntityCache()
+
+        # Complete results answering narrower queries locally
+        self.containment: Optional[ContainmentCache] = None
+        if isinstance(containment_cache, ContainmentCache):
+            self.containment = containment_cache
+        elif containment_cache:
+            self.containment = ContainmentCache()
+
+        # Item counts of filters, kept apart from the pages
+        self.counts: Optional[CountCache] = None
+        if isinstance(count_cache, CountCache):
+            self.counts = count_cache
+        elif count_cache:
+            self.counts = CountCache()
+
+        # Loaders of the reads by id in batches outside a loader scope, by collection and query
+        self.loaders: Dict[str, DataLoader] = {}
+
+        # In-memory copies of collections, by collection
+        self.replicas: Dict[str, Replica] = {}
+
+        # Translation records kept up to date
+        self.translations: Optional[TranslationStore] = None
+
+        # Storage of downloaded files
+        self.storage: Storage = storage or default_storage
 
         # Any async tasks for later gathering
         self.tasks: List[DirectusResponse] = []
 
+        # Background warmups of image presets
+        self.warmup_tasks: Set[asyncio.Task] = set()
+
     def __await__(self):
         async def closure():
             # Perform login when credentials are present and no token
@@ -116,6 +230,114 @@ class Directus:
             f"You gave: {collection}"
         )
 
+    def get_loader(
+            self, collection: str, collection_class: Optional[Union[Type[BaseModel], str]] = None,
+            params: Optional[Dict[Any, Any]] = None, key: str = "id",
+            scope: Optional[Dict[str, DataLoader]] = None
+    ) -> DataLoader:
+        """
+        The loader batching the reads by id of a collection (with the same query parameters).
+
+        Loaded items are kept for the rest of the loader scope (`loader_scope`), outside a scope
+        they are only shared by the reads of the same batch.
+
+        :param scope: The loaders of another scope, e.g. of a single execution of a fetch plan
+        """
+        if scope is None:
+            scope = (_loader_scopes.get() or {}).get(id(self))
+
+        loader = DataLoader(
+            self, collection, collection_class=collection_class, params=params, key=key, cache=scope is not None
+        )
+        loader_key = f"{collection}_{key}_{get_query_digest(loader.params)}"
+
+        return (self.loaders if scope is None else scope).setdefault(loader_key, loader)
+
+    @contextmanager
+    def loader_scope(self) -> Iterator[Dict[str, DataLoader]]:
+        """
+        Keep the items loaded in batches until the end of the block, e.g. of the handling of a request.
+
+        The scope follows the context of the coroutines (and tasks) started within it.
+
+        :example:
+                with directus.loader_scope():
+                    authors = await asyncio.gather(*[
+                        directus.collection("authors").read(post["author"], batch=True) for post in posts
+                    ])
+        """
+        scopes = _loader_scopes.get() or {}
+        loaders: Dict[str, DataLoader] = {}
+        token = _loader_scopes.set({**scopes, id(self): loaders})
+
+        try:
+            yield loaders
+        finally:
+            _loader_scopes.reset(token)
+
+    async def replicate(
+            self, collection: Union[Type[BaseModel], str], key: str = "id", indexes: Iterable[str] = (),
+            fields: Optional[List[str]] = None, refresh_interval: Optional[float] = None, **kwargs
+    ) -> Replica:
+        """
+        Load a (small) collection in memory, to be queried locally (see `py_directus.replica.Replica`).
+
+        :param key: The primary key field of the collection
+        :param indexes: Fields with hash indexes, for the lookups by their value
+        :param refresh_interval: Seconds between background refreshes, none when not given
+        """
+        request = self.collection(collection)
+
+        replica = Replica(
+            self, request.collection, request.collection_class, key=key, indexes=indexes, fields=fields, **kwargs
+        )
+        await replica.load()
+
+        if request.collection in self.replicas:
+            self.replicas[request.collection].stop()
+        self.replicas[request.collection] = replica
+
+        if refresh_interval:
+            replica.start(refresh_interval)
+
+        return replica
+
+    def changes(
+            self, collections: Optional[Iterable[str]] = None, since: Optional[Union[str, int]] = None,
+            actions: Iterable[str] = CHANGE_ACTIONS, revisions: bool = False,
+            batch_size: int = CHANGES_BATCH_SIZE, follow: bool = False, poll_interval: float = 5,
+            overlap: int = CHANGES_OVERLAP
+    ) -> ChangeFeed:
+        """
+        Changes of items in activity order, after a cursor (see `py_directus.changes.ChangeFeed`).
+
+        :example:
+                feed = directus.changes(["articles"], since=saved_cursor, revisions=True)
+                async for change in feed:
+                    index(change.collection, change.item, change.data)
+                saved_cursor = feed.cursor
+
+        :param collections: Collections of the changes, every collection when not given
+        :param since: Cursor of the last change already consumed, every change when not given
+        :param revisions: Join every change with its revision (`data` and `delta`)
+        :param follow: Keep polling for new changes once caught up, every `poll_interval` seconds
+        :param overlap: Ids below the last change read again for the changes committed late
+        """
+        return ChangeFeed(
+            self, collections=collections, since=since, actions=actions, revisions=revisions,
+            batch_size=batch_size, follow=follow, poll_interval=poll_interval, overlap=overlap
+        )
+
+    def clear_loaders(self, collection: Optional[str] = None):
+        """
+        Forget the items loaded in batches (in the current loader scope), of a collection or of every collection.
+        """
+        scope = (_loader_scopes.get() or {}).get(id(self)) or {}
+
+        for loader in [*self.loaders.values(), *scope.values()]:
+            if collection is None or loader.collection == collection:
+                loader.clear()
+
     async def me(self, cache=False, as_task=False) -> DirectusResponse:
         """
         Retrieve logged in user's information.
@@ -138,12 +360,14 @@ class Directus:
             quality: Optional[int] = None,
             withoutEnlargement: Optional[bool] = None,
             img_format: Optional[str] = None,
+            preset: Optional[str] = None,
             **kwargs
     ) -> str:
         """
         Generate endpoint for a specific file with transformation parameters.
 
         :param file_id: UUID of the file record in Directus.
+        :param preset: (optional) Key of a registered image preset, replaces every other transformation parameter.
         """
         url = f"{py_directus.directus_url}/assets/{file_id}"
 
@@ -155,6 +379,7 @@ class Directus:
             quality=quality,
             withoutEnlargement=withoutEnlargement,
             img_format=img_format,
+            preset=preset,
             **kwargs
         ).parameters
 
@@ -163,6 +388,19 @@ class Directus:
 
         return url
 
+    @classmethod
+    def get_srcset(cls, file_id: str, *presets: str) -> str:
+        """
+        Generate a `srcset` attribute value for a file from image presets with a width.
+
+        :param file_id: UUID of the file record in Directus.
+        :param presets: Keys of registered image presets, all presets with a width when missing.
+        """
+        selected = [image_presets[key] for key in presets] if presets else list(image_presets)
+        selected = sorted((preset for preset in selected if preset.width), key=lambda preset: preset.width)
+
+        return ", ".join(f"{cls.get_file_url(file_id, preset=preset.key)} {preset.width}w" for preset in selected)
+
     async def download_file(
             self, file_id: str,
             fit: Optional[str] = None,
@@ -170,99 +408,485 @@ class Directus:
             quality: Optional[int] = None,
             withoutEnlargement: Optional[bool] = None,
             img_format: Optional[str] = None,
+            stream: bool = False,
+            chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+            progress: Optional[Callable[[int, Optional[int]], Any]] = None,
+            resume: bool = True,
+            connections: Optional[int] = None,
+            storage: Optional[Storage] = None,
+            preset: Optional[str] = None,
             **kwargs
     ) -> Response:
         """
         Download a file from Directus.
 
         :param file_id: UUID of the file record in Directus.
+        :param stream: Write the file to storage chunk by chunk as it arrives, instead of buffering it in memory.
+        :param chunk_size: (stream) Size in bytes of the chunks written to storage.
+        :param progress: (stream) Callable (or coroutine function) receiving the downloaded and total bytes.
+        :param resume: (stream) Continue from a previously interrupted download of the same file, via HTTP Range.
+        :param connections: Split the asset in byte ranges fetched over this many concurrent connections.
+                            Implies `stream`. The response of the `HEAD` request for the asset is returned.
+        :param storage: (optional) Storage backend of the file, defaults to the storage of the client.
+        :param preset: (optional) Key of a registered image preset, replaces every other transformation parameter.
+        """
+        response, _ = await self._download_file(
+            file_id,
+            ImageFileTransform(
+                fit=fit,
+                width=width,
+                height=height,
+                quality=quality,
+                withoutEnlargement=withoutEnlargement,
+                img_format=img_format,
+                preset=preset,
+                **kwargs
+            ).parameters,
+            stream=stream, chunk_size=chunk_size, progress=progress, resume=resume, connections=connections,
+            storage=storage
+        )
+
+        return response
+
+    async def _download_file(
+            self, file_id: str, img_transform_parameters: Dict[str, Any],
+            stream: bool = False,
+            chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+            progress: Optional[Callable[[int, Optional[int]], Any]] = None,
+            resume: bool = True,
+            connections: Optional[int] = None,
+            destination: Optional[str] = None,
+            storage: Optional[Storage] = None
+    ) -> Tuple[Response, Optional[str]]:
+        """
+        Download a file and return the response along with the saved file name (`None` when not saved).
+
+        Given a `destination` path, the file is streamed to that exact path instead of the storage.
         """
         url = f"{self.url}/assets/{file_id}"
+        storage = storage or self.storage
 
         request_params = {
             "download": ""
         }
 
         # Image transformation parameters
-        img_transform_parameters = ImageFileTransform(
-            fit=fit,
-            width=width,
-            height=height,
-            quality=quality,
-            withoutEnlargement=withoutEnlargement,
-            img_format=img_format,
-            **kwargs
-        ).parameters
-
         if img_transform_parameters:
             request_params.update(img_transform_parameters)
 
+        if connections and connections > 1 and storage.supports_partial and not destination:
+            return await self._ranged_download(
+                url, request_params, file_id, connections, storage, chunk_size=chunk_size, progress=progress
+            )
+
+        if stream or connections or destination:
+            return await self._stream_download(
+                url, request_params, file_id, storage, chunk_size=chunk_size, progress=progress, resume=resume,
+                destination=destination
+            )
+
         response = await self.connection.get(url, params=request_params)
 
+        name = None
         if response.status_code == 200:
-            # Get file name
-            d = response.headers['content-disposition']
-            fname = re.findall("filename=[\"\'](.+)[\"\']", d)
-            cln_fname = fname[0] if fname else file_id
+            name = await storage.save(_get_file_name(response, file_id), response.content)
 
-            await save_file(cln_fname, response.content)
+        return response, name
 
-        return response
+    async def _stream_download(
+            self, url: str, request_params: Dict[str, Any], file_id: str, storage: Storage,
+            chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+            progress: Optional[Callable[[int, Optional[int]], Any]] = None,
+            resume: bool = True,
+            destination: Optional[str] = None
+    ) -> Tuple[Response, Optional[str]]:
+        """
+        Stream an asset to a partial file and move it in place once complete.
+
+        Storage backends without partial files receive the chunks as they arrive, without resume support.
+        """
+        partial_path = None
+        if destination:
+            partial_path = f"{destination}.part"
+        elif storage.supports_partial:
+            # Different transformations of the same file must not resume each other
+            params_digest = hashlib.md5(json.dumps(request_params, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+            partial_path = await storage.get_partial_path(f"{file_id}_{params_digest}")
+
+        # A partial file is only resumed from the version of the asset it was written from
+        offset = 0
+        validator = None
+        if resume and partial_path and await aiofiles.os.path.exists(partial_path):
+            validator = await _read_validator(partial_path)
+            if validator:
+                offset = await aiofiles.os.path.getsize(partial_path)
+
+        headers = {"Range": f"bytes={offset}-", "If-Range": validator} if offset else None
+
+        async with self.connection.stream(
+                "GET", url, params=request_params, headers=headers, auth=self.auth
+        ) as response:
+            if response.status_code == 416 and offset:
+                # The partial file does not match the asset anymore, start over
+                await aiofiles.os.remove(partial_path)
+                await _write_validator(partial_path, None)
+                return await self._stream_download(
+                    url, request_params, file_id, storage, chunk_size=chunk_size, progress=progress, resume=False,
+                    destination=destination
+                )
+
+            if response.status_code not in [200, 206]:
+                await response.aread()
+                return response, None
+
+            # The server ignored the range request or the asset changed, so the whole file is sent again
+            if response.status_code == 200:
+                offset = 0
+
+            content_length = response.headers.get("content-length")
+            total = offset + int(content_length) if content_length is not None else None
+
+            downloaded = offset
+
+            async def chunks():
+                nonlocal downloaded
+
+                async for chunk in response.aiter_bytes(chunk_size):
+                    yield chunk
+                    downloaded += len(chunk)
+                    await _notify_progress(progress, downloaded, total)
+
+            if partial_path is None:
+                return response, await storage.save_stream(_get_file_name(response, file_id), chunks())
+
+            if not offset:
+                await _write_validator(partial_path, _get_range_validator(response))
+
+            async with aiofiles.open(partial_path, 'ab' if offset else 'wb') as f:
+                async for chunk in chunks():
+                    await f.write(chunk)
+
+        await _write_validator(partial_path, None)
+
+        if destination:
+            await aiofiles.os.replace(partial_path, destination)
+            return response, destination
+
+        name = await storage.save_partial(partial_path, _get_file_name(response, file_id))
+
+        return response, name
+
+    async def _ranged_download(
+            self, url: str, request_params: Dict[str, Any], file_id: str, connections: int, storage: Storage,
+            chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+            progress: Optional[Callable[[int, Optional[int]], Any]] = None,
+            retries: int = 3
+    ) -> Tuple[Response, Optional[str]]:
+        """
+        Fetch byte ranges of an asset concurrently and write them in place in a preallocated file.
 
-    async def upload_file(self, to_upload: Union[str, 'UploadFile'], folder: str = None) -> DirectusResponse:
+        Falls back to a streamed download when the server does not support range requests.
+        """
+        head_response = await self.connection.head(url, params=request_params, auth=self.auth)
+
+        content_length = head_response.headers.get("content-length")
+        accepts_ranges = head_response.headers.get("accept-ranges", "").lower() == "bytes"
+
+        if head_response.status_code != 200 or not accepts_ranges or content_length is None:
+            return await self._stream_download(
+                url, request_params, file_id, storage, chunk_size=chunk_size, progress=progress
+            )
+
+        total = int(content_length)
+        part_count = max(1, min(connections, -(-total // DOWNLOAD_MIN_PART_SIZE)))
+
+        if part_count == 1:
+            return await self._stream_download(
+                url, request_params, file_id, storage, chunk_size=chunk_size, progress=progress
+            )
+
+        params_digest = hashlib.md5(json.dumps(request_params, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+        partial_path = await storage.get_partial_path(f"{file_id}_{params_digest}_ranged")
+
+        # Preallocate the whole file, every range is written at its own offset
+        async with aiofiles.open(partial_path, 'wb') as f:
+            await f.truncate(total)
+
+        part_size = -(-total // part_count)
+        ranges = [(start, min(start + part_size, total) - 1) for start in range(0, total, part_size)]
+
+        # Make sure every range comes from the same version of the asset
+        etag = head_response.headers.get("etag")
+
+        downloaded = 0
+
+        async def fetch_range(start: int, end: int):
+            position = start
+
+            async def fetch():
+                nonlocal position, downloaded
+
+                headers = {"Range": f"bytes={position}-{end}"}
+                if etag:
+                    headers["If-Range"] = etag
+
+                async with self.connection.stream(
+                        "GET", url, params=request_params, headers=headers, auth=self.auth
+                ) as response:
+                    if response.status_code != 206:
+                        await response.aread()
+                        response.raise_for_status()
+                        raise ValueError(f"The server did not respect the byte range {position}-{end} of '{file_id}'")
+
+                    async with aiofiles.open(partial_path, 'r+b') as f:
+                        await f.seek(position)
+
+                        async for chunk in response.aiter_bytes(chunk_size):
+                            await f.write(chunk)
+                            position += len(chunk)
+                            downloaded += len(chunk)
+                            await _notify_progress(progress, downloaded, total)
+
+            # A retried range continues from the last written byte
+            await retry_async(fetch, retries=retries)
+
+        tasks = [asyncio.ensure_future(fetch_range(start, end)) for start, end in ranges]
+
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            await aiofiles.os.remove(partial_path)
+            raise
+
+        name = await storage.save_partial(partial_path, _get_file_name(head_response, file_id))
+
+        return head_response, name
+
+    async def upload_file(
+            self, to_upload: Union[str, 'UploadFile', AsyncIterable[bytes]], folder: str = None,
+            filename: Optional[str] = None, content_type: Optional[str] = None,
+            chunk_size: int = UPLOAD_CHUNK_SIZE, warmup: Optional[Iterable[str]] = None
+    ) -> DirectusResponse:
         """
         Upload a file to Directus.
 
-        :param to_upload: full path to file as a string or a `starlette.UploadFile` object.
+        The file is streamed into the request body, it is never held in memory as a whole.
+
+        :param to_upload: full path to file as a string, a `starlette.UploadFile` object or an async bytes iterator.
         :param folder: (optional) name of a `directus_folder` collection record.
+        :param filename: (optional) file name to use, required when uploading from an async iterator.
+        :param content_type: (optional) MIME type of the file, detected from its first bytes when missing.
+        :param chunk_size: Size in bytes of the chunks read from the file.
+        :param warmup: (optional) Keys of image presets to pre-generate in the background once the file is uploaded.
         """
         url = f"{self.url}/files"
 
-        folder_id = None
+        data = {}
         if folder:
-            folder_obj = (
-                await self.collection(py_directus.DirectusFolder).fields("id").filter(name=folder).read()
-            ).item
-
-            folder_id = folder_obj.id
-
-            assert folder_id, f"Folder '{folder}' not found"
-
-        if isinstance(to_upload, str):
-            # file name with extension
-            file_name = os.path.basename(to_upload)
-            file_mime = magic.from_file(to_upload, mime=True)
-
-            data = {
-                "title": os.path.splitext(file_name)[0],
-            }
-            f = open(to_upload, 'rb')
-            files = {
-                "file": (file_name, f, file_mime)
-            }
-        elif isinstance(to_upload, UploadFile):
-            data = {
-                "title": os.path.splitext(to_upload.filename)[0],
-            }
-            files = {
-                "file": (to_upload.filename, BytesIO(await to_upload.read()), to_upload.content_type)
-            }
-        else:
-            raise TypeError("The `to_upload` argument must be either a string or a `fastapi.UploadFile` instance.")
+            data["folder"] = await self._get_folder_id(folder)
 
-        try:
-            # File
-            # NOTE: CANNOT USE ASYNCHRONOUS FILES BECAUSE THEY ARE NOT SUPPORTED BY HTTPX
-            # https://github.com/encode/httpx/issues/1620
-            # f = await aiofiles.open(to_upload, 'rb')
-            if folder_id:
-                data["folder"] = folder_id
-            response = await self.connection.post(url, data=data, files=files, auth=self.auth)
-        finally:
-            if isinstance(to_upload, str):
-                f.close()
+        body = await prepare_upload(
+            to_upload, data, file_name=filename, file_mime=content_type, chunk_size=chunk_size
+        )
+
+        response = await self.connection.post(url, content=body, headers=body.headers, auth=self.auth)
+
+        response_obj = DirectusResponse(response)
+
+        if warmup is not None and response.status_code == 200:
+            self.warmup_in_background(response_obj.item_as_dict()["id"], *warmup)
+
+        return response_obj
+
+    async def upload_file_resumable(
+            self, path: str, folder: str = None, title: Optional[str] = None,
+            content_type: Optional[str] = None, chunk_size: int = TUS_CHUNK_SIZE,
+            state_path: Optional[str] = None, retries: int = 3, timeout: float = TUS_CHUNK_TIMEOUT
+    ) -> DirectusResponse:
+        """
+        Upload a large file to Directus in chunks, through the TUS protocol.
+
+        An interrupted upload continues from the last confirmed chunk when called again for the same file.
+        Requires TUS to be enabled on the Directus server (`TUS_ENABLED=true`).
+
+        :param path: full path to file as a string.
+        :param folder: (optional) name of a `directus_folder` collection record.
+        :param title: (optional) title of the file, defaults to the file name without extension.
+        :param content_type: (optional) MIME type of the file, detected from its first bytes when missing.
+        :param chunk_size: Size in bytes of each uploaded chunk.
+        :param state_path: (optional) path of the file keeping the upload progress.
+        :param retries: Number of retries for each failed chunk.
+        :param timeout: Timeout in seconds of each chunk request.
+        """
+        file_name = os.path.basename(path)
+
+        metadata = {
+            "filename_download": file_name,
+            "title": title or os.path.splitext(file_name)[0],
+            "type": content_type or await sniff_file_mime(path),
+            "folder": await self._get_folder_id(folder) if folder else None
+        }
+
+        tus_upload = TusUpload(
+            self, path, metadata,
+            chunk_size=chunk_size, state_path=state_path, retries=retries, timeout=timeout
+        )
+        await tus_upload.upload()
+
+        return await self.collection(py_directus.DirectusFile).filter(tus_id=tus_upload.upload_id).limit(1).read()
+
+    async def upload_many(
+            self, paths: Iterable[str], folder: Optional[str] = None, base_dir: Optional[str] = None,
+            concurrency: int = TRANSFER_CONCURRENCY, retries: int = 3, warmup: Optional[Iterable[str]] = None
+    ) -> List[TransferResult]:
+        """
+        Upload many local files concurrently.
+
+        Folders are resolved once through the cached folder index and missing ones are created.
+
+        :param paths: full paths to the files.
+        :param folder: (optional) path of the destination folder (`"Media/2024"`).
+        :param base_dir: (optional) local directory whose sub-directory structure is mirrored under `folder`.
+        :param concurrency: Maximum number of uploads in flight.
+        :param retries: Number of retries for each upload failing with a transient error.
+        :param warmup: (optional) Keys of image presets to pre-generate in the background for every uploaded file.
+
+        :return: A `TransferResult` per path (in the same order) with the `DirectusResponse` as result.
+        """
+        paths = list(paths)
+        folder_paths = {}
+
+        for path in paths:
+            folder_path = normalize_folder_path(folder or "")
 
-        return DirectusResponse(response)
+            if base_dir:
+                relative_dir = os.path.relpath(os.path.dirname(os.path.abspath(path)), os.path.abspath(base_dir))
+                if relative_dir != os.curdir:
+                    folder_path = normalize_folder_path(f"{folder_path}/{relative_dir.replace(os.sep, '/')}")
+
+            folder_paths[path] = folder_path or None
+
+        # Resolve (and create) every folder before the uploads start
+        for folder_path in set(folder_paths.values()):
+            if folder_path:
+                await self.folders.get(folder_path, create=True)
+
+        async def upload(path: str) -> DirectusResponse:
+            return await self.upload_file(path, folder=folder_paths[path], warmup=warmup)
+
+        return await run_transfers(paths, upload, concurrency=concurrency, retries=retries)
+
+    async def download_many(
+            self, file_ids: Iterable[str], stream: bool = True,
+            concurrency: int = TRANSFER_CONCURRENCY, retries: int = 3,
+            storage: Optional[Storage] = None,
+            **kwargs
+    ) -> List[TransferResult]:
+        """
+        Download many files concurrently.
+
+        :param file_ids: UUIDs of the file records in Directus.
+        :param stream: Write the files to storage chunk by chunk (see `download_file`).
+        :param concurrency: Maximum number of downloads in flight.
+        :param retries: Number of retries for each download failing with a transient error.
+        :param storage: (optional) Storage backend of the files, defaults to the storage of the client.
+        :param kwargs: Image transformation parameters, applied to every file (see `download_file`).
+
+        :return: A `TransferResult` per file id (in the same order) with the saved file name as result.
+        """
+        img_transform_parameters = ImageFileTransform(**kwargs).parameters
+
+        async def download(file_id: str) -> Optional[str]:
+            response, name = await self._download_file(
+                file_id, img_transform_parameters, stream=stream, storage=storage
+            )
+            response.raise_for_status()
+            return name
+
+        return await run_transfers(file_ids, download, concurrency=concurrency, retries=retries)
+
+    async def warmup_presets(
+            self, file_id: str, *presets: str, concurrency: int = TRANSFER_CONCURRENCY, retries: int = 3
+    ) -> List[TransferResult]:
+        """
+        Request the image presets of a file, so Directus generates (and caches) them before they are first needed.
+
+        :param file_id: UUID of the file record in Directus.
+        :param presets: Keys of registered image presets, all presets when missing.
+
+        :return: A `TransferResult` per preset key.
+        """
+        keys = list(presets) or [preset.key for preset in image_presets]
+
+        async def warmup(key: str) -> int:
+            async with self.connection.stream(
+                    "GET", f"{self.url}/assets/{file_id}",
+                    params=ImageFileTransform(preset=key).parameters, auth=self.auth
+            ) as response:
+                # The transformed asset is not needed, only its generation
+                async for _ in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    pass
+                response.raise_for_status()
+                return response.status_code
+
+        return await run_transfers(keys, warmup, concurrency=concurrency, retries=retries)
+
+    def warmup_in_background(self, file_id: str, *presets: str):
+        """
+        Schedule `warmup_presets` as a background task, `gather_warmups` waits for the scheduled warmups.
+        """
+        task = asyncio.ensure_future(self.warmup_presets(file_id, *presets))
+        self.warmup_tasks.add(task)
+        task.add_done_callback(self.warmup_tasks.discard)
+
+    async def gather_warmups(self):
+        """
+        Wait for the background warmups of image presets.
+        """
+        await asyncio.gather(*self.warmup_tasks, return_exceptions=True)
+
+    async def sync_image_presets(self, registry: PresetRegistry = image_presets) -> DirectusResponse:
+        """
+        Add (or update) the registered image presets to the `storage_asset_presets` Directus setting.
+
+        Presets defined in Directus but not registered are kept.
+        """
+        settings = (await self.read_settings()).item_as_dict() or {}
+        presets = {preset["key"]: preset for preset in settings.get("storage_asset_presets") or []}
+
+        for preset in registry.storage_asset_presets():
+            presets[preset["key"]] = preset
+
+        return await self.update_settings({"storage_asset_presets": list(presets.values())})
+
+    async def sync_assets(
+            self, dest: str, filter: Optional[F] = None, prune: bool = False,
+            concurrency: int = TRANSFER_CONCURRENCY, retries: int = 3
+    ) -> SyncResult:
+        """
+        Mirror Directus assets in a local directory, downloading only new or changed files.
+
+        :param dest: Path of the local mirror directory.
+        :param filter: (optional) `F` filter on `directus_files` selecting the mirrored files.
+        :param prune: Delete local files whose record was deleted (or no longer matches the filter).
+        :param concurrency: Maximum number of downloads in flight.
+        :param retries: Number of retries for each download failing with a transient error.
+        """
+        return await AssetMirror(self, dest).sync(filter=filter, prune=prune, concurrency=concurrency, retries=retries)
+
+    async def _get_folder_id(self, folder: str) -> str:
+        """
+        Find the id of a `directus_folder` record by path or name.
+        """
+        folder_id = await self.folders.get(folder)
+
+        assert folder_id, f"Folder '{folder}' not found"
+
+        return folder_id
 
     async def get_translations(self, clean: bool = False) -> dict[str, dict[str, str]]:
         """
@@ -270,10 +894,34 @@ class Directus:
 
         :param clean: Returns the records grouped by `key` value when set as `True`.
         """
-        items = (await self.collection(py_directus.DirectusTranslation).read()).items_as_dict()
+        items = (await self.collection(py_directus.DirectusTranslation).limit(-1).read()).items_as_dict()
 
         return parse_translations(items) if clean else items
 
+    async def translation_store(
+            self, default_language: Optional[str] = None, fallbacks: Optional[Dict[str, List[str]]] = None,
+            refresh_interval: Optional[float] = None
+    ) -> TranslationStore:
+        """
+        Load the translation records in a store kept up to date incrementally
+        (see `py_directus.translation_store.TranslationStore`).
+
+        :param default_language: The language looked up last, for every language
+        :param fallbacks: Languages looked up, in order, when a language has no translation (`{"el-CY": ["el-GR"]}`)
+        :param refresh_interval: Seconds between background refreshes, none when not given
+        """
+        store = TranslationStore(self, default_language=default_language, fallbacks=fallbacks)
+        await store.load()
+
+        if self.translations is not None:
+            self.translations.stop()
+        self.translations = store
+
+        if refresh_interval:
+            store.start(refresh_interval)
+
+        return store
+
     async def create_translations(self, *keys: Union[str, Tuple[str, str]]):
         """
         Create translation records for given keys.
@@ -380,6 +1028,13 @@ class Directus:
 
         :param clear_all: If set to `True`, absolutely ALL records will be deleted.
         """
+        if self.entities:
+            self.entities.clear()
+        if self.containment:
+            self.containment.clear()
+        if self.counts:
+            self.counts.clear()
+
         return await self.cache.clear(clear_all)
 
     async def logout(self) -> bool:
@@ -399,6 +1054,15 @@ class Directus:
         return response.status_code == 200
 
     async def close_connection(self):
+        for replica in self.replicas.values():
+            replica.stop()
+        if self.translations is not None:
+            self.translations.stop()
+
+        for task in self.warmup_tasks:
+            task.cancel()
+        await self.gather_warmups()
+
         await self.connection.aclose()
 
     async def __aenter__(self):
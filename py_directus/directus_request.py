@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import asyncio
+import inspect
+import logging
 import json as jsonlib
 from typing import (
     TYPE_CHECKING,
@@ -13,8 +15,16 @@ from uuid import UUID
 import json_fix
 import websockets
 from py_directus.aggregator import Agg
-from py_directus.directus_response import DirectusResponse
+from py_directus.count_cache import get_count_params
+from py_directus.directus_response import DirectusException, DirectusResponse
 from py_directus.filter import F
+from py_directus.keyset import (
+    cursor_values, decode_cursor, encode_cursor, keyset_filter, keyset_sort, with_sort_fields
+)
+from py_directus.planner import INLINE_FANOUT_LIMIT, FetchPlan, execute_plan, plan_fetch
+from py_directus.projection import get_model_fields
+from py_directus.query import PreparedQuery, get_query_digest, normalize_query
+from py_directus.scan import SCAN_BATCH_SIZE, SCAN_CONCURRENCY, SCAN_PARTITIONS, Scan, ScanBound
 from pydantic import BaseModel
 
 # from py_directus.operators import AggregationOperators
@@ -24,6 +34,12 @@ if TYPE_CHECKING:
     from py_directus import Directus
 
 
+logger = logging.getLogger(__name__)
+
+# Serialize objects with a `__json__` method (filters, aggregations), once for the whole process
+json_fix.fix_it()
+
+
 class DirectusRequest:
     """
     Class to manage request to the Directus API.
@@ -33,12 +49,18 @@ class DirectusRequest:
 
     def __init__(self, directus: 'Directus', collection: str,
                  collection_class: Optional[Union[Type[BaseModel], str]] = None):
-        json_fix.fix_it()
-
         self.directus: 'Directus' = directus
         self.collection: str = collection
         self.params: Dict[Any, Any] = {}
         self.collection_class: Optional[Union[Type[BaseModel], str]] = collection_class
+        self.optimize_filter: bool = False
+        self.auto_fields_depth: Optional[int] = None
+        self.includes: List[str] = []
+        self.fanout: Dict[str, int] = {}
+        self.inline_fanout_limit: int = INLINE_FANOUT_LIMIT
+        # Keyset pagination, the primary key and the position (sort fields and values) to read after
+        self.keyset_key: Optional[str] = None
+        self.cursor: Optional[Tuple[Optional[List[str]], List[Any]]] = None
 
     @property
     def uri(self):
@@ -88,12 +110,187 @@ class DirectusRequest:
 
         return self
 
+    def optimize(self, enabled: bool = True):
+        """
+        Simplify the filter before it is sent (see `py_directus.optimizer.optimize_filter`).
+        """
+        self.optimize_filter = enabled
+        return self
+
+    def auto_fields(self, depth: int = 0):
+        """
+        Request only the fields declared by the collection model, when no fields are given.
+
+        :param depth: Levels of relational fields requested with the fields of their own model, instead of `*`.
+        """
+        self.auto_fields_depth = depth
+        return self
+
+    def deep(self, **relations):
+        """
+        Query parameters of nested relations (`_filter`, `_sort`, `_limit`, `_offset`, ...).
+
+        :example:
+                .deep(lines={"_sort": ["-quantity"], "_limit": 5}) \
+                .deep(lines__product={"_filter": F(status="published")})
+        """
+        deep = self.params.setdefault('deep', {})
+
+        for path, query in relations.items():
+            node = deep
+            for part in path.replace("__", ".").split("."):
+                node = node.setdefault(part, {})
+
+            node.update({key: value.query if isinstance(value, F) else value for key, value in query.items()})
+
+        return self
+
+    def include(self, *relations, fanout: Optional[Dict[str, int]] = None, limit: Optional[int] = None):
+        """
+        Fetch relations of the collection model along with the items (`"lines"`, `"lines.product"`).
+
+        Relations with a small fan-out are inlined with nested fields, the others are fetched
+        with a second `_in` query (see `py_directus.planner.plan_fetch`).
+
+        :param fanout: Estimated number of related items of to-many relations, by relation path
+        :param limit: Maximum estimated number of related items per item for a relation to be inlined
+        """
+        self.includes.extend(relation.replace("__", ".") for relation in relations)
+        self.fanout.update({path.replace("__", "."): value for path, value in (fanout or {}).items()})
+
+        if limit is not None:
+            self.inline_fanout_limit = limit
+
+        return self
+
+    def _get_deep_paths(self) -> List[str]:
+        paths = []
+
+        def visit(node: Dict[str, Any], prefix: str):
+            for key, value in node.items():
+                if not key.startswith("_") and isinstance(value, dict):
+                    paths.append(f"{prefix}{key}")
+                    visit(value, f"{prefix}{key}.")
+
+        visit(self.params.get('deep') or {}, "")
+        return paths
+
+    def _get_fetch_plan(self) -> Optional[FetchPlan]:
+        if not self.includes:
+            return None
+
+        if not inspect.isclass(self.collection_class) or not issubclass(self.collection_class, BaseModel):
+            raise TypeError("Relations can only be included in requests of a collection model")
+
+        # The parameters of `deep` only apply to inlined relations
+        return plan_fetch(
+            self.collection_class, self.includes, fanout=self.fanout,
+            inline=self._get_deep_paths(), limit=self.inline_fanout_limit
+        )
+
+    def _get_auto_fields_depth(self) -> Optional[int]:
+        if not inspect.isclass(self.collection_class) or not issubclass(self.collection_class, BaseModel):
+            return None
+
+        if self.auto_fields_depth is not None:
+            return self.auto_fields_depth
+
+        # Enabled for every request of the model
+        if self.collection_class.model_config.get("auto_fields"):
+            return self.collection_class.model_config.get("auto_fields_depth", 0)
+
+        return None
+
+    def _get_params(self) -> Dict[Any, Any]:
+        """
+        The query parameters as they are sent.
+        """
+        params = self.params
+
+        if self.optimize_filter and isinstance(params.get('filter'), F):
+            params = {**params, 'filter': params['filter'].optimized()}
+
+        if self.keyset_key is not None:
+            sort = keyset_sort(params.get('sort'), self.keyset_key)
+            params = {**params, 'sort': sort}
+
+            keyset = self._get_keyset_filter()
+            if keyset is not None:
+                params['filter'] = params['filter'] & keyset if 'filter' in params else keyset
+
+        if 'fields' not in params and self.includes:
+            params = {**params, 'fields': ",".join(self._get_fetch_plan().fields)}
+        elif 'fields' not in params:
+            depth = self._get_auto_fields_depth()
+            if depth is not None:
+                params = {**params, 'fields': ",".join(get_model_fields(self.collection_class, depth))}
+
+        if self.keyset_key is not None and 'fields' in params:
+            # The sort fields of the last item are needed to read after it
+            params = {**params, 'fields': with_sort_fields(params['fields'], params['sort'])}
+
+        return params
+
     def sort(self, field, asc=True):
         if 'sort' not in self.params:
             self.params['sort'] = []
         self.params['sort'].append(f'{"" if asc else "-"}{field}')
         return self
 
+    def after(self, cursor: Union[str, List[Any], Tuple[Any, ...], None] = None, key: str = "id"):
+        """
+        Request the items after an item, in the order of the sort fields (keyset pagination).
+
+        Unlike an offset, the position is an equivalent filter on the sort fields, so deep pages
+        cost the same as the first one. The primary key is added to the sort fields when missing.
+
+        :param cursor: A cursor given by `get_cursor`, or the values of the sort fields of the last item read,
+                       `None` for the first page
+        :param key: The primary key field
+
+        :example:
+                request = directus.collection("articles").sort("date_created", asc=False).limit(20).after(cursor)
+                items = (await request.read()).items
+                next_cursor = request.get_cursor(items[-1])
+
+        :raises ValueError: The cursor is malformed or was given for other sort fields.
+        """
+        self.keyset_key = key
+
+        if cursor is None:
+            self.cursor = None
+        elif isinstance(cursor, str):
+            self.cursor = decode_cursor(cursor)
+        else:
+            self.cursor = (None, list(cursor))
+
+        if 'sort' in self.params:
+            # Fail early, the sort fields of the request are known
+            self._get_keyset_filter()
+
+        return self
+
+    def _get_keyset_filter(self) -> Optional[F]:
+        if self.cursor is None:
+            return None
+
+        sort = keyset_sort(self.params.get('sort'), self.keyset_key)
+        cursor_sort, values = self.cursor
+
+        if cursor_sort is not None and cursor_sort != sort:
+            raise ValueError(f"The cursor was given for the sort fields {cursor_sort}, not {sort}")
+
+        return keyset_filter(sort, values)
+
+    def get_cursor(self, item: Union[Dict[str, Any], BaseModel]) -> str:
+        """
+        The opaque cursor of an item read with `after`, to request the items after it.
+
+        :raises ValueError: The item has a null value for a sort field, no page could be requested after it.
+        """
+        sort = keyset_sort(self.params.get('sort'), self.keyset_key or "id")
+        return encode_cursor(sort, cursor_values(item, sort))
+
     def search(self, search: Optional[Union[str, int]] = None):
         self.params['search'] = search
         return self
@@ -152,9 +349,48 @@ class DirectusRequest:
         self.params['meta'] = "*"
         return self
 
+    async def count(self, cache: bool = True) -> int:
+        """
+        The number of items matching the filter and search of the request, whatever its page, sort or fields.
+
+        Only the `filter_count` is requested, without items. The count is kept by the count cache
+        of the client (`Directus(count_cache=True)`), shared by every page of the same filter.
+
+        :param cache: Whether to use the count cache or not
+
+        :example:
+                request = directus.collection("articles").filter(status="published").sort("title").page(12)
+                response, total = await asyncio.gather(request.read(), request.count())
+        """
+        params = get_count_params(self.params)
+
+        if cache and self.directus.counts is not None:
+            return await self.directus.counts.get_or_read(self.collection, params, lambda: self._read_count(params))
+
+        return await self._read_count(params)
+
+    async def _read_count(self, params: Dict[Any, Any]) -> int:
+        request = DirectusRequest(self.directus, self.collection)
+        request.params = {**params, 'limit': 0, 'meta': "filter_count"}
+
+        response = await request._read()
+        return int(response.filtered_count or 0)
+
+    def prepare(self) -> PreparedQuery:
+        """
+        Build the query once, to be sent many times with different `Param` values.
+
+        :example:
+                query = directus.collection(User).filter(id=Param("id")).fields("id", "email").prepare()
+                await query.read(id=5)
+        """
+        return PreparedQuery(
+            self.directus, self.collection, self.uri, self._get_params(), collection_class=self.collection_class
+        )
+
     async def read(
             self, id: Optional[Union[UUID, int, str]] = None, method: str = "search",
-            cache: bool = False, as_task: bool = False
+            cache: bool = False, as_task: bool = False, batch: bool = False
     ) -> DirectusResponse:
         """
         Request data.
@@ -163,39 +399,102 @@ class DirectusRequest:
         :param method: The method to use for the request (search, get)
         :param cache: Whether to use the cache or not
         :param as_task: Whether to add the request to the tasks list or not (for batch requests)
+        :param batch: (id) Load the item along with the other items of the collection
+                      read by id in the same event loop iteration, with a single request
+
+        Relations included with `include` and planned for a second query are fetched
+        before the response is returned, unless the request is added as a task.
 
         :return: The DirectusResponse object
 
         IMPORTANT: cache and as_task cannot be used together, if both are set to True,
                    the cache will take precedence and the request will be awaited.
+                   batch takes precedence over both, items loaded in batches are kept for the rest of
+                   the loader scope (`Directus.loader_scope`).
         """
 
+        if batch and id is not None:
+            loader = self.directus.get_loader(self.collection, self.collection_class, self._get_params())
+            item = await loader.load(id)
+
+            plan = self._get_fetch_plan()
+            if plan and item:
+                await execute_plan(self.directus, plan, [item])
+
+            if item is None:
+                # As Directus answers the read of an item that does not exist or is not accessible
+                response = DirectusResponse.from_data(
+                    None, query=self.params, collection=self.collection_class, status_code=403
+                )
+                response.json = {"errors": [{
+                    "message": "You don't have permission to access this.", "extensions": {"code": "FORBIDDEN"}
+                }]}
+                raise DirectusException(response)
+
+            return DirectusResponse.from_data(item, query=self.params, collection=self.collection_class)
+
         method = "get" if id is not None else method
 
-        if cache:
+        # Narrower queries of a cached complete result are evaluated locally
+        if cache and self.directus.containment is not None:
+            data = self.directus.containment.get(self.collection, self._get_params(), id=id)
+            if data is not None:
+                return DirectusResponse.from_data(data, query=self.params, collection=self.collection_class)
+
+        if cache and self.directus.entities is not None and not self._is_aggregation():
+            d_response = await self._read_entities(id=id, method=method)
+        elif cache:
             d_response = await self._read_cache(id=id, method=method)
         else:
             d_response = await self._read(id=id, method=method, as_task=as_task)
 
         return d_response
 
+    def scan(
+            self, field: str, start: Optional[ScanBound] = None, end: Optional[ScanBound] = None,
+            partitions: int = SCAN_PARTITIONS, concurrency: int = SCAN_CONCURRENCY, ordered: bool = True,
+            batch_size: int = SCAN_BATCH_SIZE, key: str = "id"
+    ) -> Scan:
+        """
+        Read every item of the request, in ranges of a monotonic field read concurrently.
+
+        :param field: An integer or date (time) field increasing with new items (`id`, `date_created`)
+        :param start: The first value of the field to read, the lowest one by default
+        :param end: The last value of the field to read, the highest one by default
+        :param partitions: The number of ranges of the field
+        :param concurrency: The maximum number of requests in flight
+        :param ordered: Whether items are given in the order of the field, or as soon as they are read
+        :param batch_size: The number of items requested at once within a range
+        :param key: The primary key field, telling apart items with the same value of the field
+
+        :example:
+                async for item in directus.collection("directus_activity").scan("timestamp", partitions=12):
+                    ...
+        """
+        return Scan(
+            self, field, start=start, end=end, partitions=partitions, concurrency=concurrency,
+            ordered=ordered, batch_size=batch_size, key=key
+        )
+
     async def _read(
             self, id: Optional[Union[UUID, int, str]] = None, method: str = "search",
-            renew_cache: bool = False, as_task: bool = False
+            renew_cache: bool = False, as_task: bool = False, cache: bool = False
     ) -> DirectusResponse:
         """
         Send query to server.
+
+        :param cache: Whether the read asked for caching, the items of the response are then cached
         """
 
         if method == "search":
             response = self.directus.connection.request(
                 "search", self.uri,
-                json={"query": self.params},
+                json={"query": self._get_params()},
                 auth=self.directus.auth
             )
         elif method == "get":
             url = f"{self.uri}/{id}" if id is not None else self.uri
-            response = self.directus.connection.get(url, params=self.params, auth=self.directus.auth)
+            response = self.directus.connection.get(url, params=self._get_params(), auth=self.directus.auth)
         else:
             raise ValueError(f"Method '{method}' not supported")
 
@@ -207,6 +506,24 @@ class DirectusRequest:
         else:
             await d_response.gather_response()
 
+            # Relations fetched with follow-up queries
+            plan = self._get_fetch_plan()
+            if plan and plan.batched and d_response.json.get('data'):
+                await execute_plan(self.directus, plan, d_response._parse_items_as_dict())
+
+            # Pages read after a cursor are not complete results of their query
+            if cache and self.directus.containment is not None and method == "search" and self.keyset_key is None:
+                self.directus.containment.add(self.collection, self._get_params(), d_response.json.get('data'))
+
+            # Refresh the cached items
+            if (
+                    cache and self.directus.entities is not None and not self._is_aggregation()
+                    and d_response.json.get('data')
+            ):
+                self.directus.entities.write(
+                    self.collection, d_response._parse_items_as_dict(), self._get_params().get('fields')
+                )
+
         # Check for existing cache and renew it
         if not renew_cache:
             async with self._lock_2:
@@ -237,16 +554,60 @@ class DirectusRequest:
             if cached_response:
                 d_response = DirectusResponse.from_json(cached_response, collection=self.collection_class)
             else:
-                d_response = await self._read(id=id, method=method, renew_cache=True)
+                d_response = await self._read(id=id, method=method, renew_cache=True, cache=True)
 
                 # Add results to cache
                 await self.directus.cache.add(query_key_str, d_response.to_json())
 
             return d_response
 
+    def _is_aggregation(self) -> bool:
+        return any(key in self.params for key in ('aggregate', 'groupBy', 'meta'))
+
+    async def _read_entities(
+            self, id: Optional[Union[UUID, int, str]] = None, method: str = "search"
+    ) -> DirectusResponse:
+        """
+        Get response from the cached items (see `py_directus.entity_cache.EntityCache`).
+        """
+        entities = self.directus.entities
+        fields = self._get_params().get('fields')
+
+        if id is not None:
+            item = entities.read(self.collection, id, fields)
+
+            if item is not None:
+                return DirectusResponse.from_data(item, query=self.params, collection=self.collection_class)
+
+            # The item is cached by the read
+            return await self._read(id=id, method=method, renew_cache=True, cache=True)
+
+        async with self._lock:
+            query_key_str = self._get_query_string_key(id=id, method=method)
+
+            data = entities.get_query(query_key_str)
+            if data is not None:
+                return DirectusResponse.from_data(data, query=self.params, collection=self.collection_class)
+
+            # Results which could not be normalized (items without a primary key) are cached as a whole
+            cached_response = await self.directus.cache.get(query_key_str) if self.directus.cache else None
+            if cached_response:
+                return DirectusResponse.from_json(cached_response, collection=self.collection_class)
+
+            d_response = await self._read(id=id, method=method, renew_cache=True, cache=True)
+
+            if not entities.add_query(query_key_str, self.collection, d_response.json.get('data'), fields):
+                if self.directus.cache:
+                    await self.directus.cache.add(query_key_str, d_response.to_json())
+
+            return d_response
+
     async def clear_cache(self, id: Optional[Union[UUID, int, str]] = None, method: str = "search"):
         query_key_str = self._get_query_string_key(id=id, method=method)
 
+        if self.directus.entities is not None:
+            self.directus.entities.delete_query(query_key_str)
+
         # Try to find query in cache
         d_res = await self.directus.cache.delete(query_key_str)
         return d_res
@@ -254,11 +615,17 @@ class DirectusRequest:
     def _get_query_string_key(self, id: Optional[Union[UUID, int, str]] = None, method: str = "search"):
         """
         Generate request key for cache.
+
+        Semantically equal queries (e.g. in a different keyword or field order) share the same key.
         """
 
-        query_str = jsonlib.dumps(self.params)
+        params = self._get_params()
+        query_key_str = f"{self.collection}_{id}_{method}_{get_query_digest(params)}"
 
-        return f"{self.collection}_{id}_{method}_{query_str}"
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Query key %s: %s", query_key_str, jsonlib.dumps(normalize_query(params), default=str))
+
+        return query_key_str
 
     async def create(
             self, items: Union[Dict[Any, Any], List[Dict[Any, Any]]], as_task: bool = False
@@ -274,6 +641,17 @@ class DirectusRequest:
         else:
             await d_response.gather_response()
 
+            # The new items may be part of cached queries
+            if self.directus.containment is not None:
+                self.directus.containment.invalidate(self.collection)
+            if self.directus.counts is not None:
+                self.directus.counts.invalidate(self.collection)
+            self.directus.clear_loaders(self.collection)
+            if self.directus.entities is not None:
+                self.directus.entities.invalidate_queries(self.collection)
+                if d_response.json.get('data'):
+                    self.directus.entities.write(self.collection, d_response._parse_items_as_dict())
+
         return d_response
 
     @overload
@@ -316,6 +694,18 @@ class DirectusRequest:
         else:
             await d_response.gather_response()
 
+            if self.directus.containment is not None:
+                self.directus.containment.invalidate(self.collection)
+            if self.directus.counts is not None:
+                self.directus.counts.invalidate(self.collection)
+            self.directus.clear_loaders(self.collection)
+
+            # The updated items may now match other filters or sort elsewhere, the cached queries are read again
+            if self.directus.entities is not None:
+                self.directus.entities.invalidate_queries(self.collection)
+                if d_response.json.get('data'):
+                    self.directus.entities.write(self.collection, d_response._parse_items_as_dict())
+
         return d_response
 
     async def delete(
@@ -339,6 +729,16 @@ class DirectusRequest:
         else:
             await d_response.gather_response()
 
+            if self.directus.containment is not None:
+                self.directus.containment.invalidate(self.collection)
+            if self.directus.counts is not None:
+                self.directus.counts.invalidate(self.collection)
+            self.directus.clear_loaders(self.collection)
+
+            # Cached queries with the deleted items are no longer served
+            if self.directus.entities is not None:
+                self.directus.entities.evict(self.collection, ids if isinstance(ids, list) else [ids])
+
         return d_response
 
     async def subscribe(
@@ -362,7 +762,7 @@ class DirectusRequest:
         subsc_data = {
             "type": "subscribe",
             "collection": self.collection,
-            "query": self.params
+            "query": self._get_params()
         }
 
         if event_type:
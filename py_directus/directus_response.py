@@ -193,6 +193,19 @@ class DirectusResponse:
 
         return new_obj
 
+    @classmethod
+    def from_data(cls, data: Any, query: Dict[Any, Any] = None, collection: Any = None, status_code: int = 200):
+        """
+        Resolved response holding already fetched data.
+        """
+        new_obj = cls(query=query, collection=collection)
+
+        new_obj.response_status = status_code
+        new_obj.json = {"data": data}
+        new_obj.is_resolved = True
+
+        return new_obj
+
     def get_explanation(self, show_headers=True, show_cookies=True) -> Dict[Any, Any]:
         needed_data = {}
 
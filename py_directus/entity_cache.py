@@ -0,0 +1,212 @@
+import copy
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Any, Callable, Dict, List, Tuple, Iterable
+
+from py_directus.cache import _is_expired
+from py_directus.predicate import UnsupportedQuery
+from py_directus.projection import get_field_tree, project_item
+
+
+logger = logging.getLogger(__name__)
+
+# Items (and query results) kept at most, the least recently used ones are dropped first
+ENTITY_CACHE_MAX_ENTRIES = 10000
+
+
+def _merge(data: Dict[Any, Any], available: Dict[str, Any], item: Dict[Any, Any], requested: Dict[str, Any], key: str):
+    """
+    Merge an item read with the `requested` fields in the cached data, holding the `available` fields.
+    """
+    if "*" in requested:
+        available["*"] = {}
+
+    for field, value in item.items():
+        current = data.get(field)
+        # Fields read through `*` are given without their related items
+        nested = requested.get(field, {})
+
+        if isinstance(current, dict) and current.get(key) is not None:
+            # A relation given as its key keeps the related item cached with it
+            if not isinstance(value, dict) and current[key] == value:
+                continue
+
+            # Fields of the same related item read by different queries
+            if isinstance(value, dict) and current[key] == value.get(key) and nested:
+                _merge(current, available.setdefault(field, {}), value, nested, key)
+                continue
+
+        data[field] = copy.deepcopy(value)
+        available[field] = copy.deepcopy(nested)
+
+
+class Entity:
+    """
+    Cached item, merged from every response it was part of, with the tree of the fields it holds.
+    """
+
+    def __init__(self):
+        self.data: Dict[Any, Any] = {}
+        self.fields: Dict[str, Any] = {}
+        self.updated: datetime = datetime.utcnow()
+
+
+class EntityCache:
+    """
+    Normalized cache, items are stored once by collection and primary key, query results as lists of keys.
+
+    An item read by any query serves the reads by id of the item, and a change of the item
+    (by a later read or an update) is seen by every cached query it is part of.
+    Items without a primary key (e.g. aggregations) are not cached.
+
+    The least recently used items (and queries) are dropped past `max_entries`, along with the expired ones.
+    """
+
+    def __init__(self, timeout: Optional[int] = 3600, key: str = "id", max_entries: int = ENTITY_CACHE_MAX_ENTRIES):
+        self._timeout: Optional[int] = timeout
+        self.key: str = key
+        self.max_entries: int = max_entries
+
+        self._entities: OrderedDict[Tuple[str, str], Entity] = OrderedDict()
+
+        # Results of queries, (collection, created, keys, requested fields, single item)
+        self._queries: OrderedDict[str, Tuple[str, datetime, List[str], Dict[str, Any], bool]] = OrderedDict()
+
+    def __len__(self):
+        return len(self._entities)
+
+    def _get_entity(self, collection: str, id: Any) -> Optional[Entity]:
+        cache_key = (collection, str(id))
+        entity = self._entities.get(cache_key)
+
+        if entity is None:
+            return None
+        if _is_expired(entity.updated, self._timeout):
+            del self._entities[cache_key]
+            return None
+
+        self._entities.move_to_end(cache_key)
+        return entity
+
+    def _evict(self, entries: OrderedDict, created: Callable[[Any], datetime]):
+        # Least recently used first, expired or past the maximum number of entries
+        while entries:
+            cache_key, entry = next(iter(entries.items()))
+            if len(entries) <= self.max_entries and not _is_expired(created(entry), self._timeout):
+                break
+            del entries[cache_key]
+
+    def write(self, collection: str, items: Iterable[Dict[Any, Any]], fields: Any = None) -> bool:
+        """
+        Merge items in the cached entities.
+
+        :param fields: The `fields` parameter the items were requested with
+        :return: Whether every item could be stored (had a primary key)
+        """
+        requested = get_field_tree(fields)
+        stored = True
+
+        for item in items:
+            if not isinstance(item, dict) or item.get(self.key) is None:
+                stored = False
+                continue
+
+            cache_key = (collection, str(item[self.key]))
+            entity = self._get_entity(collection, item[self.key])
+
+            if entity is None:
+                entity = self._entities[cache_key] = Entity()
+
+            _merge(entity.data, entity.fields, item, requested, self.key)
+            entity.updated = datetime.utcnow()
+
+        self._evict(self._entities, lambda entity: entity.updated)
+
+        return stored
+
+    def read(self, collection: str, id: Any, fields: Any = None) -> Optional[Dict[Any, Any]]:
+        """
+        The cached item, when it holds every requested field.
+        """
+        entity = self._get_entity(collection, id)
+        if entity is None:
+            return None
+
+        try:
+            return project_item(entity.data, get_field_tree(fields), entity.fields, self.key)
+        except UnsupportedQuery:
+            return None
+
+    def evict(self, collection: str, ids: Iterable[Any]):
+        """
+        Forget items, the cached queries they were part of are no longer served.
+        """
+        for id in ids:
+            self._entities.pop((collection, str(id)), None)
+
+    def add_query(self, query_key: str, collection: str, data: Any, fields: Any = None) -> bool:
+        """
+        Cache the result of a query as the keys of its items.
+
+        :return: Whether the result could be normalized
+        """
+        single = isinstance(data, dict)
+        items = [data] if single else data
+
+        if not isinstance(items, list) or not self.write(collection, items, fields):
+            return False
+
+        self._queries[query_key] = (
+            collection, datetime.utcnow(), [str(item[self.key]) for item in items], get_field_tree(fields), single
+        )
+        self._queries.move_to_end(query_key)
+        self._evict(self._queries, lambda query: query[1])
+
+        return True
+
+    def get_query(self, query_key: str) -> Optional[Any]:
+        """
+        The result of a query built from the cached items, `None` when it is not cached or an item is missing.
+        """
+        try:
+            collection, created, keys, requested, single = self._queries[query_key]
+        except KeyError:
+            logger.debug("Entity cache MISS for %s", query_key)
+            return None
+
+        if _is_expired(created, self._timeout):
+            del self._queries[query_key]
+            return None
+
+        items = []
+        for key in keys:
+            entity = self._get_entity(collection, key)
+
+            try:
+                if entity is None:
+                    raise UnsupportedQuery("The item was deleted or expired")
+                items.append(project_item(entity.data, requested, entity.fields, self.key))
+            except UnsupportedQuery:
+                # The result is no longer known
+                del self._queries[query_key]
+                return None
+
+        self._queries.move_to_end(query_key)
+        logger.debug("Entity cache HIT for %s", query_key)
+
+        return (items[0] if items else None) if single else items
+
+    def delete_query(self, query_key: str) -> bool:
+        return self._queries.pop(query_key, None) is not None
+
+    def invalidate_queries(self, collection: str):
+        """
+        Forget the cached queries of a collection (e.g. when an item is created), keeping its items.
+        """
+        for query_key in [key for key, value in self._queries.items() if value[0] == collection]:
+            del self._queries[query_key]
+
+    def clear(self):
+        self._entities.clear()
+        self._queries.clear()
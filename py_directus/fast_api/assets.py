@@ -0,0 +1,449 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import tempfile
+from collections import OrderedDict
+from typing import Optional, Any, Dict, Set, Tuple, Callable, AsyncIterator
+
+import aiofiles
+import aiofiles.os
+import platformdirs
+
+from fastapi import APIRouter, Depends, Request
+from starlette.responses import Response, StreamingResponse
+
+import py_directus
+from py_directus import Directus
+from py_directus.transformation import ImageFileTransform
+
+
+logger = logging.getLogger(__name__)
+
+ASSET_CHUNK_SIZE = 64 * 1024
+
+
+def normalize_asset_parameters(parameters: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Canonical form of asset transformation parameters, so equal transformations share a cache entry.
+    """
+    normalized = {}
+
+    for key, value in parameters.items():
+        if value is None or value == "":
+            continue
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        elif isinstance(value, (list, dict)):
+            value = json.dumps(value, separators=(",", ":"))
+        normalized[key] = str(value)
+
+    return dict(sorted(normalized.items()))
+
+
+def get_asset_key(file_id: str, parameters: Dict[str, Any]) -> str:
+    key_source = json.dumps([file_id, normalize_asset_parameters(parameters)], separators=(",", ":"))
+    return hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `bytes` range, returns `None` for a missing or unsupported (multiple ranges) header.
+
+    :raises ValueError: The range can not be satisfied.
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+
+    start_str, _, end_str = range_header[len("bytes="):].strip().partition("-")
+
+    try:
+        if start_str:
+            start = int(start_str)
+            end = min(int(end_str), size - 1) if end_str else size - 1
+        else:
+            # Suffix range, the last N bytes
+            start = max(size - int(end_str), 0)
+            end = size - 1
+    except ValueError:
+        return None
+
+    if start > end or start >= size:
+        raise ValueError(f"Range '{range_header}' not satisfiable for size {size}")
+
+    return start, end
+
+
+class AssetCacheEntry:
+    """
+    Cached transformed asset, its content lives in the blob named after its content hash.
+    """
+
+    def __init__(
+            self, key: str, digest: str, size: int, content_type: Optional[str] = None,
+            etag: Optional[str] = None, content_disposition: Optional[str] = None,
+            validated_at: Optional[float] = None
+    ):
+        self.key: str = key
+        self.digest: str = digest
+        self.size: int = size
+        self.content_type: Optional[str] = content_type
+        self.etag: Optional[str] = etag
+        self.content_disposition: Optional[str] = content_disposition
+        self.validated_at: float = validated_at or time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+
+class AssetCache:
+    """
+    Content-addressed disk cache of (transformed) Directus assets.
+
+    Entries are keyed by the file id and the normalized transformation parameters, while the content
+    is stored once per content hash. The least recently used entries are evicted once the blobs exceed
+    `max_size` bytes, and entries older than `revalidate_after` seconds are revalidated with their ETag.
+    """
+
+    def __init__(
+            self, directory: Optional[str] = None, max_size: int = 1024 * 1024 * 1024,
+            revalidate_after: float = 3600
+    ):
+        self.directory: str = directory or os.path.join(platformdirs.user_cache_dir("py_directus"), "assets")
+        self.max_size: int = max_size
+        self.revalidate_after: float = revalidate_after
+
+        # Entries in least recently used order
+        self.entries: 'OrderedDict[str, AssetCacheEntry]' = OrderedDict()
+        self.blob_sizes: Dict[str, int] = {}
+        # Total size of the blobs
+        self.size: int = 0
+
+        self.is_loaded: bool = False
+        self._load_lock = asyncio.Lock()
+
+        # Locks of the keys being fetched, with the number of their holders and waiters
+        self._key_locks: Dict[str, asyncio.Lock] = {}
+        self._key_lock_users: Dict[str, int] = {}
+
+        # Blobs being opened, by digest, and the ones among them removed meanwhile
+        self._opening: Dict[str, int] = {}
+        self._removed_while_opening: Set[str] = set()
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "blobs", digest)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, "entries", f"{key}.json")
+
+    async def load(self):
+        """
+        Read the entries kept on disk by a previous process.
+        """
+        async with self._load_lock:
+            if self.is_loaded:
+                return
+
+            await aiofiles.os.makedirs(os.path.join(self.directory, "blobs"), exist_ok=True)
+            await aiofiles.os.makedirs(os.path.join(self.directory, "entries"), exist_ok=True)
+
+            def read_entries():
+                entries = []
+                for name in os.listdir(os.path.join(self.directory, "entries")):
+                    path = os.path.join(self.directory, "entries", name)
+                    try:
+                        with open(path, 'r') as f:
+                            entry = AssetCacheEntry(**json.load(f))
+                        if os.path.exists(self.blob_path(entry.digest)):
+                            entries.append((os.path.getmtime(path), entry))
+                    except (OSError, ValueError, TypeError):
+                        continue
+                return [entry for _, entry in sorted(entries, key=lambda item: item[0])]
+
+            for entry in await asyncio.to_thread(read_entries):
+                self.entries[entry.key] = entry
+                self._add_blob(entry.digest, entry.size)
+
+            self.is_loaded = True
+
+    def _add_blob(self, digest: str, size: int):
+        if digest not in self.blob_sizes:
+            self.blob_sizes[digest] = size
+            self.size += size
+
+    async def _remove_blob(self, digest: str):
+        self.size -= self.blob_sizes.pop(digest, 0)
+
+        if digest in self._opening:
+            # Removed once opened, see `open_blob`
+            self._removed_while_opening.add(digest)
+            return
+
+        try:
+            await aiofiles.os.remove(self.blob_path(digest))
+        except FileNotFoundError:
+            pass
+
+    def _touch(self, entry: AssetCacheEntry):
+        self.entries.move_to_end(entry.key)
+
+    async def _save_entry(self, entry: AssetCacheEntry):
+        async with aiofiles.open(self._entry_path(entry.key), 'w') as f:
+            await f.write(json.dumps(entry.to_dict()))
+
+    async def _remove_entry(self, key: str):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+
+        try:
+            await aiofiles.os.remove(self._entry_path(key))
+        except FileNotFoundError:
+            pass
+
+        # Blobs may be shared by entries with the same content
+        if not any(other.digest == entry.digest for other in self.entries.values()):
+            await self._remove_blob(entry.digest)
+
+    async def _evict(self):
+        while self.size > self.max_size and len(self.entries) > 1:
+            key = next(iter(self.entries))
+            logger.debug("Evicting asset cache entry %s", key)
+            await self._remove_entry(key)
+
+    async def _store(self, key: str, response) -> AssetCacheEntry:
+        """
+        Stream a response body to a temporary file, then move it to its content-addressed blob.
+        """
+        fd, tmp_path = await asyncio.to_thread(tempfile.mkstemp, dir=self.directory, suffix=".part")
+        os.close(fd)
+
+        digest = hashlib.sha256()
+        size = 0
+
+        try:
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                async for chunk in response.aiter_bytes(ASSET_CHUNK_SIZE):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    await f.write(chunk)
+
+            # A blob removed while being opened is stored again, it must not be removed afterwards
+            self._removed_while_opening.discard(digest.hexdigest())
+            await aiofiles.os.replace(tmp_path, self.blob_path(digest.hexdigest()))
+        except BaseException:
+            await aiofiles.os.remove(tmp_path)
+            raise
+
+        entry = AssetCacheEntry(
+            key, digest.hexdigest(), size,
+            content_type=response.headers.get("content-type"),
+            etag=response.headers.get("etag"),
+            content_disposition=response.headers.get("content-disposition")
+        )
+
+        previous = self.entries.get(key)
+        if previous and previous.digest != entry.digest:
+            await self._remove_entry(key)
+
+        self.entries[key] = entry
+        self._add_blob(entry.digest, size)
+        await self._save_entry(entry)
+
+        await self._evict()
+
+        return entry
+
+    async def get(
+            self, directus: Directus, file_id: str, parameters: Dict[str, Any]
+    ) -> Tuple[Optional[AssetCacheEntry], Optional[Response]]:
+        """
+        Get the cache entry of a (transformed) asset, fetching or revalidating it when needed.
+
+        :return: The entry, or the error response of Directus when the asset could not be fetched.
+        """
+        await self.load()
+
+        key = get_asset_key(file_id, parameters)
+        lock = self._key_locks.setdefault(key, asyncio.Lock())
+        self._key_lock_users[key] = self._key_lock_users.get(key, 0) + 1
+
+        try:
+            async with lock:
+                return await self._get(directus, file_id, parameters, key)
+        finally:
+            self._key_lock_users[key] -= 1
+            if not self._key_lock_users[key]:
+                del self._key_lock_users[key]
+                del self._key_locks[key]
+
+    async def _get(
+            self, directus: Directus, file_id: str, parameters: Dict[str, Any], key: str
+    ) -> Tuple[Optional[AssetCacheEntry], Optional[Response]]:
+        entry = self.entries.get(key)
+
+        if entry and time.time() - entry.validated_at < self.revalidate_after:
+            self._touch(entry)
+            return entry, None
+
+        headers = {"If-None-Match": entry.etag} if entry and entry.etag else None
+
+        async with directus.connection.stream(
+                "GET", f"{directus.url}/assets/{file_id}",
+                params=normalize_asset_parameters(parameters), headers=headers, auth=directus.auth
+        ) as response:
+            if response.status_code == 304 and entry:
+                entry.validated_at = time.time()
+                self._touch(entry)
+                await self._save_entry(entry)
+                return entry, None
+
+            if response.status_code != 200:
+                await response.aread()
+                return None, Response(
+                    response.content, status_code=response.status_code,
+                    media_type=response.headers.get("content-type")
+                )
+
+            return await self._store(key, response), None
+
+    async def open_blob(self, entry: AssetCacheEntry):
+        """
+        Open the blob of an entry for reading, right after getting the entry.
+
+        An open blob stays readable after the eviction of its entry, and a blob is not removed while it is opened.
+        """
+        digest = entry.digest
+        self._opening[digest] = self._opening.get(digest, 0) + 1
+
+        try:
+            return await aiofiles.open(self.blob_path(digest), 'rb')
+        finally:
+            self._opening[digest] -= 1
+            if not self._opening[digest]:
+                del self._opening[digest]
+
+                if digest in self._removed_while_opening:
+                    self._removed_while_opening.discard(digest)
+                    try:
+                        await aiofiles.os.remove(self.blob_path(digest))
+                    except FileNotFoundError:
+                        pass
+
+    async def iter_blob(
+            self, entry: AssetCacheEntry, start: int = 0, end: Optional[int] = None, blob=None
+    ) -> AsyncIterator[bytes]:
+        """
+        Iterate over the bytes of the blob of an entry, closing the blob (opened with `open_blob`) once done.
+        """
+        remaining = (entry.size if end is None else end + 1) - start
+
+        f = blob or await self.open_blob(entry)
+
+        try:
+            await f.seek(start)
+
+            while remaining > 0:
+                chunk = await f.read(min(ASSET_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            await f.close()
+
+    async def clear(self):
+        await self.load()
+
+        for key in list(self.entries):
+            await self._remove_entry(key)
+
+
+def get_public_directus() -> Directus:
+    return py_directus.directus_public
+
+
+def create_asset_router(
+        cache: Optional[AssetCache] = None, get_directus: Callable[..., Any] = get_public_directus,
+        prefix: str = "/assets", max_age: int = 3600, **router_kwargs
+) -> APIRouter:
+    """
+    Router proxying `/assets/{file_id}` of Directus through a local `AssetCache`.
+
+    Transformation query parameters are forwarded to Directus. Conditional (`If-None-Match`)
+    and single range requests are answered from the cache.
+
+    IMPORTANT: The cache is shared by all callers, so `get_directus` should return a client
+    with the same access for everyone (by default the public client of `async_init`).
+
+    :param cache: The asset cache, a default one is created when missing.
+    :param get_directus: Dependency returning the `Directus` client used to fetch assets.
+    :param prefix: Route prefix.
+    :param max_age: `max-age` (seconds) of the `Cache-Control` header sent to browsers.
+    """
+    cache = cache or AssetCache()
+    router = APIRouter(prefix=prefix, **router_kwargs)
+
+    @router.get("/{file_id}")
+    async def get_asset(
+            file_id: str, request: Request,
+            fit: Optional[str] = None, width: Optional[int] = None, height: Optional[int] = None,
+            quality: Optional[int] = None, withoutEnlargement: Optional[bool] = None,
+            format: Optional[str] = None, transforms: Optional[str] = None, key: Optional[str] = None,
+            download: Optional[str] = None,
+            directus: Directus = Depends(get_directus)
+    ):
+        parameters = ImageFileTransform(
+            fit=fit, width=width, height=height, quality=quality,
+            withoutEnlargement=withoutEnlargement, img_format=format
+        ).parameters
+        parameters.update({"transforms": transforms, "key": key, "download": download})
+
+        entry, error_response = await cache.get(directus, file_id, parameters)
+
+        if error_response is not None:
+            return error_response
+
+        etag = f'"{entry.digest}"'
+        headers = {
+            "ETag": etag,
+            "Accept-Ranges": "bytes",
+            "Cache-Control": f"max-age={max_age}"
+        }
+        if entry.content_disposition:
+            headers["Content-Disposition"] = entry.content_disposition
+
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+
+        # Ranges of an outdated representation are not served
+        if_range = request.headers.get("if-range")
+
+        try:
+            byte_range = parse_range(request.headers.get("range"), entry.size) if if_range in [None, etag] else None
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{entry.size}"})
+
+        # Opened before the response is returned, so the entry may be evicted while it is streamed
+        blob = await cache.open_blob(entry)
+
+        if byte_range is None:
+            return StreamingResponse(
+                cache.iter_blob(entry, blob=blob), media_type=entry.content_type,
+                headers={**headers, "Content-Length": str(entry.size)}
+            )
+
+        start, end = byte_range
+
+        return StreamingResponse(
+            cache.iter_blob(entry, start, end, blob=blob), status_code=206, media_type=entry.content_type,
+            headers={
+                **headers,
+                "Content-Range": f"bytes {start}-{end}/{entry.size}",
+                "Content-Length": str(end - start + 1)
+            }
+        )
+
+    return router
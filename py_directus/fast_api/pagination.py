@@ -0,0 +1,67 @@
+from http import HTTPStatus
+from typing import Optional, Generic, TypeVar, List
+
+from fastapi import Query
+from pydantic import BaseModel
+
+from py_directus.directus_request import DirectusRequest
+from .exceptions import ApiException
+
+
+# Items of a page when the limit is not given, and the most a client can request
+CURSOR_PAGE_LIMIT = 25
+CURSOR_PAGE_MAX_LIMIT = 100
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """
+    Page of a list endpoint, `next_cursor` requests the following page (`None` on the last one).
+    """
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+class CursorParams:
+    """
+    Query parameters of a list endpoint paginated by cursor.
+
+    :example:
+            @app.get("/articles", response_model=CursorPage[Article])
+            async def articles(params: CursorParams = Depends(), directus: Directus = Depends(directus_auth)):
+                return await paginate(directus.collection(Article).sort("date_created", asc=False), params)
+    """
+
+    def __init__(
+            self, cursor: Optional[str] = Query(None),
+            limit: int = Query(CURSOR_PAGE_LIMIT, ge=1, le=CURSOR_PAGE_MAX_LIMIT)
+    ):
+        self.cursor: Optional[str] = cursor
+        self.limit: int = limit
+
+
+async def paginate(request: DirectusRequest, params: CursorParams, key: str = "id") -> CursorPage:
+    """
+    Read the page of a request after the cursor of the parameters (keyset pagination).
+
+    One more item than the limit is requested, to tell whether there is a next page without counting the items.
+
+    :raises ApiException: The cursor is invalid (`400 Bad Request`).
+    """
+    try:
+        request.after(params.cursor, key=key)
+        # Also checks the cursor against the default sort fields of a request without any
+        request._get_keyset_filter()
+    except ValueError:
+        raise ApiException("Invalid cursor", {"cursor": params.cursor}, HTTPStatus.BAD_REQUEST)
+
+    response = await request.limit(params.limit + 1).read()
+    items = response.items or []
+
+    next_cursor = None
+    if len(items) > params.limit:
+        items = items[:params.limit]
+        next_cursor = request.get_cursor(items[-1])
+
+    return CursorPage(items=items, next_cursor=next_cursor)
@@ -1,10 +1,34 @@
 import json
+from functools import lru_cache
+from typing import Optional, Tuple
 
 from rich import print  # noqa
 from rich.console import Console  # noqa
 
 from py_directus.expression import Expression
-from py_directus.operators import FILTER_OPERATORS
+from py_directus.optimizer import optimize_filter
+from py_directus.operators import FILTER_OPERATORS, compile_operator_pattern
+
+
+FILTER_KEY_PATTERN = compile_operator_pattern(FILTER_OPERATORS)
+
+
+@lru_cache(maxsize=4096)
+def _parse_filter_key(key: str) -> Tuple[Optional[Tuple[str, ...]], str]:
+    """
+    Split a filter key (`user__name__contains`) into its field parts and operator.
+    """
+    match = FILTER_KEY_PATTERN.match(key)
+
+    # No operator matched, which we assume was not provided.
+    # Thus we use the default 'equals' operator.
+    if match is None:
+        return tuple(key.replace("__", ".").split(".")), "_eq"
+
+    field, operator = match.groups()
+
+    # Deep fields
+    return (tuple(field.replace("__", ".").split(".")) if field else None), operator
 
 
 class F(Expression):
@@ -13,59 +37,41 @@ class F(Expression):
     """
 
     def __init__(self, **kwargs):
-        # Initialize the query as an empty dictionary
-        self.query = {}
-
         # Parse keyword arguments into query format
-        for key, value in kwargs.items():
-            field, operator = F.parse_key(key)
-            if not field:  # its a logical operator
-                self.query[operator] = value
-                continue
-            field_parts = field.split(".")
-            field = field_parts[0]
-
-            if field not in self.query:
-                self.query[field] = {}
-            # convert deep fields from dot notation to nested dicts
-            if len(field_parts) > 1:
-                inner_dict = {operator: value}
-                for part in reversed(field_parts[1:]):
-                    inner_dict = {part: inner_dict}
-                self.query[field] = {**self.query[field], **inner_dict}
-            else:
-                self.query[field][operator] = value
+        queries = [F._key_query(key, value) for key, value in kwargs.items()]
 
-        if len(kwargs.items()) > 1:
-            inner_queries = []
-            for key, value in kwargs.items():
-                inner_queries.append(F(**{key: value}).query)
-            self.query = {"_and": inner_queries}
+        if len(queries) > 1:
+            self.query = {"_and": queries}
+        else:
+            self.query = queries[0] if queries else {}
 
     @staticmethod
-    def parse_key(key):
-        field = None
-        operator = None
+    def _key_query(key: str, value) -> dict:
+        field_parts, operator = _parse_filter_key(key)
 
-        for _operator in FILTER_OPERATORS:
-            if key.endswith("_" + _operator):
-                field = key[:-len("_" + _operator)]
-                operator = _operator
-                break
+        if not field_parts:  # its a logical operator
+            return {operator: value}
 
-        # No operator matched, which we assume was not provided.
-        # Thus we use the default 'equals' operator.
-        if field is None:
-            operator = "_eq"
-            field = key.replace("__", ".")
-            return field, operator
+        # convert deep fields from dot notation to nested dicts
+        inner_dict = {operator: value}
+        for part in reversed(field_parts[1:]):
+            inner_dict = {part: inner_dict}
 
-        # Deep fields
-        field = field.replace("__", ".")
+        return {field_parts[0]: inner_dict}
 
-        if field == "":
-            field = None
-        return field, operator
+    @staticmethod
+    def parse_key(key):
+        field_parts, operator = _parse_filter_key(key)
+        return (".".join(field_parts) if field_parts else None), operator
+
+    @classmethod
+    def _from_query(cls, query: dict) -> 'F':
+        """
+        Wrap an already built query, without parsing any key.
+        """
+        obj = cls.__new__(cls)
+        obj.query = query
+        return obj
 
     def combine(self, other: 'F', operator: str) -> 'F':
         if other is None:
@@ -75,7 +81,25 @@ class F(Expression):
                 return self
             elif self.query == {}:
                 return other
-            return F(**{operator: [self.query, other.query]})
+
+            # "__and" -> "_and"
+            logical_operator = operator[1:]
+
+            # Chains of the same operator are flattened into a single list (`a & b & c` -> `_and: [a, b, c]`)
+            operands = []
+            for query in (self.query, other.query):
+                if len(query) == 1 and isinstance(query.get(logical_operator), list):
+                    operands.extend(query[logical_operator])
+                else:
+                    operands.append(query)
+
+            return F._from_query({logical_operator: operands})
+
+    def optimized(self) -> 'F':
+        """
+        A simplified, equivalent filter (see `py_directus.optimizer.optimize_filter`).
+        """
+        return F._from_query(optimize_filter(self.query))
 
     def __and__(self, other: 'F'):
         return self.combine(other, "__and")
@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional, Dict, List
+
+import py_directus
+from py_directus.cache import _is_expired
+
+if TYPE_CHECKING:
+    from py_directus import Directus
+
+
+FOLDER_SEPARATOR = "/"
+
+# Seconds after which a folder missing from the index is looked up again, folders may be created elsewhere
+FOLDER_INDEX_TTL = 10
+
+
+def normalize_folder_path(path: str) -> str:
+    """
+    Normalize a folder path (`"/Media//2024/"` -> `"Media/2024"`).
+    """
+    return FOLDER_SEPARATOR.join(part for part in path.split(FOLDER_SEPARATOR) if part)
+
+
+class FolderIndex:
+    """
+    Cached index of the `directus_folders` tree, mapping folder paths (`"Media/2024"`) to ids.
+
+    The whole tree is read once and missing folders are created on demand,
+    so resolving a folder does not cost a request per file. A folder missing from an index older
+    than its `ttl` reloads the tree once before it is reported missing (or created).
+    """
+
+    def __init__(self, directus: 'Directus', ttl: Optional[int] = FOLDER_INDEX_TTL):
+        self.directus: 'Directus' = directus
+        self.ttl: Optional[int] = ttl
+
+        self.paths: Dict[str, str] = {}
+        self.names: Dict[str, List[str]] = {}
+        self.is_loaded: bool = False
+        self.loaded_at: Optional[datetime] = None
+
+        self._lock = asyncio.Lock()
+
+    async def load(self):
+        """
+        (Re)Load the folder tree.
+        """
+        response = await self.directus.collection(py_directus.DirectusFolder).fields(
+            "id", "name", "parent"
+        ).limit(-1).read()
+
+        folders = {folder["id"]: folder for folder in (response.items_as_dict() or [])}
+
+        def get_path(folder_id: str, seen=()) -> str:
+            folder = folders[folder_id]
+            parent = folder.get("parent")
+            # Unknown (inaccessible) or cyclic parents are treated as the root
+            if parent in folders and parent not in seen:
+                return f"{get_path(parent, (*seen, folder_id))}{FOLDER_SEPARATOR}{folder['name']}"
+            return folder["name"]
+
+        self.paths = {}
+        self.names = {}
+        for folder_id, folder in folders.items():
+            self.paths[get_path(folder_id)] = folder_id
+            self.names.setdefault(folder["name"], []).append(folder_id)
+
+        self.is_loaded = True
+        self.loaded_at = datetime.utcnow()
+
+    def clear(self):
+        self.paths = {}
+        self.names = {}
+        self.is_loaded = False
+        self.loaded_at = None
+
+    def _lookup(self, path: str) -> Optional[str]:
+        if path in self.paths:
+            return self.paths[path]
+
+        if FOLDER_SEPARATOR not in path and path in self.names:
+            return self.names[path][0]
+
+        return None
+
+    async def _create(self, name: str, parent_id: Optional[str]) -> str:
+        response = await self.directus.collection(py_directus.DirectusFolder).create(
+            {"name": name, "parent": parent_id}
+        )
+        return response.item_as_dict()["id"]
+
+    async def get(self, folder: str, create: bool = False) -> Optional[str]:
+        """
+        Resolve a folder to its id.
+
+        :param folder: Folder path (`"Media/2024"`) or, when it has no separator, the name of a folder at any level.
+        :param create: Create the missing folders of the path.
+        """
+        path = normalize_folder_path(folder)
+
+        async with self._lock:
+            if not self.is_loaded:
+                await self.load()
+
+            folder_id = self._lookup(path)
+            if folder_id is None and _is_expired(self.loaded_at, self.ttl):
+                # The folder may have been created since the tree was read
+                await self.load()
+                folder_id = self._lookup(path)
+
+            if folder_id is not None or not create:
+                return folder_id
+
+            parent_id = None
+            current_path = ""
+            for name in path.split(FOLDER_SEPARATOR):
+                current_path = f"{current_path}{FOLDER_SEPARATOR}{name}" if current_path else name
+
+                if current_path not in self.paths:
+                    self.paths[current_path] = await self._create(name, parent_id)
+                    self.names.setdefault(name, []).append(self.paths[current_path])
+
+                parent_id = self.paths[current_path]
+
+            return parent_id
@@ -0,0 +1,114 @@
+import base64
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from pydantic import BaseModel
+
+from py_directus.filter import F
+
+
+def _field_key(field: str) -> str:
+    # Keyword arguments of `F` separate nested fields with a double underscore
+    return field.replace(".", "__")
+
+
+def keyset_filter(sort: Sequence[str], values: Sequence[Any]) -> F:
+    """
+    Filter of the items after an item, in the order of the `sort` parameter (`["-date_created", "id"]`),
+    given the values of the sort fields of that item.
+
+    `sort=["a", "-b"]`, `values=[1, 2]` -> `a > 1 or (a = 1 and b < 2)`
+    """
+    if len(sort) != len(values):
+        raise ValueError(f"Expected {len(sort)} values for the sort fields {list(sort)}, got {len(values)}")
+
+    query = F()
+    equal: List[F] = []
+
+    for field, value in zip(sort, values):
+        if value is None:
+            raise ValueError(f"Items cannot be paginated after a null value of '{field.lstrip('-')}'")
+
+        operator = "lt" if field.startswith("-") else "gt"
+        field = _field_key(field.lstrip("-"))
+
+        condition = F(**{f"{field}__{operator}": value})
+        for equal_condition in reversed(equal):
+            condition = equal_condition & condition
+
+        query |= condition
+        equal.append(F(**{field: value}))
+
+    return query
+
+
+def keyset_sort(sort: Optional[Sequence[str]], key: str = "id") -> List[str]:
+    """
+    The sort fields, followed by the primary key when missing, so that every item has a distinct position.
+    """
+    sort = list(sort or [])
+    if key not in (field.lstrip("-") for field in sort):
+        sort.append(key)
+    return sort
+
+
+def with_sort_fields(fields: Optional[str], sort: Sequence[str]) -> Optional[str]:
+    """
+    The `fields` parameter, with the sort fields needed to paginate after the last item.
+    """
+    if not isinstance(fields, str) or "*" in fields.split(","):
+        return fields
+
+    requested = fields.split(",")
+    missing = [field.lstrip("-") for field in sort if field.lstrip("-") not in requested]
+    return ",".join([*requested, *missing])
+
+
+def cursor_values(item: Union[Dict[str, Any], BaseModel], sort: Sequence[str]) -> List[Any]:
+    """
+    The values of the sort fields of an item (nested fields are separated with a dot).
+
+    :raises ValueError: The item has no value, or a null value, for a sort field (items cannot be paginated after it).
+    """
+    if isinstance(item, BaseModel):
+        item = item.model_dump(mode="json", by_alias=True)
+
+    values = []
+    for field in sort:
+        value = item
+        for part in field.lstrip("-").split("."):
+            if not isinstance(value, dict) or part not in value:
+                raise ValueError(f"The item has no value for the sort field '{field.lstrip('-')}'")
+            value = value[part]
+
+        if value is None:
+            raise ValueError(f"Items cannot be paginated after a null value of '{field.lstrip('-')}'")
+        values.append(value)
+
+    return values
+
+
+def encode_cursor(sort: Sequence[str], values: Sequence[Any]) -> str:
+    """
+    Opaque cursor of the position of an item in the order of `sort`, safe in URLs.
+    """
+    payload = json.dumps([list(sort), list(values)], separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[List[str], List[Any]]:
+    """
+    The sort fields and values of an encoded cursor.
+
+    :raises ValueError: The cursor is malformed.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort, values = json.loads(payload)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid cursor {cursor!r}") from exc
+
+    if not isinstance(sort, list) or not isinstance(values, list) or len(sort) != len(values):
+        raise ValueError(f"Invalid cursor {cursor!r}")
+
+    return sort, values
@@ -0,0 +1,149 @@
+import json
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Optional, Union, Type, Any, Dict, List, Tuple, Iterable
+
+from pydantic import BaseModel
+
+from py_directus.directus_request import DirectusRequest
+
+if TYPE_CHECKING:
+    from py_directus import Directus
+
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of ids of a single batched request
+LOADER_BATCH_SIZE = 100
+
+# Maximum size (bytes) of the serialized ids of a single batched request
+LOADER_MAX_IDS_SIZE = 16 * 1024
+
+# Query parameters which do not apply to reads by id, the filter and search narrow the loaded items
+LOADER_IGNORED_PARAMS = ("sort", "limit", "offset", "page", "aggregate", "groupBy", "meta")
+
+
+class DataLoader:
+    """
+    Batch the reads by id of a collection.
+
+    Every `load` made within the same event loop iteration is collected and sent as a single
+    `<key>__in` request (split in chunks when there are many ids), along with the filter of the
+    parameters. With `cache`, loaded items are
+    kept for the life of the loader, so an id is requested once no matter how many times it is loaded,
+    else they are only shared by the loads of the same batch.
+    """
+
+    def __init__(
+            self, directus: 'Directus', collection: str,
+            collection_class: Optional[Union[Type[BaseModel], str]] = None,
+            params: Optional[Dict[Any, Any]] = None, key: str = "id",
+            batch_size: int = LOADER_BATCH_SIZE, max_ids_size: int = LOADER_MAX_IDS_SIZE, cache: bool = True
+    ):
+        self.directus: 'Directus' = directus
+        self.collection: str = collection
+        self.collection_class: Optional[Union[Type[BaseModel], str]] = collection_class
+        self.params: Dict[Any, Any] = {k: v for k, v in (params or {}).items() if k not in LOADER_IGNORED_PARAMS}
+        self.key: str = key
+        self.batch_size: int = batch_size
+        self.max_ids_size: int = max_ids_size
+        self.cache: bool = cache
+
+        self._results: Dict[str, asyncio.Future] = {}
+        self._queue: Dict[str, Tuple[Any, asyncio.Future]] = {}
+        self._dispatch_scheduled: bool = False
+
+    async def load(self, id: Any) -> Optional[Dict[Any, Any]]:
+        """
+        The item with the given id (as a dictionary), `None` when it does not exist or is not accessible.
+        """
+        cache_key = str(id)
+
+        if cache_key not in self._results:
+            loop = asyncio.get_running_loop()
+            self._results[cache_key] = loop.create_future()
+            self._queue[cache_key] = (id, self._results[cache_key])
+
+            # Dispatch once the coroutines of the current iteration had the chance to load their ids
+            if not self._dispatch_scheduled:
+                self._dispatch_scheduled = True
+                loop.call_soon(lambda: asyncio.ensure_future(self._dispatch()))
+
+        return await asyncio.shield(self._results[cache_key])
+
+    async def load_many(self, ids: Iterable[Any]) -> List[Optional[Dict[Any, Any]]]:
+        return list(await asyncio.gather(*[self.load(id) for id in ids]))
+
+    def prime(self, item: Dict[Any, Any]):
+        """
+        Add an already fetched item.
+        """
+        if not self.cache:
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(item)
+        self._results[str(item[self.key])] = future
+
+    def clear(self, id: Any = None):
+        """
+        Forget a loaded item, or every loaded item when no id is given.
+        """
+        if id is None:
+            self._results = {k: v for k, v in self._results.items() if not v.done()}
+        elif str(id) in self._results and self._results[str(id)].done():
+            del self._results[str(id)]
+
+    def _chunks(
+            self, queue: Dict[str, Tuple[Any, asyncio.Future]]
+    ) -> List[Dict[str, Tuple[Any, asyncio.Future]]]:
+        chunks = []
+        chunk, chunk_size = {}, 0
+
+        for cache_key, (id, future) in queue.items():
+            id_size = len(json.dumps(id, default=str)) + 1
+
+            if chunk and (len(chunk) >= self.batch_size or chunk_size + id_size > self.max_ids_size):
+                chunks.append(chunk)
+                chunk, chunk_size = {}, 0
+
+            chunk[cache_key] = (id, future)
+            chunk_size += id_size
+
+        if chunk:
+            chunks.append(chunk)
+
+        return chunks
+
+    async def _dispatch(self):
+        queue, self._queue = self._queue, {}
+        self._dispatch_scheduled = False
+
+        await asyncio.gather(*[self._load_chunk(chunk) for chunk in self._chunks(queue)])
+
+    async def _load_chunk(self, chunk: Dict[str, Tuple[Any, asyncio.Future]]):
+        logger.debug("Loading %d items of %s", len(chunk), self.collection)
+
+        request = DirectusRequest(self.directus, self.collection, self.collection_class)
+        request.params.update(self.params)
+
+        # The key is needed to dispatch the items
+        if isinstance(request.params.get("fields"), str) and self.key not in request.params["fields"].split(","):
+            request.params["fields"] = f"{request.params['fields']},{self.key}"
+
+        try:
+            response = await request.filter(**{f"{self.key}__in": [id for id, _ in chunk.values()]}).limit(-1).read()
+            items = {str(item.get(self.key)): item for item in (response.items_as_dict() or [])}
+        except Exception as exc:
+            for cache_key, (_, future) in chunk.items():
+                # Failed loads are not kept, a later load tries again
+                if self._results.get(cache_key) is future:
+                    del self._results[cache_key]
+                future.set_exception(exc)
+            return
+
+        for cache_key, (_, future) in chunk.items():
+            future.set_result(items.get(cache_key))
+
+            if not self.cache and self._results.get(cache_key) is future:
+                del self._results[cache_key]
@@ -0,0 +1,194 @@
+import os
+import json
+import logging
+from typing import TYPE_CHECKING, Optional, Any, Dict, List, AsyncIterator
+
+import aiofiles
+import aiofiles.os
+
+import py_directus
+from py_directus.filter import F
+from py_directus.storage import _validate_file_name
+from py_directus.transfers import TRANSFER_CONCURRENCY, TransferResult, run_transfers
+
+if TYPE_CHECKING:
+    from py_directus import Directus
+
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".directus_manifest.json"
+
+# Number of `directus_files` records read per request
+SYNC_PAGE_SIZE = 500
+
+SYNC_FIELDS = ("id", "filename_disk", "filesize", "modified_on", "uploaded_on")
+
+
+class SyncResult:
+    """
+    Outcome of an asset mirror synchronization.
+    """
+
+    def __init__(self):
+        self.downloaded: List[TransferResult] = []
+        self.unchanged: int = 0
+        self.pruned: List[str] = []
+
+    @property
+    def failed(self) -> List[TransferResult]:
+        return [result for result in self.downloaded if not result.ok]
+
+    def __repr__(self):
+        return (
+            f"<SyncResult downloaded={len(self.downloaded) - len(self.failed)} failed={len(self.failed)} "
+            f"unchanged={self.unchanged} pruned={len(self.pruned)}>"
+        )
+
+
+def _local_name(record: Dict[str, Any]) -> str:
+    # `filename_disk` is unique within the Directus storage
+    return _validate_file_name(record.get("filename_disk") or record["id"])
+
+
+def _is_changed(record: Dict[str, Any], entry: Optional[Dict[str, Any]]) -> bool:
+    if entry is None:
+        return True
+    return any(entry.get(field) != record.get(field) for field in SYNC_FIELDS)
+
+
+class AssetMirror:
+    """
+    Local mirror of Directus assets, kept in sync through the `directus_files` metadata.
+
+    A manifest in the destination directory records the metadata of every mirrored file, so a
+    synchronization only downloads new or changed files. Without pruning, only files uploaded or
+    modified since the previous synchronization are listed.
+    """
+
+    def __init__(self, directus: 'Directus', dest: str):
+        self.directus: 'Directus' = directus
+        self.dest: str = dest
+        self.manifest_path: str = os.path.join(dest, MANIFEST_NAME)
+
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.cursor: Optional[str] = None
+
+    async def load_manifest(self):
+        if not await aiofiles.os.path.exists(self.manifest_path):
+            return
+
+        async with aiofiles.open(self.manifest_path, 'r') as f:
+            manifest = json.loads(await f.read())
+
+        self.files = manifest.get("files", {})
+        self.cursor = manifest.get("cursor")
+
+    async def save_manifest(self):
+        # Write and move, so an interrupted write does not corrupt the manifest
+        tmp_path = f"{self.manifest_path}.tmp"
+
+        async with aiofiles.open(tmp_path, 'w') as f:
+            await f.write(json.dumps({"cursor": self.cursor, "files": self.files}))
+
+        await aiofiles.os.replace(tmp_path, self.manifest_path)
+
+    async def iter_records(
+            self, filter: Optional[F] = None, since: Optional[str] = None, fields=SYNC_FIELDS,
+            page_size: int = SYNC_PAGE_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        List the `directus_files` records page by page, paginating on the primary key.
+        """
+        last_id = None
+
+        while True:
+            request = self.directus.collection(py_directus.DirectusFile).fields(*fields).sort("id").limit(page_size)
+
+            if filter is not None:
+                request.filter(filter)
+            if since is not None:
+                request.filter(F(modified_on__gte=since) | F(uploaded_on__gte=since))
+            if last_id is not None:
+                request.filter(id__gt=last_id)
+
+            records = (await request.read()).items_as_dict() or []
+
+            for record in records:
+                yield record
+
+            if len(records) < page_size:
+                return
+
+            last_id = records[-1]["id"]
+
+    async def sync(
+            self, filter: Optional[F] = None, prune: bool = False,
+            concurrency: int = TRANSFER_CONCURRENCY, retries: int = 3, page_size: int = SYNC_PAGE_SIZE
+    ) -> SyncResult:
+        await aiofiles.os.makedirs(self.dest, exist_ok=True)
+        await self.load_manifest()
+
+        result = SyncResult()
+        changed: Dict[str, Dict[str, Any]] = {}
+        seen_ids = set()
+        cursor = self.cursor
+
+        # Pruning needs every id, otherwise only the records changed since the last synchronization
+        since = None if prune else self.cursor
+
+        async for record in self.iter_records(filter=filter, since=since, page_size=page_size):
+            seen_ids.add(record["id"])
+
+            for field in ("modified_on", "uploaded_on"):
+                if record.get(field) and (cursor is None or record[field] > cursor):
+                    cursor = record[field]
+
+            entry = self.files.get(record["id"])
+            if _is_changed(record, entry) or not await aiofiles.os.path.exists(
+                    os.path.join(self.dest, entry["name"])
+            ):
+                changed[record["id"]] = record
+            else:
+                result.unchanged += 1
+
+        async def download(file_id: str) -> str:
+            record = changed[file_id]
+            name = _local_name(record)
+
+            response, _ = await self.directus._download_file(
+                file_id, {}, destination=os.path.join(self.dest, name)
+            )
+            response.raise_for_status()
+
+            # A renamed file leaves its previous copy behind
+            previous = self.files.get(file_id)
+            if previous and previous["name"] != name:
+                await _remove(os.path.join(self.dest, previous["name"]))
+
+            self.files[file_id] = {**{field: record.get(field) for field in SYNC_FIELDS}, "name": name}
+            return name
+
+        result.downloaded = await run_transfers(list(changed), download, concurrency=concurrency, retries=retries)
+
+        if prune:
+            for file_id in [file_id for file_id in self.files if file_id not in seen_ids]:
+                await _remove(os.path.join(self.dest, self.files.pop(file_id)["name"]))
+                result.pruned.append(file_id)
+
+        # Failed downloads are picked up again by the next synchronization
+        if not result.failed:
+            self.cursor = cursor
+
+        await self.save_manifest()
+
+        logger.debug("Synchronized assets in %s: %s", self.dest, result)
+
+        return result
+
+
+async def _remove(path: str):
+    try:
+        await aiofiles.os.remove(path)
+    except FileNotFoundError:
+        pass
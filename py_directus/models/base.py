@@ -7,6 +7,9 @@ from pydantic.main import _model_construction, BaseModel
 
 class DirectusConfigDict(ConfigDict):
     collection: str
+    # Request only the declared fields (see `DirectusRequest.auto_fields`)
+    auto_fields: bool
+    auto_fields_depth: int
 
 
 class DirectusModelMetaclass(_model_construction.ModelMetaclass):
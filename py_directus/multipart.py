@@ -0,0 +1,189 @@
+import os
+import asyncio
+import secrets
+from typing import (
+    Union, Optional,
+    Any, Dict, Tuple,
+    AsyncIterable, AsyncIterator
+)
+
+import aiofiles
+import aiofiles.os
+import magic
+
+try:
+    from starlette.datastructures import UploadFile
+except ImportError:
+    UploadFile = None
+
+
+# Size of the chunks read from the upload source
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Number of leading bytes used to detect the MIME type of an upload
+MIME_SNIFF_SIZE = 8 * 1024
+
+DEFAULT_MIME_TYPE = "application/octet-stream"
+
+_HEADER_ESCAPES = {'"': "%22", "\\": "\\\\", "\r": "%0D", "\n": "%0A"}
+
+
+async def iter_path(path: str, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Read a local file chunk by chunk, off the event loop.
+    """
+    async with aiofiles.open(path, 'rb') as f:
+        while chunk := await f.read(chunk_size):
+            yield chunk
+
+
+async def iter_upload_file(upload_file: 'UploadFile', chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Read a `starlette.UploadFile` chunk by chunk.
+    """
+    while chunk := await upload_file.read(chunk_size):
+        yield chunk
+
+
+async def peek(chunks: AsyncIterable[bytes], size: int = MIME_SNIFF_SIZE) -> Tuple[bytes, AsyncIterator[bytes]]:
+    """
+    Read at least `size` leading bytes of a chunk stream (unless it is shorter).
+
+    Returns the leading bytes and an iterator over the complete stream, leading bytes included.
+    """
+    iterator = chunks.__aiter__()
+
+    head = b""
+    while len(head) < size:
+        try:
+            head += await iterator.__anext__()
+        except StopAsyncIteration:
+            break
+
+    async def rejoined():
+        if head:
+            yield head
+        async for chunk in iterator:
+            yield chunk
+
+    return head, rejoined()
+
+
+async def sniff_mime(head: bytes) -> str:
+    """
+    Detect the MIME type from the leading bytes of a file, in a worker thread.
+    """
+    if not head:
+        return DEFAULT_MIME_TYPE
+
+    return await asyncio.to_thread(magic.from_buffer, head[:MIME_SNIFF_SIZE], mime=True)
+
+
+async def sniff_file_mime(path: str) -> str:
+    """
+    Detect the MIME type of a local file from its leading bytes.
+    """
+    async with aiofiles.open(path, 'rb') as f:
+        return await sniff_mime(await f.read(MIME_SNIFF_SIZE))
+
+
+def _format_header_param(name: str, value: str) -> str:
+    for char, escaped in _HEADER_ESCAPES.items():
+        value = value.replace(char, escaped)
+    return f'{name}="{value}"'
+
+
+class MultipartStream:
+    """
+    Asynchronous `multipart/form-data` body with a single streamed file part.
+
+    Form fields are sent first and the file part last, as Directus expects.
+    """
+
+    def __init__(
+            self, data: Dict[str, Any], file_name: str, file_chunks: AsyncIterable[bytes],
+            file_mime: str = DEFAULT_MIME_TYPE, file_size: Optional[int] = None,
+            field_name: str = "file", boundary: Optional[str] = None
+    ):
+        self.boundary: str = boundary or secrets.token_hex(16)
+        self.file_chunks: AsyncIterable[bytes] = file_chunks
+        self.file_size: Optional[int] = file_size
+
+        self._preamble: bytes = b"".join([
+            *[self._field_part(name, value) for name, value in data.items() if value is not None],
+            self._file_header(field_name, file_name, file_mime)
+        ])
+        self._epilogue: bytes = f"\r\n--{self.boundary}--\r\n".encode('utf-8')
+
+    def _field_part(self, name: str, value: Any) -> bytes:
+        return (
+            f"--{self.boundary}\r\n"
+            f"Content-Disposition: form-data; {_format_header_param('name', name)}\r\n\r\n"
+            f"{value}\r\n"
+        ).encode('utf-8')
+
+    def _file_header(self, name: str, file_name: str, file_mime: str) -> bytes:
+        return (
+            f"--{self.boundary}\r\n"
+            f"Content-Disposition: form-data; {_format_header_param('name', name)}; "
+            f"{_format_header_param('filename', file_name)}\r\n"
+            f"Content-Type: {file_mime}\r\n\r\n"
+        ).encode('utf-8')
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": f"multipart/form-data; boundary={self.boundary}"}
+
+        # Known sizes avoid chunked transfer encoding
+        if self.file_size is not None:
+            headers["Content-Length"] = str(len(self._preamble) + self.file_size + len(self._epilogue))
+
+        return headers
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield self._preamble
+        async for chunk in self.file_chunks:
+            yield chunk
+        yield self._epilogue
+
+
+async def prepare_upload(
+        to_upload: Union[str, 'UploadFile', AsyncIterable[bytes]],
+        data: Dict[str, Any],
+        file_name: Optional[str] = None,
+        file_mime: Optional[str] = None,
+        chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> MultipartStream:
+    """
+    Build a streamed multipart body for a local file path, a `starlette.UploadFile` or an async byte iterator.
+
+    The MIME type, unless given, is detected from the first `MIME_SNIFF_SIZE` bytes.
+    """
+    file_size = None
+
+    if isinstance(to_upload, str):
+        file_name = file_name or os.path.basename(to_upload)
+        file_size = await aiofiles.os.path.getsize(to_upload)
+        chunks = iter_path(to_upload, chunk_size)
+    elif UploadFile is not None and isinstance(to_upload, UploadFile):
+        file_name = file_name or to_upload.filename
+        file_mime = file_mime or to_upload.content_type
+        file_size = to_upload.size
+        chunks = iter_upload_file(to_upload, chunk_size)
+    elif isinstance(to_upload, AsyncIterable):
+        if not file_name:
+            raise ValueError("A file name is required when uploading from an async iterator.")
+        chunks = to_upload
+    else:
+        raise TypeError(
+            "The `to_upload` argument must be either a string, a `fastapi.UploadFile` instance or an async iterator."
+        )
+
+    if not file_mime:
+        head, chunks = await peek(chunks)
+        file_mime = await sniff_mime(head)
+
+    return MultipartStream(
+        {"title": os.path.splitext(file_name)[0], **data},
+        file_name, chunks, file_mime=file_mime, file_size=file_size
+    )
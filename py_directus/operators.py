@@ -1,4 +1,6 @@
+import re
 from enum import Enum
+from typing import Iterable
 
 
 FILTER_OPERATORS = {
@@ -58,3 +60,13 @@ AGGREGATION_OPERATORS = {
     "_min": AggregationOperators.Minimum,
     "_max": AggregationOperators.Maximum
 }
+
+
+def compile_operator_pattern(operators: Iterable[str]) -> 're.Pattern':
+    """
+    Compile a pattern splitting `<field>_<operator>` keys (`age__gt`) in a single match.
+
+    Longer operators come first in the alternation, so no operator shadows another one ending the same way.
+    """
+    alternatives = "|".join(re.escape(operator) for operator in sorted(operators, key=len, reverse=True))
+    return re.compile(f"^(.*)_({alternatives})$", re.DOTALL)
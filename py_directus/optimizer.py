@@ -0,0 +1,172 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+LOGICAL_OPERATORS = ("_and", "_or")
+
+# Operators whose value is a set of values, so order and repeats do not matter
+SET_OPERATORS = ("_in", "_nin")
+
+# Operators whose value is a filter itself (relational fields)
+NESTED_OPERATORS = ("_some", "_none")
+
+
+def _is_scalar(value: Any) -> bool:
+    return isinstance(value, (str, int, float, bool))
+
+
+def _value_key(value: Any) -> Tuple[str, Any]:
+    # `1 == True`, but they are different filter values
+    return type(value).__name__, value
+
+
+def _canonical(query: Any) -> str:
+    return json.dumps(query, sort_keys=True, default=str)
+
+
+def _normalize_values(values: List[Any]) -> List[Any]:
+    """
+    Deduplicate and sort the values of a set operator, lists with non scalar values are kept as they are.
+    """
+    if not all(_is_scalar(value) for value in values):
+        return values
+
+    unique = {_value_key(value): value for value in values}
+    return [unique[key] for key in sorted(unique)]
+
+
+def _field_condition(query: Dict[str, Any]) -> Optional[Tuple[Tuple[str, ...], str, Any]]:
+    """
+    Split a single condition (`{"user": {"name": {"_eq": "John"}}}`) into its field path, operator and value.
+    """
+    path = []
+
+    while isinstance(query, dict) and len(query) == 1:
+        key, value = next(iter(query.items()))
+
+        if key.startswith("_"):
+            return (tuple(path), key, value) if path else None
+
+        path.append(key)
+        query = value
+
+    return None
+
+
+def _build_condition(path: Tuple[str, ...], operator: str, value: Any) -> Dict[str, Any]:
+    condition = {operator: value}
+    for part in reversed(path):
+        condition = {part: condition}
+    return condition
+
+
+def _merge_equalities(operands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Merge the equality (and `_in`) conditions of a disjunction on the same field into a single `_in`.
+    """
+    merged: Dict[Tuple[str, ...], List[Any]] = {}
+    positions: Dict[Tuple[str, ...], int] = {}
+    result: List[Any] = []
+
+    for operand in operands:
+        condition = _field_condition(operand)
+
+        if condition is not None:
+            path, operator, value = condition
+
+            # `NULL` never matches `IN`, so null equalities are kept as they are
+            values = [value] if operator == "_eq" else value if operator == "_in" else None
+
+            if isinstance(values, list) and values and all(_is_scalar(item) for item in values):
+                if path not in merged:
+                    merged[path] = []
+                    positions[path] = len(result)
+                    result.append(None)
+                merged[path].extend(values)
+                continue
+
+        result.append(operand)
+
+    for path, values in merged.items():
+        values = _normalize_values(values)
+        result[positions[path]] = _build_condition(path, "_eq", values[0]) if len(values) == 1 else (
+            _build_condition(path, "_in", values)
+        )
+
+    return result
+
+
+def _optimize_group(operator: str, operands: List[Any]) -> Dict[str, Any]:
+    flattened = []
+
+    for operand in operands:
+        operand = optimize_filter(operand)
+
+        # Nested groups of the same operator
+        if isinstance(operand, dict) and len(operand) == 1 and isinstance(operand.get(operator), list):
+            flattened.extend(operand[operator])
+        else:
+            flattened.append(operand)
+
+    # An empty filter is always true: it does not change a conjunction and makes a disjunction true
+    if any(operand == {} for operand in flattened):
+        if operator == "_or":
+            return {}
+        flattened = [operand for operand in flattened if operand != {}]
+
+    if operator == "_or":
+        flattened = _merge_equalities(flattened)
+
+    # Duplicate operands
+    unique = {}
+    for operand in flattened:
+        unique.setdefault(_canonical(operand), operand)
+    flattened = list(unique.values())
+
+    if not flattened:
+        # `_and: []` is true, an empty disjunction is left for Directus to decide
+        return {} if operator == "_and" else {operator: []}
+
+    # Trivial groups
+    if len(flattened) == 1:
+        return flattened[0]
+
+    return {operator: flattened}
+
+
+def optimize_filter(query: Any) -> Any:
+    """
+    Rewrite a filter query into a simpler, canonical equivalent.
+
+    - Equality disjunctions on a field are merged into `_in` (`a = 1 OR a = 2` -> `a IN (1, 2)`)
+    - `_in`/`_nin` values are deduplicated and sorted
+    - Nested groups of the same operator are flattened and duplicate operands dropped
+    - Tautologies (empty filters) are dropped and single operand groups collapsed
+    """
+    if not isinstance(query, dict):
+        return query
+
+    optimized = {}
+
+    for key, value in query.items():
+        if key in LOGICAL_OPERATORS and isinstance(value, list):
+            group = _optimize_group(key, value)
+
+            if len(query) == 1:
+                return group
+
+            # Next to other conditions the group keeps its operator, a true group is dropped
+            if group:
+                optimized[key] = group[key] if list(group) == [key] else [group]
+        elif key in SET_OPERATORS and isinstance(value, list):
+            optimized[key] = _normalize_values(value)
+        elif isinstance(value, dict) and (key in NESTED_OPERATORS or not key.startswith("_")):
+            value = optimize_filter(value)
+
+            # A field without any condition is always true
+            if value != {}:
+                optimized[key] = value
+        else:
+            optimized[key] = value
+
+    return optimized
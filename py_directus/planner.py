@@ -0,0 +1,196 @@
+import asyncio
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Type, Any, Dict, List, Tuple, Iterable, get_args, get_origin
+
+from pydantic import BaseModel
+
+from py_directus.projection import _related_models
+
+if TYPE_CHECKING:
+    from py_directus import Directus
+
+
+# Maximum estimated number of related items per fetched item for a relation to be inlined
+INLINE_FANOUT_LIMIT = 50
+
+# Estimated number of related items of a to-many relation, when no hint is given
+DEFAULT_TO_MANY_FANOUT = 10
+
+
+def _is_many(annotation: Any) -> bool:
+    """
+    Whether a relational field annotation holds many related items (`List[Union[int, Line]]`).
+    """
+    if get_origin(annotation) in (list, set, tuple, frozenset):
+        return True
+    return any(_is_many(arg) for arg in get_args(annotation))
+
+
+def _include_tree(includes: Iterable[str]) -> Dict[str, Any]:
+    tree = {}
+    for path in includes:
+        node = tree
+        for part in path.replace("__", ".").split("."):
+            node = node.setdefault(part, {})
+    return tree
+
+
+class BatchedRelation:
+    """
+    Relation fetched with a second query, from the ids returned by the first one.
+    """
+
+    def __init__(self, path: Tuple[str, ...], model: Type[BaseModel], plan: 'FetchPlan'):
+        self.path: Tuple[str, ...] = path
+        self.model: Type[BaseModel] = model
+        self.plan: 'FetchPlan' = plan
+
+    @property
+    def collection(self) -> str:
+        return self.model.model_config["collection"]
+
+    def __repr__(self):
+        return f"<BatchedRelation {'.'.join(self.path)} {self.collection}>"
+
+
+class FetchPlan:
+    """
+    Fields of a query with its relations, and the relations fetched in batched follow-up queries.
+    """
+
+    def __init__(self, fields: List[str], batched: List[BatchedRelation]):
+        self.fields: List[str] = fields
+        self.batched: List[BatchedRelation] = batched
+
+    def __repr__(self):
+        return f"<FetchPlan fields={self.fields} batched={self.batched}>"
+
+
+def _plan(
+        model: Type[BaseModel], tree: Dict[str, Any], fanout: Dict[str, int], inline: frozenset,
+        limit: int, prefix: Tuple[str, ...], rows: int
+) -> Tuple[List[str], List[BatchedRelation]]:
+    fields: List[str] = []
+    batched: List[BatchedRelation] = []
+
+    for name, field_info in model.model_fields.items():
+        name = field_info.alias or name
+        related_models = _related_models(field_info.annotation)
+        path = (*prefix, name)
+
+        if name not in tree or len(related_models) != 1:
+            # Not included relations are left as their ids
+            fields.append(name)
+            continue
+
+        related_model = related_models[0]
+        dotted_path = ".".join(path)
+
+        related_rows = rows
+        if _is_many(field_info.annotation):
+            related_rows *= fanout.get(dotted_path, DEFAULT_TO_MANY_FANOUT)
+
+        if related_rows <= limit or dotted_path in inline:
+            related_fields, related_batched = _plan(
+                related_model, tree[name], fanout, inline, limit, path, related_rows
+            )
+            fields.extend(f"{name}.{related_field}" for related_field in related_fields)
+            batched.extend(related_batched)
+        else:
+            # The ids of the related items come with the query, the items with a second one
+            fields.append(name)
+            related_fields, related_batched = _plan(related_model, tree[name], {
+                key[len(dotted_path) + 1:]: value for key, value in fanout.items() if key.startswith(f"{dotted_path}.")
+            }, frozenset(
+                key[len(dotted_path) + 1:] for key in inline if key.startswith(f"{dotted_path}.")
+            ), limit, (), 1)
+            batched.append(BatchedRelation(path, related_model, FetchPlan(related_fields, related_batched)))
+
+    return fields, batched
+
+
+@lru_cache(maxsize=256)
+def _cached_plan(
+        model: Type[BaseModel], includes: Tuple[str, ...], fanout: Tuple[Tuple[str, int], ...],
+        inline: Tuple[str, ...], limit: int
+) -> FetchPlan:
+    fields, batched = _plan(model, _include_tree(includes), dict(fanout), frozenset(inline), limit, (), 1)
+    return FetchPlan(fields, batched)
+
+
+def plan_fetch(
+        model: Type[BaseModel], includes: Iterable[str], fanout: Optional[Dict[str, int]] = None,
+        inline: Iterable[str] = (), limit: int = INLINE_FANOUT_LIMIT
+) -> FetchPlan:
+    """
+    Plan the fetch of items of a model with the given relations (`"lines"`, `"lines.product"`).
+
+    Relations are inlined in the query (with nested fields) as long as the estimated number of related
+    items per fetched item stays within `limit`. Beyond that, the relation is fetched with a second
+    `_in` query, instead of multiplying the rows returned by the first one.
+
+    :param fanout: Estimated number of related items of to-many relations, by relation path.
+    :param inline: Relation paths always inlined (e.g. the ones with `deep` parameters).
+    """
+    return _cached_plan(
+        model, tuple(sorted(set(includes))), tuple(sorted((fanout or {}).items())), tuple(sorted(inline)), limit
+    )
+
+
+def _collect(items: List[Any], path: Tuple[str, ...], visit):
+    """
+    Visit the containers holding the last field of the path, through inlined relations.
+    """
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+
+        if len(path) == 1:
+            if path[0] in item and item[path[0]] is not None:
+                visit(item)
+            continue
+
+        value = item.get(path[0])
+        _collect(value if isinstance(value, list) else [value], path[1:], visit)
+
+
+async def execute_plan(
+        directus: 'Directus', plan: FetchPlan, items: List[Dict[str, Any]], loaders: Optional[Dict[str, Any]] = None
+):
+    """
+    Fetch the batched relations of a plan and place them in the items (in place).
+
+    :param loaders: The loaders of the execution, related items are shared by its nested relations only
+    """
+    loaders = {} if loaders is None else loaders
+
+    async def fetch(relation: BatchedRelation):
+        containers = []
+        _collect(items, relation.path, containers.append)
+
+        field = relation.path[-1]
+        ids = []
+        for container in containers:
+            value = container[field]
+            ids.extend(value if isinstance(value, list) else [value])
+
+        # Items already expanded (e.g. by the cache) are kept as they are
+        ids = [id for id in ids if not isinstance(id, dict)]
+        if not ids:
+            return
+
+        loader = directus.get_loader(
+            relation.collection, relation.model, params={"fields": ",".join(relation.plan.fields)}, scope=loaders
+        )
+        related = {str(id): item for id, item in zip(ids, await loader.load_many(ids)) if item is not None}
+
+        await execute_plan(directus, relation.plan, list(related.values()), loaders)
+
+        def expand(id):
+            return related.get(str(id), id) if not isinstance(id, dict) else id
+
+        for container in containers:
+            value = container[field]
+            container[field] = [expand(id) for id in value] if isinstance(value, list) else expand(value)
+
+    await asyncio.gather(*[fetch(relation) for relation in plan.batched])
@@ -0,0 +1,334 @@
+import re
+import unicodedata
+from typing import Optional, Union, Any, Callable, Dict, List, Tuple
+
+from py_directus.filter import F
+
+
+# Text ordered the same way by every database collation (ISO dates and times)
+ORDERED_STRING_PATTERN = re.compile(
+    r"^(\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?(Z|[+-]\d{2}:?\d{2})?|\d{2}:\d{2}(:\d{2})?)$"
+)
+
+
+class UnsupportedQuery(ValueError):
+    """
+    The query cannot be evaluated locally the way Directus evaluates it.
+    """
+
+
+Predicate = Callable[[Dict[Any, Any]], bool]
+
+
+def _coerce(value: Any, argument: Any) -> Tuple[Any, Any]:
+    """
+    Compare numbers with the numeric strings Directus returns for decimals (and the other way round).
+    """
+    number = (int, float)
+
+    try:
+        if isinstance(value, str) and isinstance(argument, number) and not isinstance(argument, bool):
+            return float(value), argument
+        if isinstance(argument, str) and isinstance(value, number) and not isinstance(value, bool):
+            return value, float(argument)
+    except ValueError:
+        raise UnsupportedQuery(f"Cannot compare {value!r} with {argument!r}")
+
+    return value, argument
+
+
+def _fold(text: str) -> str:
+    """
+    Text as compared by case and accent insensitive collations (e.g. `utf8mb4_0900_ai_ci` of MySQL).
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def _equal(value: Any, argument: Any, strict: bool = True) -> bool:
+    value, argument = _coerce(value, argument)
+
+    # Text equal only for some collations (case, accents, trailing spaces) is left to the database
+    if (
+            strict and isinstance(value, str) and isinstance(argument, str) and value != argument
+            and _fold(value).rstrip(" ") == _fold(argument).rstrip(" ")
+    ):
+        raise UnsupportedQuery(f"The collation of the database decides whether {value!r} equals {argument!r}")
+
+    return value == argument
+
+
+def _compare(compare: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    def operator(value: Any, argument: Any, strict: bool = True) -> bool:
+        value, argument = _coerce(value, argument)
+
+        if (
+                strict and isinstance(value, str) and isinstance(argument, str)
+                and not (ORDERED_STRING_PATTERN.match(value) and ORDERED_STRING_PATTERN.match(argument))
+        ):
+            # The order of text depends on the collation of the database
+            raise UnsupportedQuery(f"Cannot compare the text {value!r} with {argument!r}")
+
+        try:
+            return compare(value, argument)
+        except TypeError:
+            raise UnsupportedQuery(f"Cannot compare {value!r} with {argument!r}")
+
+    return operator
+
+
+def _text(compare: Callable[[str, str], bool], insensitive: bool = False) -> Callable[[Any, Any], bool]:
+    def operator(value: Any, argument: Any, strict: bool = True) -> bool:
+        if not isinstance(value, str) or not isinstance(argument, str):
+            raise UnsupportedQuery(f"Cannot match {value!r} with {argument!r}")
+
+        matched = compare(value.lower(), argument.lower()) if insensitive else compare(value, argument)
+
+        # Text matching only for some collations (case, accents) is left to the database
+        if strict and not matched and compare(_fold(value), _fold(argument)):
+            raise UnsupportedQuery(f"The collation of the database decides whether {value!r} matches {argument!r}")
+
+        return matched
+
+    return operator
+
+
+def _list_argument(argument: Any) -> List[Any]:
+    if isinstance(argument, str):
+        return argument.split(",")
+    if isinstance(argument, (list, tuple, set)):
+        return list(argument)
+    return [argument]
+
+
+def _one_of(value: Any, argument: Any, strict: bool = True) -> bool:
+    return any(_equal(value, option, strict) for option in _list_argument(argument))
+
+
+def _between(value: Any, argument: Any, strict: bool = True) -> bool:
+    low, high = _list_argument(argument)
+    return _compare(lambda a, b: a >= b)(value, low, strict) and _compare(lambda a, b: a <= b)(value, high, strict)
+
+
+def _negate(operator: Callable[..., bool]) -> Callable[..., bool]:
+    return lambda value, argument, strict=True: not operator(value, argument, strict)
+
+
+# Operators applied to non null values, a null value never matches them (as in SQL).
+# Strict operators refuse text compared differently by database collations.
+VALUE_OPERATORS: Dict[str, Callable[..., bool]] = {
+    "_eq": _equal,
+    "_neq": _negate(_equal),
+    "_lt": _compare(lambda a, b: a < b),
+    "_lte": _compare(lambda a, b: a <= b),
+    "_gt": _compare(lambda a, b: a > b),
+    "_gte": _compare(lambda a, b: a >= b),
+    "_in": _one_of,
+    "_nin": _negate(_one_of),
+    "_contains": _text(lambda a, b: b in a),
+    "_icontains": _text(lambda a, b: b in a, insensitive=True),
+    "_ncontains": _negate(_text(lambda a, b: b in a)),
+    "_starts_with": _text(str.startswith),
+    "_istarts_with": _text(str.startswith, insensitive=True),
+    "_nstarts_with": _negate(_text(str.startswith)),
+    "_nistarts_with": _negate(_text(str.startswith, insensitive=True)),
+    "_ends_with": _text(str.endswith),
+    "_iends_with": _text(str.endswith, insensitive=True),
+    "_nends_with": _negate(_text(str.endswith)),
+    "_niends_with": _negate(_text(str.endswith, insensitive=True)),
+    "_between": _between,
+    "_nbetween": _negate(_between),
+}
+
+
+def _is_true(argument: Any) -> bool:
+    return argument not in (False, "false", 0, "0")
+
+
+# Operators testing for null (or empty) values
+NULL_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "_null": lambda value, argument: value is None if _is_true(argument) else True,
+    "_nnull": lambda value, argument: value is not None if _is_true(argument) else True,
+    "_empty": lambda value, argument: value in (None, "") if _is_true(argument) else True,
+    "_nempty": lambda value, argument: value not in (None, "") if _is_true(argument) else True,
+}
+
+
+def _is_dynamic(argument: Any) -> bool:
+    """
+    Dynamic variables (`$NOW`, `$CURRENT_USER`, ...) are resolved by Directus.
+    """
+    if isinstance(argument, str):
+        return argument.startswith("$")
+    if isinstance(argument, (list, tuple)):
+        return any(_is_dynamic(option) for option in argument)
+    return False
+
+
+def _navigate(item: Dict[Any, Any], path: Tuple[str, ...]) -> List[Any]:
+    values = [item]
+
+    for part in path:
+        next_values = []
+
+        for value in values:
+            if value is None:
+                next_values.append(None)
+                continue
+
+            related_items = value if isinstance(value, list) else [value]
+            if not all(isinstance(related, dict) for related in related_items):
+                raise UnsupportedQuery(f"The relation of the field '{'.'.join(path)}' is not available")
+
+            for related in related_items:
+                if part not in related:
+                    raise UnsupportedQuery(f"The field '{'.'.join(path)}' is not available")
+                next_values.append(related[part])
+
+        values = next_values
+
+    return values
+
+
+def resolve_values(item: Dict[Any, Any], path: Tuple[str, ...], key: str = "id") -> List[Any]:
+    """
+    Values of a (dotted) field of an item, through the related items of relational fields.
+
+    Relations returned as objects are compared by their primary key, to-many relations
+    give a value for each related item.
+    """
+    values = _navigate(item, path)
+
+    for position, value in enumerate(values):
+        if isinstance(value, dict):
+            if key not in value:
+                raise UnsupportedQuery(f"The key of the field '{'.'.join(path)}' is not available")
+            values[position] = value[key]
+
+    return values
+
+
+def _compile(query: Any, path: Tuple[str, ...], key: str, strict: bool) -> Predicate:
+    if not isinstance(query, dict):
+        raise UnsupportedQuery(f"Invalid filter {query!r}")
+
+    predicates: List[Predicate] = []
+
+    for name, argument in query.items():
+        if name in ("_and", "_or"):
+            operands = [_compile(operand, path, key, strict) for operand in argument]
+            group = all if name == "_and" else any
+            predicates.append(lambda item, operands=operands, group=group: group(p(item) for p in operands))
+        elif name in ("_some", "_none"):
+            related = _compile(argument, (), key, strict)
+
+            def match(item, related=related, name=name):
+                matched = any(related(value) for value in _related_items(item, path))
+                return matched if name == "_some" else not matched
+
+            predicates.append(match)
+        elif name in VALUE_OPERATORS or name in NULL_OPERATORS:
+            if _is_dynamic(argument):
+                raise UnsupportedQuery(f"Dynamic variables are resolved by Directus ({argument!r})")
+            if not path:
+                raise UnsupportedQuery(f"Operator '{name}' without a field")
+
+            operator = VALUE_OPERATORS.get(name)
+            null_operator = NULL_OPERATORS.get(name)
+
+            def test(item, operator=operator, null_operator=null_operator, argument=argument, path=path):
+                for value in resolve_values(item, path, key):
+                    if null_operator is not None:
+                        if null_operator(value, argument):
+                            return True
+                    elif value is not None and operator(value, argument, strict):
+                        return True
+                return False
+
+            predicates.append(test)
+        elif name.startswith("_") or "(" in name or "$" in name:
+            # Geometric, regex and function operators are evaluated by the database
+            raise UnsupportedQuery(f"Operator '{name}' cannot be evaluated locally")
+        else:
+            predicates.append(_compile(argument, (*path, name), key, strict))
+
+    return lambda item: all(predicate(item) for predicate in predicates)
+
+
+def _related_items(item: Dict[Any, Any], path: Tuple[str, ...]) -> List[Dict[Any, Any]]:
+    items = []
+
+    for related in _navigate(item, path):
+        if related is None:
+            continue
+
+        related_items = related if isinstance(related, list) else [related]
+        if not all(isinstance(related_item, dict) for related_item in related_items):
+            raise UnsupportedQuery(f"The related items of '{'.'.join(path)}' are not available")
+        items.extend(related_items)
+
+    return items
+
+
+def compile_filter(query: Union[F, Dict[str, Any], None], key: str = "id", strict: bool = True) -> Predicate:
+    """
+    Compile a filter into a function telling whether an item (as returned by Directus) matches it.
+
+    Raises `UnsupportedQuery` for filters which cannot be evaluated locally (dynamic variables,
+    geometric operators, functions), or, when the predicate is called, for items without the filtered fields.
+
+    :param key: The primary key field of the related items
+    :param strict: Refuse the text comparisons the database collation may decide differently
+                   (text equal or matching only when ignoring case or accents, text ordering),
+                   else text is compared by code point
+    """
+    if isinstance(query, F):
+        query = query.query
+
+    if not query:
+        return lambda item: True
+
+    return _compile(query, (), key, strict)
+
+
+def _sort_value(item: Dict[Any, Any], path: Tuple[str, ...], key: str, strict: bool) -> Any:
+    values = resolve_values(item, path, key)
+
+    if not strict:
+        # Null values come last in ascending order (first in descending order), as in PostgreSQL
+        value = values[0] if len(values) == 1 else None
+        return (False, value) if value is not None else (True, 0)
+
+    if len(values) != 1 or values[0] is None or isinstance(values[0], (list, dict)):
+        # The order of null (and to-many) values depends on the database
+        raise UnsupportedQuery(f"Cannot sort locally by '{'.'.join(path)}'")
+
+    value = values[0]
+    if isinstance(value, str) and not ORDERED_STRING_PATTERN.match(value):
+        # The order of text depends on the collation of the database
+        raise UnsupportedQuery(f"Cannot sort locally by the text field '{'.'.join(path)}'")
+
+    return value
+
+
+def sort_items(
+        items: List[Dict[Any, Any]], sort: Optional[List[str]], key: str = "id", strict: bool = True
+) -> List[Dict[Any, Any]]:
+    """
+    Sort items as with the `sort` parameter (`["-date_created", "id"]`).
+
+    :param strict: Refuse the values the database may order differently (text, null values),
+                   else text is sorted by code point and null values come last (as in PostgreSQL).
+    """
+    items = list(items)
+
+    for field in reversed(sort or []):
+        descending = field.startswith("-")
+        path = tuple(field.lstrip("-").split("."))
+
+        try:
+            items.sort(key=lambda item: _sort_value(item, path, key, strict), reverse=descending)
+        except TypeError:
+            raise UnsupportedQuery(f"Cannot sort locally by '{field}'")
+
+    return items
@@ -0,0 +1,119 @@
+import copy
+import inspect
+from functools import lru_cache
+from typing import Optional, Union, Any, Dict, List, Tuple, Type, get_args
+
+from pydantic import BaseModel
+
+from py_directus.predicate import UnsupportedQuery
+
+
+def _related_models(annotation: Any) -> List[Type[BaseModel]]:
+    """
+    Models referenced by a field annotation (`Optional[Union[str, DirectusUser]]` -> `[DirectusUser]`).
+    """
+    if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+        return [annotation]
+
+    models = []
+    for arg in get_args(annotation):
+        for model in _related_models(arg):
+            if model not in models:
+                models.append(model)
+
+    return models
+
+
+@lru_cache(maxsize=256)
+def get_model_fields(model: Type[BaseModel], depth: int = 0) -> Tuple[str, ...]:
+    """
+    The `fields` parameter matching the fields declared by a model.
+
+    Relational fields (typed with other models) are requested with all their fields (`user.*`),
+    or, within `depth` levels, with the fields declared by their own model (`user.id`, `user.email`, ...).
+    """
+    fields = []
+
+    for name, field_info in model.model_fields.items():
+        name = field_info.alias or name
+        related_models = _related_models(field_info.annotation)
+
+        if not related_models:
+            fields.append(name)
+        elif depth > 0 and len(related_models) == 1:
+            fields.extend(f"{name}.{related_field}" for related_field in get_model_fields(related_models[0], depth - 1))
+        else:
+            fields.append(f"{name}.*")
+
+    return tuple(fields)
+
+
+def get_field_tree(fields: Union[str, List[str], None]) -> Dict[str, Any]:
+    """
+    Nested requested fields (`"id,author.name"` -> `{"id": {}, "author": {"name": {}}}`), every field when not given.
+    """
+    if isinstance(fields, str):
+        fields = fields.split(",")
+
+    tree = {}
+    for field in [field.strip() for field in fields or []] or ["*"]:
+        node = tree
+        for part in field.split("."):
+            node = node.setdefault(part, {})
+    return tree
+
+
+def project_item(
+        item: Dict[Any, Any], requested: Dict[str, Any], available: Dict[str, Any], key: str = "id"
+) -> Dict[Any, Any]:
+    """
+    The requested fields of an item holding the `available` fields, as Directus would return them.
+
+    Raises `UnsupportedQuery` when a requested field is not available.
+
+    :param key: The primary key field of the related items
+    """
+    if "*" in requested and "*" not in available:
+        raise UnsupportedQuery("Not every field of the items is available")
+
+    projected = {}
+
+    for field in item if "*" in requested else []:
+        if field not in requested:
+            projected[field] = _leaf(item[field], available.get(field), key)
+
+    for field, nested in requested.items():
+        if field == "*":
+            continue
+        if field not in item or (field not in available and "*" not in available):
+            raise UnsupportedQuery(f"The field '{field}' is not available")
+
+        value = item[field]
+        if not nested:
+            projected[field] = _leaf(value, available.get(field), key)
+        elif value is None:
+            projected[field] = None
+        elif isinstance(value, dict):
+            projected[field] = project_item(value, nested, available.get(field, {}), key)
+        elif isinstance(value, list) and all(isinstance(related, dict) for related in value):
+            projected[field] = [project_item(related, nested, available.get(field, {}), key) for related in value]
+        else:
+            raise UnsupportedQuery(f"The related items of '{field}' are not available")
+
+    return projected
+
+
+def _leaf(value: Any, expanded: Optional[Dict[str, Any]], key: str) -> Any:
+    """
+    A field requested without nested fields, relations held as objects give their primary key.
+    """
+    if not expanded:
+        return copy.deepcopy(value)
+
+    related_items = value if isinstance(value, list) else [value]
+    if any(isinstance(related, dict) and key not in related for related in related_items):
+        raise UnsupportedQuery("The primary key of the related items is not available")
+
+    if isinstance(value, list):
+        return [related[key] if isinstance(related, dict) else related for related in value]
+    return value[key] if isinstance(value, dict) else value
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import re
+import copy
+import json
+import hashlib
+from typing import TYPE_CHECKING, Optional, Union, Type, Any, Dict, List, Tuple
+
+from pydantic import BaseModel
+
+from py_directus.aggregator import Agg
+from py_directus.directus_response import DirectusResponse
+from py_directus.filter import F
+from py_directus.optimizer import LOGICAL_OPERATORS, optimize_filter
+
+if TYPE_CHECKING:
+    from py_directus import Directus
+
+
+# Marker of a parameter in the serialized query, `@@param:<name>@@`
+PARAM_PATTERN = re.compile(r'\\"@@param:(\w+)@@\\"|"@@param:(\w+)@@"')
+
+
+def _canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _normalize_filter(query: Any) -> Any:
+    """
+    Simplified filter with the operands of logical groups in a fixed order, their order does not change the result.
+    """
+    if isinstance(query, dict):
+        normalized = {}
+        for key, value in query.items():
+            if key in LOGICAL_OPERATORS and isinstance(value, list):
+                normalized[key] = sorted((_normalize_filter(operand) for operand in value), key=_canonical_json)
+            else:
+                normalized[key] = _normalize_filter(value)
+        return normalized
+
+    return query
+
+
+def _normalize_field_list(fields: Any) -> Any:
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    if isinstance(fields, (list, tuple)):
+        return sorted({field.strip() for field in fields if field.strip()})
+    return fields
+
+
+def normalize_query(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Canonical form of the query parameters of a request, equal for semantically equal queries.
+
+    The filter is optimized and its groups ordered, the requested (and aggregated) fields are sorted,
+    while the order of `sort` and `groupBy` is kept as it changes the result.
+    """
+    normalized = {}
+
+    for key, value in params.items():
+        if isinstance(value, (F, Agg)):
+            value = value.query
+
+        if key == "filter":
+            value = _normalize_filter(optimize_filter(value))
+        elif key == "fields":
+            value = _normalize_field_list(value)
+        elif key == "aggregate" and isinstance(value, dict):
+            value = {operator: _normalize_field_list(fields) for operator, fields in value.items()}
+
+        normalized[key] = value
+
+    return normalized
+
+
+def get_query_digest(params: Dict[str, Any]) -> str:
+    """
+    Fixed-size digest of the canonical form of the query parameters.
+    """
+    return hashlib.blake2b(_canonical_json(normalize_query(params)).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class Param:
+    """
+    Placeholder of a value bound when a prepared query is sent (`F(id=Param("id"))`).
+    """
+
+    def __init__(self, name: str):
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", name):
+            raise ValueError(f"Invalid parameter name '{name}'")
+
+        self.name: str = name
+
+    def __json__(self):
+        return f"@@param:{self.name}@@"
+
+    def __repr__(self):
+        return f"Param({self.name!r})"
+
+
+class PreparedQuery:
+    """
+    Immutable query built once and sent many times with different parameter values.
+
+    The query body is serialized when prepared, binding the parameters only inserts
+    their serialized values, so sending the query does not build or serialize it again.
+    """
+
+    def __init__(
+            self, directus: 'Directus', collection: str, uri: str, params: Dict[Any, Any],
+            collection_class: Optional[Union[Type[BaseModel], str]] = None
+    ):
+        self.directus: 'Directus' = directus
+        self.collection: str = collection
+        self.uri: str = uri
+        self.collection_class: Optional[Union[Type[BaseModel], str]] = collection_class
+
+        # A copy, later changes of the request do not change the prepared query
+        self.params: Dict[Any, Any] = copy.deepcopy(params)
+
+        self._segments: List[str] = []
+        self._placeholders: List[Tuple[str, bool]] = []
+        self._compile(json.dumps({"query": self.params}))
+
+        self.param_names = frozenset(name for name, _ in self._placeholders)
+
+        # Static part of the cache keys
+        shape_digest = hashlib.blake2b(''.join(self._segments).encode('utf-8'), digest_size=8).hexdigest()
+        self._cache_key_prefix: str = f"{self.collection}_prepared_{shape_digest}_"
+
+    def _compile(self, body: str):
+        """
+        Split the serialized body around the parameters, noting whether each one is inside a string
+        (the filter is serialized as a JSON string) and its value has to be escaped once more.
+        """
+        position = 0
+
+        for match in PARAM_PATTERN.finditer(body):
+            self._segments.append(body[position:match.start()])
+            escaped_name, name = match.groups()
+            self._placeholders.append((escaped_name or name, escaped_name is not None))
+            position = match.end()
+
+        self._segments.append(body[position:])
+
+    def bind(self, **values) -> bytes:
+        """
+        The request body with the given parameter values.
+        """
+        missing = self.param_names.difference(values)
+        if missing:
+            raise TypeError(f"Missing values for parameters: {', '.join(sorted(missing))}")
+
+        parts = [self._segments[0]]
+
+        for (name, in_string), segment in zip(self._placeholders, self._segments[1:]):
+            value = json.dumps(values[name])
+            parts.append(json.dumps(value)[1:-1] if in_string else value)
+            parts.append(segment)
+
+        return ''.join(parts).encode('utf-8')
+
+    def get_cache_key(self, body: bytes) -> str:
+        return self._cache_key_prefix + hashlib.blake2b(body, digest_size=16).hexdigest()
+
+    async def read(self, cache: bool = False, **values) -> DirectusResponse:
+        """
+        Send the query with the given parameter values.
+
+        :param cache: Whether to use the cache or not
+        """
+        body = self.bind(**values)
+        query_key_str = self.get_cache_key(body) if self.directus.cache else None
+
+        if cache and query_key_str:
+            cached_response = await self.directus.cache.get(query_key_str)
+
+            if cached_response:
+                return DirectusResponse.from_json(cached_response, collection=self.collection_class)
+
+        response = self.directus.connection.request(
+            "SEARCH", self.uri, content=body, headers={"Content-Type": "application/json"},
+            auth=self.directus.auth
+        )
+
+        d_response = DirectusResponse(response, query=self.params, collection=self.collection_class)
+        await d_response.gather_response()
+
+        # Add results to cache, or renew an existing record
+        if query_key_str and (cache or await self.directus.cache.get(query_key_str)):
+            await self.directus.cache.add(query_key_str, d_response.to_json())
+
+        return d_response
+
+    def __repr__(self):
+        return f"<PreparedQuery {self.collection} params={sorted(self.param_names)}>"
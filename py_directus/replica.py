@@ -0,0 +1,365 @@
+import re
+import asyncio
+import inspect
+import logging
+from typing import TYPE_CHECKING, Optional, Union, Type, Any, Dict, List, Set, Iterable
+
+from pydantic import BaseModel
+
+from py_directus.aggregator import Agg
+from py_directus.filter import F
+from py_directus.optimizer import optimize_filter
+from py_directus.predicate import UnsupportedQuery, compile_filter, resolve_values, sort_items
+
+if TYPE_CHECKING:
+    from py_directus import Directus
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds between the polls of a replica refreshed in the background
+REPLICA_REFRESH_INTERVAL = 60
+
+# Strings of plain integers or decimals, indexed as numbers (zero-padded codes like `"01234"` stay text)
+NUMERIC_STRING_PATTERN = re.compile(r"-?(0|[1-9]\d*)(\.\d+)?")
+
+
+def _index_key(value: Any) -> Any:
+    # Indexed values: numbers and the numeric strings Directus returns for decimals (`"5.00"`) are keyed
+    # by their value, equal numbers share a key whatever their type (`5 == 5.0`)
+    if isinstance(value, str) and NUMERIC_STRING_PATTERN.fullmatch(value):
+        return float(value) if "." in value else int(value)
+    return value
+
+
+def _number(value: Any) -> Any:
+    try:
+        return float(value) if isinstance(value, str) else value
+    except ValueError:
+        return value
+
+
+class Replica:
+    """
+    In-memory copy of a (small) collection, queried locally.
+
+    Items are kept by their primary key, with hash indexes on the chosen fields narrowing the items
+    a filter is evaluated on. The replica is refreshed by polling the items changed since the last
+    refresh (`date_updated`, `date_created`), or by applying realtime events.
+    """
+
+    def __init__(
+            self, directus: 'Directus', collection: str,
+            collection_class: Optional[Union[Type[BaseModel], str]] = None,
+            key: str = "id", indexes: Iterable[str] = (), fields: Optional[List[str]] = None,
+            updated_field: Optional[str] = "date_updated", created_field: Optional[str] = "date_created"
+    ):
+        self.directus: 'Directus' = directus
+        self.collection: str = collection
+        self.collection_class: Optional[Union[Type[BaseModel], str]] = collection_class
+        self.key: str = key
+        self.fields: Optional[List[str]] = fields
+
+        # Fields of the change timestamps, a full reload refreshes collections without them
+        self.updated_field: Optional[str] = updated_field
+        self.created_field: Optional[str] = created_field
+
+        self.index_fields: List[str] = [field.replace("__", ".") for field in indexes]
+
+        self._items: Dict[Any, Dict[Any, Any]] = {}
+        self._objects: Dict[Any, Any] = {}
+        self._indexes: Dict[str, Dict[Any, Set[Any]]] = {}
+        self._last_change: Optional[str] = None
+
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key: Any):
+        return key in self._items
+
+    def __iter__(self):
+        return iter(list(self._objects.values()))
+
+    @property
+    def _model(self) -> Optional[Type[BaseModel]]:
+        if inspect.isclass(self.collection_class) and issubclass(self.collection_class, BaseModel):
+            return self.collection_class
+        return None
+
+    def _request(self):
+        request = self.directus.collection(self.collection_class or self.collection).limit(-1)
+        if self.fields:
+            request.fields(*self.fields)
+        return request
+
+    async def load(self):
+        """
+        Load every item of the collection, replacing the current ones at once.
+        """
+        response = await self._request().read()
+        items = response.items_as_dict() or []
+
+        self._swap(items)
+        logger.debug("Loaded %d items of %s", len(items), self.collection)
+
+    def _swap(self, items: List[Dict[Any, Any]]):
+        replaced_items, replaced_objects = {}, {}
+        for item in items:
+            replaced_items[item[self.key]] = item
+            replaced_objects[item[self.key]] = self._parse(item)
+
+        indexes = {field: {} for field in self.index_fields}
+        for item_key, item in replaced_items.items():
+            self._index(indexes, item_key, item)
+
+        # Queries see either the previous or the new items, never a mix of them
+        self._items, self._objects, self._indexes = replaced_items, replaced_objects, indexes
+        self._last_change = max(filter(None, (self._changed_at(item) for item in items)), default=self._last_change)
+
+    def _parse(self, item: Dict[Any, Any]) -> Any:
+        return self._model(**item) if self._model else item
+
+    def _changed_at(self, item: Dict[Any, Any]) -> Optional[str]:
+        return max(
+            filter(None, (item.get(field) for field in (self.updated_field, self.created_field) if field)), default=None
+        )
+
+    def _index(self, indexes: Dict[str, Dict[Any, Set[Any]]], item_key: Any, item: Dict[Any, Any]):
+        for field, index in indexes.items():
+            try:
+                values = resolve_values(item, tuple(field.split(".")))
+            except UnsupportedQuery:
+                values = [None]
+
+            for value in values:
+                for element in (value if isinstance(value, list) else [value]):
+                    index.setdefault(_index_key(element), set()).add(item_key)
+
+    def _unindex(self, item_key: Any):
+        for index in self._indexes.values():
+            for value, item_keys in list(index.items()):
+                item_keys.discard(item_key)
+                if not item_keys:
+                    del index[value]
+
+    def _put(self, items: Iterable[Dict[Any, Any]]):
+        for item in items:
+            item_key = item[self.key]
+
+            if item_key in self._items:
+                item = {**self._items[item_key], **item}
+                self._unindex(item_key)
+
+            self._items[item_key] = item
+            self._objects[item_key] = self._parse(item)
+            self._index(self._indexes, item_key, item)
+
+            changed_at = self._changed_at(item)
+            if changed_at and (self._last_change is None or changed_at > self._last_change):
+                self._last_change = changed_at
+
+    def _remove(self, keys: Iterable[Any]):
+        for key in keys:
+            if self._items.pop(key, None) is not None:
+                self._objects.pop(key, None)
+                self._unindex(key)
+
+    async def refresh(self):
+        """
+        Fetch the items changed since the last refresh, or every item when changes cannot be told.
+
+        Deleted items are noticed by their number, the replica is then loaded again.
+        """
+        if self._last_change is None or not (self.updated_field or self.created_field):
+            return await self.load()
+
+        changed = F()
+        for field in (self.updated_field, self.created_field):
+            if field:
+                changed |= F(**{f"{field.replace('.', '__')}__gte": self._last_change})
+
+        request = self._request().filter(changed)
+        count_request = self.directus.collection(self.collection).aggregate(count="*")
+
+        response, count_response = await asyncio.gather(request.read(), count_request.read())
+        self._put(response.items_as_dict() or [])
+
+        count = (count_response.items_as_dict() or [{}])[0].get("count")
+        if count is not None and int(count) != len(self._items):
+            logger.debug("Items of %s were deleted, loading them again", self.collection)
+            await self.load()
+
+    def apply_event(self, message: Dict[str, Any]):
+        """
+        Apply a realtime subscription message (`{"event": "update", "data": [...]}`) of the collection.
+        """
+        event = message.get("event")
+        data = message.get("data") or []
+
+        if event in ("create", "update", "init"):
+            self._put(item for item in data if isinstance(item, dict) and self.key in item)
+        elif event == "delete":
+            self._remove(item[self.key] if isinstance(item, dict) else item for item in data)
+
+    def start(self, interval: float = REPLICA_REFRESH_INTERVAL) -> asyncio.Task:
+        """
+        Refresh the replica in the background, every `interval` seconds.
+        """
+        async def poll():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.refresh()
+                except Exception as exc:
+                    logger.warning("Refresh of the replica of %s failed: %s", self.collection, exc)
+
+        self.stop()
+        self._refresh_task = asyncio.create_task(poll())
+        return self._refresh_task
+
+    def stop(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    def get(self, key: Any) -> Any:
+        """
+        The item with the given primary key, `None` when there is no such item.
+        """
+        return self._objects.get(key)
+
+    def _candidates(self, query: Dict[str, Any]) -> Optional[Set[Any]]:
+        """
+        Keys of the items which may match a filter, from the indexes of its `_eq` and `_in` conditions.
+        """
+        operands = query["_and"] if list(query) == ["_and"] else [query]
+        candidates = None
+
+        for operand in operands:
+            for field, index in self._indexes.items():
+                condition = operand
+                for part in field.split("."):
+                    condition = condition.get(part) if isinstance(condition, dict) and len(condition) == 1 else None
+
+                if not isinstance(condition, dict) or len(condition) != 1:
+                    continue
+
+                if "_eq" in condition:
+                    values = [condition["_eq"]]
+                elif "_in" in condition and isinstance(condition["_in"], list):
+                    values = condition["_in"]
+                else:
+                    continue
+
+                keys = set()
+                for value in values:
+                    keys.update(index.get(_index_key(value), ()))
+                candidates = keys if candidates is None else candidates & keys
+
+        return candidates
+
+    def _query_keys(self, query: Union[F, Dict[str, Any], None]) -> List[Any]:
+        if isinstance(query, F):
+            query = query.query
+        query = optimize_filter(query) if query else None
+
+        if not query:
+            return list(self._items)
+
+        candidates = self._candidates(query)
+        predicate = compile_filter(query, key=self.key, strict=False)
+
+        if candidates is None:
+            return [item_key for item_key, item in self._items.items() if predicate(item)]
+        return [item_key for item_key in self._items if item_key in candidates and predicate(self._items[item_key])]
+
+    def filter(self, *args, **filters) -> List[Any]:
+        """
+        The items matching a filter (`F` objects and keyword arguments, as for requests).
+        """
+        query = F(**filters)
+        for arg in args:
+            query &= arg
+
+        return self.find(query)
+
+    def find(
+            self, query: Union[F, Dict[str, Any], None] = None, sort: Optional[List[str]] = None,
+            limit: Optional[int] = None, offset: int = 0
+    ) -> List[Any]:
+        """
+        The items matching a filter, sorted as with the `sort` parameter (`["-date_created", "name"]`).
+        """
+        item_keys = self._query_keys(query)
+
+        if sort:
+            item_keys = [
+                item[self.key]
+                for item in sort_items([self._items[item_key] for item_key in item_keys], sort, self.key, strict=False)
+            ]
+
+        item_keys = item_keys[offset:]
+        if limit is not None and limit != -1:
+            item_keys = item_keys[:limit]
+
+        return [self._objects[item_key] for item_key in item_keys]
+
+    def first(self, *args, **filters) -> Any:
+        items = self.filter(*args, **filters)
+        return items[0] if items else None
+
+    def aggregate(self, *args, query: Union[F, Dict[str, Any], None] = None, **aggregates) -> Dict[str, Any]:
+        """
+        Aggregate the items matching a filter, in the form of Directus aggregations
+        (`aggregate(count="*", sum="price")` -> `{"count": 3, "sum": {"price": 42.0}}`).
+        """
+        aggregation = Agg(**aggregates)
+        for arg in args:
+            aggregation += arg
+
+        items = [self._items[item_key] for item_key in self._query_keys(query)]
+        result = {}
+
+        for operator, fields in aggregation.query.items():
+            for field in (fields if isinstance(fields, list) else [fields]):
+                value = self._aggregate(operator, field, items)
+                if field == "*":
+                    result[operator] = value
+                else:
+                    result.setdefault(operator, {})[field] = value
+
+        return result
+
+    def _aggregate(self, operator: str, field: str, items: List[Dict[Any, Any]]) -> Any:
+        if field == "*":
+            if operator not in ("count", "countAll"):
+                raise ValueError(f"Aggregation '{operator}' needs a field")
+            return len(items)
+
+        values = []
+        for item in items:
+            values.extend(value for value in resolve_values(item, tuple(field.split(".")), self.key) if value is not None)
+
+        if operator.endswith("Distinct"):
+            values = list(dict.fromkeys(_index_key(value) for value in values))
+            operator = operator[:-len("Distinct")]
+
+        if operator in ("count", "countAll"):
+            return len(values)
+
+        numbers = [_number(value) for value in values]
+        if operator == "sum":
+            return sum(numbers)
+        if operator == "avg":
+            return sum(numbers) / len(numbers) if numbers else None
+        if operator == "min":
+            return min(values, key=_number, default=None)
+        if operator == "max":
+            return max(values, key=_number, default=None)
+
+        raise ValueError(f"Aggregation '{operator}' is not supported")
+
+    def __repr__(self):
+        return f"<Replica {self.collection} items={len(self._items)} indexes={self.index_fields}>"
@@ -0,0 +1,222 @@
+import asyncio
+import logging
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Optional, Union, Any, Dict, List, Tuple, AsyncIterator
+
+from py_directus.filter import F
+from py_directus.keyset import cursor_values, keyset_filter, with_sort_fields
+
+if TYPE_CHECKING:
+    from py_directus.directus_request import DirectusRequest
+
+
+logger = logging.getLogger(__name__)
+
+# Number of ranges a scan is partitioned into
+SCAN_PARTITIONS = 8
+
+# Maximum number of requests of a scan in flight
+SCAN_CONCURRENCY = 4
+
+# Number of items requested at once within a range
+SCAN_BATCH_SIZE = 1000
+
+# Pages of a range read ahead of the consumer, in ordered scans
+SCAN_READ_AHEAD = 2
+
+ScanBound = Union[int, str, datetime, date]
+
+_DONE = object()
+
+
+def _parse_bound(value: Any) -> Union[int, datetime]:
+    """
+    Integer or date (time) value of the scanned field.
+    """
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            pass
+
+    raise ValueError(f"Cannot partition the values of a scan by {value!r}, integers or dates are expected")
+
+
+def _format_bound(value: Union[int, datetime]) -> Union[int, str]:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def partition_range(
+        start: ScanBound, end: ScanBound, partitions: int
+) -> List[Tuple[Union[int, str], Union[int, str], bool]]:
+    """
+    Split a range of integers or dates into consecutive ranges, `(start, end, end included)`.
+    """
+    start, end = _parse_bound(start), _parse_bound(end)
+
+    if type(start) is not type(end):
+        raise ValueError("The bounds of a scan must be both integers or both dates")
+    if end < start:
+        raise ValueError("The end of a scan comes before its start")
+
+    if isinstance(start, int):
+        partitions = max(1, min(partitions, end - start + 1))
+        step = -(-(end - start + 1) // partitions)
+        bounds = [min(start + step * i, end) for i in range(partitions)] + [end]
+    else:
+        partitions = max(1, partitions if end > start else 1)
+        step = (end - start) / partitions
+        bounds = [start + step * i for i in range(partitions)] + [end]
+
+    ranges = []
+    for i in range(len(bounds) - 1):
+        last = i == len(bounds) - 2
+        if bounds[i] == bounds[i + 1] and not last:
+            continue
+        ranges.append((_format_bound(bounds[i]), _format_bound(bounds[i + 1]), last))
+
+    return ranges
+
+
+class Scan:
+    """
+    Read of every item of a request, partitioned by ranges of a monotonic field (an integer id or a timestamp).
+
+    The ranges are read concurrently, each one in batches after the last item read (keyset pagination),
+    so the cost of a batch does not grow with the number of items before it, and items inserted during
+    the scan do not shift the batches.
+    """
+
+    def __init__(
+            self, request: 'DirectusRequest', field: str, start: Optional[ScanBound] = None,
+            end: Optional[ScanBound] = None, partitions: int = SCAN_PARTITIONS,
+            concurrency: int = SCAN_CONCURRENCY, ordered: bool = True, batch_size: int = SCAN_BATCH_SIZE,
+            key: str = "id"
+    ):
+        self.request: 'DirectusRequest' = request
+        self.field: str = field
+        self.start: Optional[ScanBound] = start
+        self.end: Optional[ScanBound] = end
+        self.partitions: int = partitions
+        self.ordered: bool = ordered
+        self.batch_size: int = batch_size
+        self.key: str = key
+
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+
+    def _sort(self) -> List[str]:
+        # Items with the same value of the field are told apart by their key
+        return [self.field] if self.field == self.key else [self.field, self.key]
+
+    def _base_request(self, query: F) -> 'DirectusRequest':
+        from py_directus.directus_request import DirectusRequest
+
+        request = DirectusRequest(self.request.directus, self.request.collection, self.request.collection_class)
+        request.params = {
+            name: value for name, value in self.request._get_params().items()
+            if name not in ("sort", "limit", "offset", "page", "meta")
+        }
+
+        # The sort fields of the last item of a batch are needed to request the next one
+        if "fields" in request.params:
+            request.params["fields"] = with_sort_fields(request.params["fields"], self._sort())
+
+        return request.filter(query)
+
+    async def _bounds(self) -> Tuple[Optional[ScanBound], Optional[ScanBound]]:
+        if self.start is not None and self.end is not None:
+            return self.start, self.end
+
+        request = self._base_request(F()).aggregate(min=self.field, max=self.field)
+        request.params.pop("fields", None)
+
+        async with self._semaphore:
+            response = await request.read()
+
+        result = (response.items_as_dict() or [{}])[0]
+        start = self.start if self.start is not None else (result.get("min") or {}).get(self.field)
+        end = self.end if self.end is not None else (result.get("max") or {}).get(self.field)
+
+        return start, end
+
+    async def _read_range(self, start: Any, end: Any, end_included: bool, put):
+        field = self.field.replace(".", "__")
+        query = F(**{f"{field}__gte": start, f"{field}__{'lte' if end_included else 'lt'}": end})
+        after: Optional[F] = None
+
+        while True:
+            request = self._base_request(query & after if after is not None else query)
+            request.params["sort"] = self._sort()
+            request.params["limit"] = self.batch_size
+
+            async with self._semaphore:
+                response = await request.read()
+
+            items = response.items_as_dict() or []
+            if items:
+                await put(items)
+
+            if len(items) < self.batch_size:
+                return
+
+            # Related fields (`author.id`) are nested in the items
+            after = keyset_filter(self._sort(), cursor_values(items[-1], self._sort()))
+
+    async def __aiter__(self) -> AsyncIterator[Dict[Any, Any]]:
+        start, end = await self._bounds()
+        if start is None or end is None:
+            # No items
+            return
+
+        ranges = partition_range(start, end, self.partitions)
+        logger.debug("Scanning %s by %s in %d ranges", self.request.collection, self.field, len(ranges))
+
+        if self.ordered:
+            queues = [asyncio.Queue(maxsize=SCAN_READ_AHEAD) for _ in ranges]
+        else:
+            queues = [asyncio.Queue(maxsize=SCAN_READ_AHEAD * len(ranges))] * len(ranges)
+
+        async def produce(index: int, range_start: Any, range_end: Any, end_included: bool):
+            queue = queues[index]
+            try:
+                await self._read_range(range_start, range_end, end_included, queue.put)
+                await queue.put(_DONE)
+            except Exception as exc:
+                await queue.put(exc)
+
+        tasks = [asyncio.create_task(produce(index, *bounds)) for index, bounds in enumerate(ranges)]
+
+        try:
+            if self.ordered:
+                for queue in queues:
+                    while (page := await queue.get()) is not _DONE:
+                        if isinstance(page, Exception):
+                            raise page
+                        for item in page:
+                            yield item
+            else:
+                remaining = len(ranges)
+                while remaining:
+                    page = await queues[0].get()
+                    if page is _DONE:
+                        remaining -= 1
+                    elif isinstance(page, Exception):
+                        raise page
+                    else:
+                        for item in page:
+                            yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
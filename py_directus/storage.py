@@ -1,8 +1,15 @@
 import os
+import json
+import asyncio
+import hashlib
 import pathlib
-import errno
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Set, AsyncIterable
+
 import platformdirs
 import aiofiles
+import aiofiles.os
 
 from py_directus.utils import get_random_string
 
@@ -51,7 +58,7 @@ def _get_alternative_name(file_root, file_ext):
     return f"{file_root}_{get_random_string(7)}{file_ext}"
 
 
-def _get_available_name(name, max_length=None):
+def _get_available_name(name, max_length=None, exists=None):
     """
     Return a filename that's free on the target storage system and
     available for new content to be written to.
@@ -59,6 +66,9 @@ def _get_available_name(name, max_length=None):
     Origin: https://github.com/django/django/blob/3.2.23/django/core/files/storage.py
     """
 
+    if exists is None:
+        exists = lambda n: os.path.exists(_get_default_downloads_path(n))
+
     name = str(name).replace('\\', '/')
     dir_name, file_name = os.path.split(name)
 
@@ -72,7 +82,7 @@ def _get_available_name(name, max_length=None):
     # until it doesn't exist.
     # Truncate original name if required, so the new filename does not
     # exceed the max_length.
-    while os.path.exists(_get_default_downloads_path(name)) or (max_length and len(name) > max_length):
+    while exists(name) or (max_length and len(name) > max_length):
         # file_ext includes the dot.
         name = os.path.join(dir_name, _get_alternative_name(file_root, file_ext))
 
@@ -96,48 +106,365 @@ def _get_available_name(name, max_length=None):
     return name
 
 
+def _get_default_downloads_dir() -> str:
+    return os.path.join(platformdirs.user_downloads_dir(), "py_directus")
+
+
 def _get_default_downloads_path(filename: str):
     """
     """
 
-    path = os.path.join(platformdirs.user_downloads_dir(), "py_directus")
-
-    # Make directories
-    try:
-        os.makedirs(path)
-    except OSError as exc:
-        if exc.errno == errno.EEXIST and os.path.isdir(path):
-            pass
-        else:
-            raise
+    path = _get_default_downloads_dir()
+    os.makedirs(path, exist_ok=True)
 
     # Append the file name
     return os.path.join(path, filename)
 
 
-async def save_file(filename: str, content: bytes) -> str:
+class Storage(ABC):
     """
+    Base class for download storage backends.
+
+    Backends supporting partial files (`supports_partial`) allow resumable and ranged downloads,
+    the others receive the downloaded data as a stream.
     """
 
-    name = _get_available_name(filename)
-    full_path = _get_default_downloads_path(name)
+    supports_partial: bool = False
+
+    @abstractmethod
+    async def save(self, name: str, content: bytes) -> str:
+        """
+        Store content under (a name derived from) `name` and return the name it was stored under.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def save_stream(self, name: str, chunks: AsyncIterable[bytes]) -> str:
+        """
+        Store streamed content under (a name derived from) `name` and return the name it was stored under.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def open(self, name: str) -> bytes:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def exists(self, name: str) -> bool:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def delete(self, name: str) -> bool:
+        raise NotImplementedError()
+
+    async def get_partial_path(self, key: str) -> str:
+        raise NotImplementedError()
+
+    async def save_partial(self, partial_path: str, name: str) -> str:
+        raise NotImplementedError()
+
+
+class FileSystemStorage(Storage):
+    """
+    Files in a local directory, by default the `py_directus` folder of the user downloads directory.
+
+    Names are never overwritten, an alternative name is chosen when a file already exists.
+    Every filesystem call runs off the event loop.
+    """
+
+    supports_partial = True
+
+    def __init__(self, location: Optional[str] = None):
+        self._location: Optional[str] = location
+        self._created_dirs: Set[str] = set()
+
+    @property
+    def location(self) -> str:
+        # The default location is resolved on use, so it follows the platform settings
+        return self._location or _get_default_downloads_dir()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.location, name)
+
+    async def _ensure_location(self) -> str:
+        location = self.location
+
+        # Create the directory once, instead of on every call
+        if location not in self._created_dirs:
+            await aiofiles.os.makedirs(location, exist_ok=True)
+            self._created_dirs.add(location)
+
+        return location
+
+    async def _get_available_name(self, name: str) -> str:
+        location = await self._ensure_location()
+        return await asyncio.to_thread(
+            _get_available_name, name, exists=lambda n: os.path.exists(os.path.join(location, n))
+        )
 
-    # Create file from received data
+    async def _reserve_name(self, name: str) -> str:
+        """
+        Find an available name and create an empty file with it.
+        """
+        name = await self._get_available_name(name)
+
+        while True:
+            try:
+                # Open for exclusive creation (as bytes)
+                async with aiofiles.open(self.path(name), 'xb'):
+                    pass
+            except FileExistsError:
+                # A new name is needed if the file exists.
+                name = await self._get_available_name(name)
+            else:
+                return name
+
+    async def save(self, name: str, content: bytes) -> str:
+        name = await self._reserve_name(name)
+
+        async with aiofiles.open(self.path(name), 'wb') as f:
+            await f.write(content)
+
+        # Ensure that the name returned from the storage system is still valid.
+        return _validate_file_name(name, allow_relative_path=True)
+
+    async def save_stream(self, name: str, chunks: AsyncIterable[bytes]) -> str:
+        partial_path = await self.get_partial_path(f"{get_random_string(12)}")
 
-    while True:
         try:
-            # Open for exclusive creation (as bytes)
-            async with aiofiles.open(full_path, 'xb') as f:
-                await f.write(content)
-        except FileExistsError:
-            # A new name is needed if the file exists.
-            name = _get_available_name(name)
-            full_path = _get_default_downloads_path(name)
-        else:
-            # Everything went OK, so get out of the infinite loop
-            break
-
-    # Ensure that the name returned from the storage system is still valid.
-    _validate_file_name(name, allow_relative_path=True)
+            async with aiofiles.open(partial_path, 'wb') as f:
+                async for chunk in chunks:
+                    await f.write(chunk)
+        except BaseException:
+            await _remove_file(partial_path)
+            raise
 
-    return name
+        return await self.save_partial(partial_path, name)
+
+    async def open(self, name: str) -> bytes:
+        async with aiofiles.open(self.path(name), 'rb') as f:
+            return await f.read()
+
+    async def exists(self, name: str) -> bool:
+        return await aiofiles.os.path.exists(self.path(name))
+
+    async def delete(self, name: str) -> bool:
+        return await _remove_file(self.path(name))
+
+    async def get_partial_path(self, key: str) -> str:
+        """
+        Path of the partial (in-progress) download identified by `key`.
+
+        Partial downloads live next to the completed ones as hidden `.part` files,
+        so an interrupted download can be resumed by a later call with the same key.
+        """
+        _validate_file_name(key)
+
+        return os.path.join(await self._ensure_location(), f".{key}.part")
+
+    async def save_partial(self, partial_path: str, name: str) -> str:
+        """
+        Move a completed partial download to an available name.
+        """
+        name = await self._reserve_name(name)
+
+        # The partial file replaces the reserved (empty) one
+        await aiofiles.os.replace(partial_path, self.path(name))
+
+        return _validate_file_name(name, allow_relative_path=True)
+
+
+class MemoryStorage(Storage):
+    """
+    Files kept in memory, mostly useful for tests and short-lived processing.
+    """
+
+    def __init__(self):
+        self.files: Dict[str, bytes] = {}
+
+    async def save(self, name: str, content: bytes) -> str:
+        name = _get_available_name(name, exists=lambda n: n in self.files)
+        self.files[name] = bytes(content)
+        return name
+
+    async def save_stream(self, name: str, chunks: AsyncIterable[bytes]) -> str:
+        content = bytearray()
+        async for chunk in chunks:
+            content.extend(chunk)
+        return await self.save(name, content)
+
+    async def open(self, name: str) -> bytes:
+        return self.files[name]
+
+    async def exists(self, name: str) -> bool:
+        return name in self.files
+
+    async def delete(self, name: str) -> bool:
+        return self.files.pop(name, None) is not None
+
+
+class ContentAddressedStorage(Storage):
+    """
+    Files in a local directory stored under the SHA-256 digest of their content (`ab/abcdef...`).
+
+    Identical files are stored once. The name given on save is ignored, the returned name is the digest.
+    """
+
+    def __init__(self, location: str):
+        self.location: str = location
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.location, digest[:2], digest)
+
+    async def _commit(self, tmp_path: str, digest: str) -> str:
+        await aiofiles.os.makedirs(os.path.dirname(self.path(digest)), exist_ok=True)
+        await aiofiles.os.replace(tmp_path, self.path(digest))
+        return digest
+
+    async def _temp_path(self) -> str:
+        await aiofiles.os.makedirs(self.location, exist_ok=True)
+        fd, tmp_path = await asyncio.to_thread(tempfile.mkstemp, dir=self.location, suffix=".part")
+        await asyncio.to_thread(os.close, fd)
+        return tmp_path
+
+    async def save(self, name: str, content: bytes) -> str:
+        async def single_chunk():
+            yield content
+
+        return await self.save_stream(name, single_chunk())
+
+    async def save_stream(self, name: str, chunks: AsyncIterable[bytes]) -> str:
+        tmp_path = await self._temp_path()
+        digest = hashlib.sha256()
+
+        try:
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                async for chunk in chunks:
+                    digest.update(chunk)
+                    await f.write(chunk)
+
+            return await self._commit(tmp_path, digest.hexdigest())
+        except BaseException:
+            await _remove_file(tmp_path)
+            raise
+
+    async def open(self, name: str) -> bytes:
+        async with aiofiles.open(self.path(name), 'rb') as f:
+            return await f.read()
+
+    async def exists(self, name: str) -> bool:
+        return await aiofiles.os.path.exists(self.path(name))
+
+    async def delete(self, name: str) -> bool:
+        return await _remove_file(self.path(name))
+
+
+class LocalS3Storage(Storage):
+    """
+    Local stand-in for an S3-compatible bucket (`<location>/<bucket>/<key>`).
+
+    Follows the object storage semantics: keys may contain `/`, a save overwrites the object with
+    the same key and every object carries its metadata (`ETag` as the MD5 of the content, size).
+    """
+
+    def __init__(self, location: str, bucket: str, prefix: str = ""):
+        self.location: str = location
+        self.bucket: str = bucket
+        self.prefix: str = prefix
+
+    def _key(self, name: str) -> str:
+        key = f"{self.prefix}{name}"
+        _validate_file_name(key, allow_relative_path=True)
+        return key
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.location, self.bucket, *self._key(name).split("/"))
+
+    def _metadata_path(self, name: str) -> str:
+        return f"{self.path(name)}.metadata.json"
+
+    async def save(self, name: str, content: bytes) -> str:
+        async def single_chunk():
+            yield content
+
+        return await self.save_stream(name, single_chunk())
+
+    async def save_stream(self, name: str, chunks: AsyncIterable[bytes]) -> str:
+        path = self.path(name)
+        tmp_path = f"{path}.{get_random_string(7)}.part"
+        await aiofiles.os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        etag = hashlib.md5()
+        size = 0
+
+        try:
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                async for chunk in chunks:
+                    etag.update(chunk)
+                    size += len(chunk)
+                    await f.write(chunk)
+
+            # Objects are replaced as a whole
+            await aiofiles.os.replace(tmp_path, path)
+        except BaseException:
+            await _remove_file(tmp_path)
+            raise
+
+        async with aiofiles.open(self._metadata_path(name), 'w') as f:
+            await f.write(json.dumps({"Key": self._key(name), "ETag": f'"{etag.hexdigest()}"', "Size": size}))
+
+        return name
+
+    async def head(self, name: str) -> Optional[dict]:
+        """
+        Metadata of an object, `None` when it does not exist.
+        """
+        try:
+            async with aiofiles.open(self._metadata_path(name), 'r') as f:
+                return json.loads(await f.read())
+        except FileNotFoundError:
+            return None
+
+    async def open(self, name: str) -> bytes:
+        async with aiofiles.open(self.path(name), 'rb') as f:
+            return await f.read()
+
+    async def exists(self, name: str) -> bool:
+        return await aiofiles.os.path.exists(self.path(name))
+
+    async def delete(self, name: str) -> bool:
+        await _remove_file(self._metadata_path(name))
+        return await _remove_file(self.path(name))
+
+
+async def _remove_file(path: str) -> bool:
+    try:
+        await aiofiles.os.remove(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+# Storage of the module level helpers and of clients without their own storage
+default_storage = FileSystemStorage()
+
+
+async def save_file(filename: str, content: bytes) -> str:
+    """
+    Save a file in the default storage.
+    """
+    return await default_storage.save(filename, content)
+
+
+async def get_partial_path(key: str) -> str:
+    """
+    Return the path of the partial (in-progress) download identified by `key` in the default storage.
+    """
+    return await default_storage.get_partial_path(key)
+
+
+async def save_partial_file(partial_path: str, filename: str) -> str:
+    """
+    Move a completed partial download to an available name in the default storage.
+    """
+    return await default_storage.save_partial(partial_path, filename)
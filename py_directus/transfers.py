@@ -0,0 +1,74 @@
+import asyncio
+import logging
+from typing import Optional, Any, List, Iterable, Callable, Awaitable
+
+from py_directus.utils import retry_async
+
+
+logger = logging.getLogger(__name__)
+
+# Number of transfers running at the same time
+TRANSFER_CONCURRENCY = 8
+
+
+class TransferResult:
+    """
+    Outcome of a single file transfer of a bulk operation.
+    """
+
+    def __init__(self, source: Any, result: Any = None, error: Optional[BaseException] = None, attempts: int = 0):
+        self.source: Any = source
+        self.result: Any = result
+        self.error: Optional[BaseException] = error
+        self.attempts: int = attempts
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"<TransferResult {self.source!r} {status} attempts={self.attempts}>"
+
+
+async def run_transfers(
+        sources: Iterable[Any], transfer: Callable[[Any], Awaitable[Any]],
+        concurrency: int = TRANSFER_CONCURRENCY, retries: int = 3, backoff: float = 0.5
+) -> List[TransferResult]:
+    """
+    Run `transfer` for every source with at most `concurrency` transfers in flight.
+
+    Transient failures are retried, other failures are reported in the result of the source.
+    The results are returned in the order of the sources.
+    """
+    sources = list(sources)
+    results: List[Optional[TransferResult]] = [None] * len(sources)
+
+    queue = asyncio.Queue()
+    for index, source in enumerate(sources):
+        queue.put_nowait((index, source))
+
+    async def worker():
+        while True:
+            try:
+                index, source = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            result = TransferResult(source)
+
+            async def attempt():
+                result.attempts += 1
+                return await transfer(source)
+
+            try:
+                result.result = await retry_async(attempt, retries=retries, backoff=backoff)
+            except Exception as exc:
+                logger.debug("Transfer of %s failed: %s", source, exc)
+                result.error = exc
+
+            results[index] = result
+
+    await asyncio.gather(*[worker() for _ in range(max(1, min(concurrency, len(sources))))])
+
+    return results
@@ -1,4 +1,4 @@
-from typing import Union, Optional
+from typing import Union, Optional, Any, Dict, List, Iterator
 
 FITTING_OPTIONS = ["cover", "contain", "inside", "outside"]
 IMAGE_FORMAT_OPTIONS = ["auto", "jpg", "png", "webp", "tiff"]
@@ -17,8 +17,14 @@ class ImageFileTransform:
         quality: Optional[int] = None, 
         withoutEnlargement: Optional[bool] = None, 
         img_format: Optional[str] = None, 
+        preset: Optional[str] = None,
         **kwargs
     ):
+        # A preset replaces every other parameter with its Directus storage asset preset key
+        if preset is not None:
+            self.parameters = {"key": image_presets[preset].key}
+            return
+
         parameters = {
             "fit": fit if fit in FITTING_OPTIONS else None,
             "width": width,
@@ -38,3 +44,83 @@ class ImageFileTransform:
                 transforms.append(parameter_list)
 
             self.parameters["transforms"] = transforms
+
+
+class ImagePreset:
+    """
+    Named image transformation, mapped to a Directus storage asset preset (`?key=`).
+
+    Assets requested through a preset share a single transformation (and Directus cache entry)
+    instead of one per slightly different set of ad-hoc parameters.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        fit: Optional[str] = None,
+        width: Optional[int] = None, height: Optional[int] = None,
+        quality: Optional[int] = None,
+        withoutEnlargement: Optional[bool] = None,
+        img_format: Optional[str] = None,
+        **kwargs
+    ):
+        self.key: str = key
+        self.width: Optional[int] = width
+        self.transform: ImageFileTransform = ImageFileTransform(
+            fit=fit, width=width, height=height, quality=quality,
+            withoutEnlargement=withoutEnlargement, img_format=img_format,
+            **kwargs
+        )
+
+    def to_storage_asset_preset(self) -> Dict[str, Any]:
+        """
+        The preset as an entry of the `storage_asset_presets` Directus setting.
+        """
+        return {"key": self.key, **self.transform.parameters}
+
+    def __repr__(self):
+        return f"<ImagePreset {self.key} {self.transform.parameters}>"
+
+
+class PresetRegistry:
+    """
+    Registry of the image presets, by key.
+    """
+
+    def __init__(self):
+        self.presets: Dict[str, ImagePreset] = {}
+
+    def register(self, key: str, **kwargs) -> ImagePreset:
+        """
+        Register a preset, the arguments are the ones of `ImageFileTransform`.
+        """
+        preset = ImagePreset(key, **kwargs)
+        self.presets[key] = preset
+        return preset
+
+    def unregister(self, key: str):
+        self.presets.pop(key, None)
+
+    def storage_asset_presets(self) -> List[Dict[str, Any]]:
+        """
+        The registered presets in the format of the `storage_asset_presets` Directus setting.
+        """
+        return [preset.to_storage_asset_preset() for preset in self.presets.values()]
+
+    def __getitem__(self, key: str) -> ImagePreset:
+        try:
+            return self.presets[key]
+        except KeyError:
+            raise KeyError(f"Unknown image preset '{key}'") from None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.presets
+
+    def __iter__(self) -> Iterator[ImagePreset]:
+        return iter(self.presets.values())
+
+    def __len__(self) -> int:
+        return len(self.presets)
+
+
+image_presets = PresetRegistry()
@@ -0,0 +1,234 @@
+import asyncio
+import logging
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Optional, Any, Dict, List, Set, Tuple, Iterable, Iterator
+
+from py_directus.changes import CHANGES_OVERLAP
+from py_directus.directus_response import DirectusException
+
+if TYPE_CHECKING:
+    from py_directus import Directus
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds between the polls of a translation store refreshed in the background
+TRANSLATIONS_REFRESH_INTERVAL = 60
+
+
+class _Snapshot:
+    """
+    Translations at a point in time, replaced as a whole on every change.
+    """
+
+    def __init__(self, rows: Dict[str, Dict[str, Any]]):
+        self.rows: Dict[str, Dict[str, Any]] = rows
+
+        self.values: Dict[str, Dict[str, str]] = {}
+        for row in rows.values():
+            self.values.setdefault(row["key"], {})[row["language"]] = row["value"]
+
+        self.languages: Tuple[str, ...] = tuple(sorted({row["language"] for row in rows.values()}))
+
+        # Translations of every key with the fallbacks applied, by language
+        self.tables: Dict[str, Dict[str, str]] = {}
+
+
+class TranslationStore(Mapping):
+    """
+    The `directus_translations` records, kept up to date incrementally.
+
+    Lookups go through precomputed tables of every key by language, with the language fallbacks applied
+    (`el-CY` -> `el` -> `el-GR` -> default language). The store is refreshed by polling the activity of
+    `directus_translations` since the last refresh, and fetching only the changed records. As with the change
+    feed, the last `overlap` activity ids are read again for the changes committed out of id order.
+
+    As a mapping it holds the records grouped by `key` (`store["hello"]["el-GR"]`).
+    """
+
+    def __init__(
+            self, directus: 'Directus', default_language: Optional[str] = None,
+            fallbacks: Optional[Dict[str, List[str]]] = None, overlap: int = CHANGES_OVERLAP
+    ):
+        self.directus: 'Directus' = directus
+        self.default_language: Optional[str] = default_language
+        self.fallbacks: Dict[str, List[str]] = fallbacks or {}
+        self.overlap: int = overlap
+
+        self._snapshot: _Snapshot = _Snapshot({})
+
+        # Last activity of `directus_translations` taken into account, `None` when not known
+        self._cursor: Optional[int] = None
+        # Activities within the overlap below the cursor already taken into account
+        self._applied: Set[int] = set()
+
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def __getitem__(self, key: str) -> Dict[str, str]:
+        return self._snapshot.values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._snapshot.values)
+
+    def __len__(self) -> int:
+        return len(self._snapshot.values)
+
+    @property
+    def languages(self) -> Tuple[str, ...]:
+        return self._snapshot.languages
+
+    def fallback_chain(self, language: str) -> Tuple[str, ...]:
+        """
+        Languages looked up, in order, for a language: itself, its configured fallbacks,
+        its base language (`el` for `el-GR`), the other regions of the base language and the default language.
+        """
+        return self._fallback_chain(language, self._snapshot.languages)
+
+    def _fallback_chain(self, language: str, languages: Iterable[str]) -> Tuple[str, ...]:
+        base = language.split("-")[0]
+
+        chain = [language, *self.fallbacks.get(language, []), base]
+        chain.extend(other for other in languages if other.split("-")[0] == base)
+        if self.default_language:
+            chain.append(self.default_language)
+
+        return tuple(dict.fromkeys(chain))
+
+    def _build_table(self, snapshot: _Snapshot, language: str) -> Dict[str, str]:
+        table = {}
+
+        for fallback in reversed(self._fallback_chain(language, snapshot.languages)):
+            for key, values in snapshot.values.items():
+                if values.get(fallback):
+                    table[key] = values[fallback]
+
+        snapshot.tables[language] = table
+        return table
+
+    def _swap(self, rows: Dict[str, Dict[str, Any]]):
+        snapshot = _Snapshot(rows)
+
+        # The tables of the known languages are ready before the snapshot is used
+        for language in {*snapshot.languages, *self.fallbacks}:
+            self._build_table(snapshot, language)
+
+        self._snapshot = snapshot
+
+    def table(self, language: str) -> Dict[str, str]:
+        """
+        Translations of every key in a language, with the fallbacks applied.
+        """
+        snapshot = self._snapshot
+        table = snapshot.tables.get(language)
+
+        # Languages without records of their own (e.g. a region) are built on first use
+        return table if table is not None else self._build_table(snapshot, language)
+
+    def translate(self, key: str, language: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        The translation of a key in a language (or its fallbacks).
+
+        :param default: Returned when there is no translation, the key itself when not given
+        """
+        value = self.table(language).get(key)
+        if value is None:
+            return key if default is None else default
+        return value
+
+    async def load(self):
+        """
+        Load every translation record, replacing the current ones at once.
+        """
+        activity_ids = await self._recent_activity()
+
+        response = await self.directus.collection("directus_translations").limit(-1).read()
+        rows = {str(row["id"]): row for row in response.items_as_dict() or []}
+
+        self._swap(rows)
+        # The activities committed before the records were read are part of them
+        self._cursor = max(activity_ids, default=0) if activity_ids is not None else None
+        self._applied = set(activity_ids or ())
+
+        logger.debug("Loaded %d translations", len(rows))
+
+    async def _recent_activity(self) -> Optional[List[int]]:
+        """
+        Ids of the last activities of `directus_translations` (the overlap), `None` when not accessible.
+        """
+        try:
+            response = await self.directus.collection("directus_activity") \
+                .filter(collection="directus_translations").sort("id", asc=False).fields("id") \
+                .limit(max(self.overlap, 1)).read()
+        except DirectusException as exc:
+            # The activity is not accessible (e.g. a public client), every refresh loads the store again
+            logger.debug("Activity of directus_translations not available: %s", exc)
+            return None
+
+        return [int(activity["id"]) for activity in response.items_as_dict() or []]
+
+    async def refresh(self) -> int:
+        """
+        Fetch the translation records changed since the last refresh.
+
+        :return: Number of changed records
+        """
+        if self._cursor is None:
+            await self.load()
+            return len(self._snapshot.rows)
+
+        start = self._cursor - self.overlap
+        applied = sorted(id for id in self._applied if id > start)
+
+        request = self.directus.collection("directus_activity") \
+            .filter(collection="directus_translations", id__gt=start)
+        if applied:
+            request = request.filter(id__nin=applied)
+
+        response = await request.sort("id").fields("id", "item").limit(-1).read()
+        activities = response.items_as_dict() or []
+
+        if not activities:
+            return 0
+
+        changed_ids = list(dict.fromkeys(str(activity["item"]) for activity in activities))
+        response = await self.directus.collection("directus_translations") \
+            .filter(id__in=changed_ids).limit(-1).read()
+
+        rows = dict(self._snapshot.rows)
+        for row_id in changed_ids:
+            rows.pop(row_id, None)
+        # Changed records which are not returned were deleted
+        rows.update({str(row["id"]): row for row in response.items_as_dict() or []})
+
+        self._swap(rows)
+        self._applied.update(int(activity["id"]) for activity in activities)
+        self._cursor = max(self._cursor, *self._applied)
+        self._applied = {id for id in self._applied if id > self._cursor - self.overlap}
+
+        logger.debug("Refreshed %d translations", len(changed_ids))
+        return len(changed_ids)
+
+    def start(self, interval: float = TRANSLATIONS_REFRESH_INTERVAL) -> asyncio.Task:
+        """
+        Refresh the store in the background, every `interval` seconds.
+        """
+        async def poll():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.refresh()
+                except Exception as exc:
+                    logger.warning("Refresh of the translations failed: %s", exc)
+
+        self.stop()
+        self._refresh_task = asyncio.create_task(poll())
+        return self._refresh_task
+
+    def stop(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    def __repr__(self):
+        return f"<TranslationStore keys={len(self)} languages={list(self.languages)}>"
+
@@ -0,0 +1,236 @@
+import os
+import json
+import base64
+import hashlib
+import logging
+from typing import TYPE_CHECKING, Optional, Any, Dict
+
+import aiofiles
+import aiofiles.os
+import platformdirs
+from httpx import Response
+
+from py_directus.utils import retry_async
+
+if TYPE_CHECKING:
+    from py_directus import Directus
+
+
+logger = logging.getLogger(__name__)
+
+TUS_VERSION = "1.0.0"
+
+# Size of each `PATCH` request body
+TUS_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Timeout (seconds) of each chunk request, independent of the shared session timeout
+TUS_CHUNK_TIMEOUT = 60
+
+
+class TusError(Exception):
+    """
+    The TUS server rejected an upload request.
+    """
+
+    def __init__(self, response: Response):
+        self.status_code = response.status_code
+        self.response = response
+
+    def __str__(self):
+        return f"TUS request failed: {self.response.request.method} {self.response.request.url} ({self.status_code})"
+
+
+def _encode_metadata(metadata: Dict[str, Any]) -> str:
+    return ",".join(
+        f"{key} {base64.b64encode(str(value).encode('utf-8')).decode('ascii')}"
+        for key, value in metadata.items() if value is not None
+    )
+
+
+def _get_default_state_path(fingerprint: str) -> str:
+    return os.path.join(platformdirs.user_cache_dir("py_directus"), "tus", f"{fingerprint}.json")
+
+
+class TusUpload:
+    """
+    Resumable, chunked upload of a local file through the TUS protocol (`/files/tus`).
+
+    The upload URL and the confirmed offset are kept in a local state file, so an upload
+    interrupted by a crash or a network failure continues where it stopped.
+    Failed chunks are retried on their own, after asking the server for the confirmed offset.
+    """
+
+    def __init__(
+            self, directus: 'Directus', path: str, metadata: Optional[Dict[str, Any]] = None,
+            chunk_size: int = TUS_CHUNK_SIZE, state_path: Optional[str] = None,
+            retries: int = 3, timeout: float = TUS_CHUNK_TIMEOUT
+    ):
+        self.directus: 'Directus' = directus
+        self.path: str = path
+        self.metadata: Dict[str, Any] = metadata or {}
+        self.chunk_size: int = chunk_size
+        self.state_path: Optional[str] = state_path
+        self.retries: int = retries
+        self.timeout: float = timeout
+
+        self.endpoint: str = f"{directus.url}/files/tus"
+        self.url: Optional[str] = None
+        self.size: Optional[int] = None
+        self.offset: int = 0
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Tus-Resumable": TUS_VERSION}
+
+    @property
+    def upload_id(self) -> Optional[str]:
+        """
+        The TUS upload id, kept by Directus in the `tus_id` field of the created file.
+        """
+        return self.url.rstrip("/").rsplit("/", 1)[-1] if self.url else None
+
+    async def _fingerprint(self) -> Dict[str, Any]:
+        stat = await aiofiles.os.stat(self.path)
+        return {"path": os.path.abspath(self.path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+    async def _load_state(self, fingerprint: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if not await aiofiles.os.path.exists(self.state_path):
+            return None
+
+        async with aiofiles.open(self.state_path, 'r') as f:
+            try:
+                state = json.loads(await f.read())
+            except json.decoder.JSONDecodeError:
+                return None
+
+        # The file changed since the upload started
+        if state.get("fingerprint") != fingerprint:
+            return None
+
+        return state
+
+    async def _save_state(self, fingerprint: Dict[str, Any]):
+        await aiofiles.os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+
+        async with aiofiles.open(self.state_path, 'w') as f:
+            await f.write(json.dumps({"fingerprint": fingerprint, "url": self.url, "offset": self.offset}))
+
+    async def _clear_state(self):
+        if await aiofiles.os.path.exists(self.state_path):
+            await aiofiles.os.remove(self.state_path)
+
+    async def _create(self):
+        response = await self.directus.connection.post(
+            self.endpoint,
+            headers={
+                **self.headers,
+                "Upload-Length": str(self.size),
+                "Upload-Metadata": _encode_metadata(self.metadata)
+            },
+            auth=self.directus.auth,
+            timeout=self.timeout
+        )
+
+        if response.status_code != 201:
+            raise TusError(response)
+
+        # The location may be relative to the server
+        self.url = str(response.request.url.join(response.headers["location"]))
+        self.offset = 0
+
+    async def _get_offset(self) -> Optional[int]:
+        """
+        Ask the server for the confirmed offset, `None` when the upload no longer exists.
+        """
+        response = await self.directus.connection.head(
+            self.url, headers=self.headers, auth=self.directus.auth, timeout=self.timeout
+        )
+
+        if response.status_code in [404, 410]:
+            return None
+        if response.status_code not in [200, 204]:
+            raise TusError(response)
+
+        return int(response.headers["upload-offset"])
+
+    async def _read_chunk(self, offset: int) -> bytes:
+        async with aiofiles.open(self.path, 'rb') as f:
+            await f.seek(offset)
+            return await f.read(self.chunk_size)
+
+    async def _send_chunk(self):
+        chunk = await self._read_chunk(self.offset)
+
+        response = await self.directus.connection.patch(
+            self.url,
+            content=chunk,
+            headers={
+                **self.headers,
+                "Upload-Offset": str(self.offset),
+                "Content-Type": "application/offset+octet-stream"
+            },
+            auth=self.directus.auth,
+            timeout=self.timeout
+        )
+
+        if response.status_code == 409:
+            # Offset mismatch, continue from the offset the server confirmed (or again, the upload is gone)
+            await self._sync_offset()
+            return
+        if response.status_code not in [200, 204]:
+            raise TusError(response)
+
+        self.offset = int(response.headers["upload-offset"])
+
+    async def _sync_offset(self):
+        """
+        Resynchronize the offset after a failed chunk, so only the unconfirmed part is sent again.
+        """
+        offset = await self._get_offset()
+
+        if offset is None:
+            await self._create()
+        else:
+            self.offset = offset
+
+    async def upload(self) -> str:
+        """
+        Upload (or continue uploading) the file.
+
+        :return: The upload URL.
+        """
+        fingerprint = await self._fingerprint()
+        self.size = fingerprint["size"]
+
+        if self.state_path is None:
+            digest = hashlib.sha1(json.dumps(fingerprint, sort_keys=True).encode('utf-8')).hexdigest()
+            self.state_path = _get_default_state_path(digest)
+
+        state = await self._load_state(fingerprint)
+
+        if state:
+            self.url = state["url"]
+            await retry_async(self._sync_offset, retries=self.retries)
+            logger.debug("Resuming upload of %s at offset %s", self.path, self.offset)
+        else:
+            await retry_async(self._create, retries=self.retries)
+
+        await self._save_state(fingerprint)
+
+        while self.offset < self.size:
+            resync = False
+
+            async def send_chunk():
+                nonlocal resync
+                # A previous attempt failed, the server may have stored part of the chunk
+                if resync:
+                    await self._sync_offset()
+                resync = True
+                await self._send_chunk()
+
+            await retry_async(send_chunk, retries=self.retries)
+            await self._save_state(fingerprint)
+
+        await self._clear_state()
+
+        return self.url
@@ -1,6 +1,10 @@
+import asyncio
 import secrets
-import itertools
-from typing import Union, List
+from typing import Union, List, Callable, Awaitable, TypeVar
+
+import httpx
+
+T = TypeVar("T")
 
 RANDOM_STRING_CHARS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
 
@@ -27,12 +31,42 @@ def parse_translations(all_translations: List[dict]) -> Union[dict[str, dict[str
     if not all_translations:
         return None
 
-    grouper = itertools.groupby(all_translations, lambda x: x['key'])
+    # Records of a key are not necessarily consecutive, they are grouped in a single pass
+    grouped = {}
+    for translation in all_translations:
+        grouped.setdefault(f"{translation['key']}", {})[translation['language']] = translation['value']
+
+    return grouped
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """
+    Whether a failed request is worth retrying (network failures, rate limiting and server errors).
+    """
+    if isinstance(exc, httpx.TransportError):
+        return True
+
+    status_code = getattr(exc, "status_code", None)
+    if status_code is None and isinstance(exc, httpx.HTTPStatusError):
+        status_code = exc.response.status_code
+
+    return status_code is not None and (status_code == 429 or status_code >= 500)
+
+
+async def retry_async(
+        func: Callable[[], Awaitable[T]], retries: int = 3, backoff: float = 0.5,
+        retry_on: Callable[[BaseException], bool] = is_transient_error
+) -> T:
+    """
+    Await `func()` and call it again, with exponential backoff, while it fails with a retryable error.
+    """
+    attempt = 0
+    while True:
+        try:
+            return await func()
+        except Exception as exc:
+            if attempt >= retries or not retry_on(exc):
+                raise
 
-    return {
-        f"{key}": {
-            translation['language']: translation['value']
-            for translation in group_recs
-            
-        } for key, group_recs in grouper
-    }
+            await asyncio.sleep(backoff * 2 ** attempt)
+            attempt += 1
@@ -29,3 +29,9 @@ class TestAggregatorObject(unittest.TestCase):
         )
 
         print(f"complex_aggregate: {complex_aggregate}")
+
+    def test_parse_key(self):
+        self.assertEqual(Agg.parse_key("id"), ("id", "count"))
+        self.assertEqual(Agg.parse_key("price__sum"), ("price", "sum"))
+        self.assertEqual(Agg.parse_key("user__id__countDistinct"), ("user.id", "countDistinct"))
+        self.assertEqual(Agg.parse_key("__countAll"), (None, "countAll"))
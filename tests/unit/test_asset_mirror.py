@@ -0,0 +1,140 @@
+import os
+import json
+import tempfile
+import unittest
+
+import httpx
+
+from py_directus import Directus, F
+
+
+def matches(record, query):
+    """
+    Minimal evaluation of the filters used by the mirror.
+    """
+    for key, condition in query.items():
+        if key == "_and":
+            if not all(matches(record, sub_query) for sub_query in condition):
+                return False
+        elif key == "_or":
+            if not any(matches(record, sub_query) for sub_query in condition):
+                return False
+        else:
+            for operator, value in condition.items():
+                field_value = record.get(key)
+                if operator == "_eq" and field_value != value:
+                    return False
+                if operator == "_gt" and not (field_value is not None and field_value > value):
+                    return False
+                if operator == "_gte" and not (field_value is not None and field_value >= value):
+                    return False
+    return True
+
+
+class FilesServer:
+    """
+    In-memory stand-in for the Directus files and assets endpoints.
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.searches = []
+        self.downloads = []
+
+    def add(self, file_id, content, uploaded_on, modified_on=None, file_type="image/png"):
+        self.files[file_id] = {
+            "id": file_id, "filename_disk": f"{file_id}.bin", "filesize": len(content),
+            "uploaded_on": uploaded_on, "modified_on": modified_on or uploaded_on, "type": file_type,
+            "content": content
+        }
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "SEARCH" and request.url.path == "/files":
+            query = json.loads(request.content)["query"]
+            self.searches.append(query)
+
+            fltr = json.loads(query.get("filter", "{}"))
+            records = sorted(
+                [record for record in self.files.values() if matches(record, fltr)], key=lambda r: r["id"]
+            )[:query["limit"]]
+
+            fields = query["fields"].split(",")
+            return httpx.Response(200, json={"data": [{field: record[field] for field in fields} for record in records]})
+
+        if request.url.path.startswith("/assets/"):
+            file_id = request.url.path.rsplit("/", 1)[-1]
+            self.downloads.append(file_id)
+            return httpx.Response(200, content=self.files[file_id]["content"])
+
+        return httpx.Response(404)
+
+
+class TestAssetMirror(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the incremental asset mirror against a local stand-in server.
+    """
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.server = FilesServer()
+
+        for index in range(5):
+            self.server.add(f"file-{index}", f"content {index}".encode(), f"2024-01-0{index + 1}T00:00:00.000Z")
+
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(self.server))
+        self.directus = Directus("http://directus.local", token="token", connection=connection)
+
+    async def asyncTearDown(self):
+        await self.directus.close_connection()
+        self.tmp_dir.cleanup()
+
+    def _read(self, name):
+        with open(os.path.join(self.tmp_dir.name, name), "rb") as f:
+            return f.read()
+
+    async def test_incremental_sync(self):
+        result = await self.directus.sync_assets(self.tmp_dir.name)
+
+        self.assertEqual(len(result.downloaded), 5)
+        self.assertEqual(self._read("file-3.bin"), b"content 3")
+
+        # Nothing changed
+        self.server.downloads.clear()
+        result = await self.directus.sync_assets(self.tmp_dir.name)
+
+        self.assertEqual(self.server.downloads, [])
+        self.assertEqual(result.unchanged, 1)
+
+        # One file changed and one was added
+        self.server.add("file-1", b"new content 1", "2024-01-02T00:00:00.000Z", "2024-02-01T00:00:00.000Z")
+        self.server.add("file-9", b"content 9", "2024-02-02T00:00:00.000Z")
+
+        result = await self.directus.sync_assets(self.tmp_dir.name)
+
+        self.assertEqual(sorted(self.server.downloads), ["file-1", "file-9"])
+        self.assertEqual(self._read("file-1.bin"), b"new content 1")
+        self.assertTrue(all(download.ok for download in result.downloaded))
+
+    async def test_filter_and_prune(self):
+        await self.directus.sync_assets(self.tmp_dir.name)
+
+        del self.server.files["file-2"]
+        result = await self.directus.sync_assets(self.tmp_dir.name, prune=True)
+
+        self.assertEqual(result.pruned, ["file-2"])
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir.name, "file-2.bin")))
+
+        self.server.files["file-0"]["type"] = "video/mp4"
+        result = await self.directus.sync_assets(self.tmp_dir.name, filter=F(type="image/png"), prune=True)
+
+        self.assertEqual(result.pruned, ["file-0"])
+        self.assertEqual(result.unchanged, 3)
+
+    async def test_pagination(self):
+        from py_directus.mirror import AssetMirror
+
+        mirror = AssetMirror(self.directus, self.tmp_dir.name)
+        records = [record async for record in mirror.iter_records(page_size=2)]
+
+        self.assertEqual([record["id"] for record in records], [f"file-{index}" for index in range(5)])
+        self.assertEqual(len(self.server.searches), 3)
@@ -0,0 +1,156 @@
+import os
+import tempfile
+import unittest
+
+import httpx
+
+try:
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from py_directus.fast_api.assets import AssetCache, create_asset_router, normalize_asset_parameters
+except ImportError:
+    FastAPI = None
+
+from py_directus import Directus
+
+
+ASSET = os.urandom(50 * 1024)
+
+
+@unittest.skipIf(FastAPI is None, "FastAPI is not installed")
+class TestAssetProxy(unittest.TestCase):
+    """
+    Test the cached asset proxy against a local stand-in Directus.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+
+            if request.url.path == "/assets/missing":
+                return httpx.Response(404, json={"errors": []})
+            if request.headers.get("if-none-match") == '"directus-etag"':
+                return httpx.Response(304)
+            content = ASSET if request.url.path == "/assets/file-id" else ASSET[:-10] + request.url.path[-10:].encode()
+            return httpx.Response(200, content=content, headers={"content-type": "image/png", "etag": '"directus-etag"'})
+
+        directus = Directus(
+            "http://directus.local", connection=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+
+        self.cache = AssetCache(self.tmp_dir.name, max_size=len(ASSET) * 2)
+
+        app = FastAPI()
+        app.include_router(create_asset_router(self.cache, get_directus=lambda: directus))
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_normalized_parameters(self):
+        self.assertEqual(
+            normalize_asset_parameters({"width": 100, "fit": "cover", "withoutEnlargement": True, "height": None}),
+            {"fit": "cover", "width": "100", "withoutEnlargement": "true"}
+        )
+
+    def test_cached_asset(self):
+        first = self.client.get("/assets/file-id", params={"width": 100, "fit": "cover"})
+        second = self.client.get("/assets/file-id", params={"fit": "cover", "width": 100})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.content, ASSET)
+        self.assertEqual(second.content, ASSET)
+        self.assertEqual(first.headers["etag"], second.headers["etag"])
+        self.assertEqual(len(self.requests), 1)
+
+        not_modified = self.client.get("/assets/file-id", params={"width": 100, "fit": "cover"},
+                                       headers={"If-None-Match": first.headers["etag"]})
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_range_request(self):
+        response = self.client.get("/assets/file-id", headers={"Range": "bytes=100-199"})
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.headers["content-range"], f"bytes 100-199/{len(ASSET)}")
+        self.assertEqual(response.content, ASSET[100:200])
+
+        suffix = self.client.get("/assets/file-id", headers={"Range": "bytes=-10"})
+        self.assertEqual(suffix.content, ASSET[-10:])
+
+        unsatisfiable = self.client.get("/assets/file-id", headers={"Range": f"bytes={len(ASSET)}-"})
+        self.assertEqual(unsatisfiable.status_code, 416)
+
+    def test_revalidation(self):
+        self.cache.revalidate_after = 0
+
+        self.client.get("/assets/file-id")
+        response = self.client.get("/assets/file-id")
+
+        self.assertEqual(response.content, ASSET)
+        self.assertEqual(self.requests[-1].headers["if-none-match"], '"directus-etag"')
+
+    def test_shared_content(self):
+        for width in [100, 200, 300]:
+            self.client.get("/assets/file-id", params={"width": width})
+
+        # Identical content is stored once
+        self.assertEqual(len(self.cache.entries), 3)
+        self.assertEqual(len(os.listdir(os.path.join(self.tmp_dir.name, "blobs"))), 1)
+
+    def test_eviction(self):
+        for file_id in ["file-00001", "file-00002", "file-00001", "file-00003"]:
+            self.client.get(f"/assets/{file_id}")
+
+        # The least recently used entry is evicted
+        self.assertEqual(len(self.cache.entries), 2)
+        self.assertLessEqual(self.cache.size, self.cache.max_size)
+
+        self.client.get("/assets/file-00002")
+        self.assertEqual(self.requests[-1].url.path, "/assets/file-00002")
+        self.assertEqual(len(self.requests), 4)
+
+        self.assertEqual(self.cache.size, sum(self.cache.blob_sizes.values()))
+        # The locks of the fetched keys are not kept
+        self.assertEqual(self.cache._key_locks, {})
+
+    def test_missing_asset(self):
+        response = self.client.get("/assets/missing")
+        self.assertEqual(response.status_code, 404)
+
+
+@unittest.skipIf(FastAPI is None, "FastAPI is not installed")
+class TestAssetCache(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the asset cache directly.
+    """
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=ASSET[:-10] + request.url.path[-10:].encode())
+
+        self.directus = Directus(
+            "http://directus.local", connection=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        self.cache = AssetCache(self.tmp_dir.name, max_size=len(ASSET))
+
+    async def asyncTearDown(self):
+        await self.directus.close_connection()
+        self.tmp_dir.cleanup()
+
+    async def test_evicted_while_streamed(self):
+        entry, _ = await self.cache.get(self.directus, "file-00001", {})
+        chunks = self.cache.iter_blob(entry, blob=await self.cache.open_blob(entry))
+
+        # Another asset evicts the streamed one
+        await self.cache.get(self.directus, "file-00002", {})
+        self.assertNotIn(entry.key, self.cache.entries)
+        self.assertFalse(os.path.exists(self.cache.blob_path(entry.digest)))
+
+        content = b"".join([chunk async for chunk in chunks])
+        self.assertEqual(content, ASSET[:-10] + b"file-00001")
+        self.assertEqual(self.cache.size, len(ASSET))
@@ -0,0 +1,130 @@
+import os
+import json
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import httpx
+
+from py_directus import Directus
+
+
+class FilesServer:
+    """
+    In-memory stand-in for the Directus folders, files and assets endpoints.
+    """
+
+    def __init__(self, failures=0):
+        self.folders = {"f-1": {"id": "f-1", "name": "Media", "parent": None}}
+        self.uploads = []
+        self.requests = []
+        self.failures = failures
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.requests.append((request.method, path))
+
+        if path == "/folders" and request.method == "SEARCH":
+            return httpx.Response(200, json={"data": list(self.folders.values())})
+
+        if path == "/folders" and request.method == "POST":
+            folder = json.loads(request.content)
+            folder["id"] = f"f-{len(self.folders) + 1}"
+            self.folders[folder["id"]] = folder
+            return httpx.Response(200, json={"data": folder})
+
+        if path == "/files" and request.method == "POST":
+            body = await request.aread()
+            folder_id = body.split(b'name="folder"\r\n\r\n')[1].split(b"\r\n")[0].decode('utf-8')
+            self.uploads.append(folder_id)
+            return httpx.Response(200, json={"data": {"id": f"file-{len(self.uploads)}"}})
+
+        if path.startswith("/assets/"):
+            if self.failures:
+                self.failures -= 1
+                return httpx.Response(503)
+
+            file_id = path.rsplit("/", 1)[-1]
+            if file_id == "missing":
+                return httpx.Response(404)
+            return httpx.Response(
+                200, content=file_id.encode('utf-8'),
+                headers={"content-disposition": f'attachment; filename="{file_id}.txt"'}
+            )
+
+        return httpx.Response(404)
+
+
+class TestBulkTransfers(unittest.IsolatedAsyncioTestCase):
+    """
+    Test concurrent bulk uploads and downloads against a local stand-in server.
+    """
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.downloads_patch = mock.patch("platformdirs.user_downloads_dir", return_value=self.tmp_dir.name)
+        self.downloads_patch.start()
+        self.sleep_patch = mock.patch("py_directus.utils.asyncio.sleep", new=mock.AsyncMock())
+        self.sleep_patch.start()
+
+    async def asyncTearDown(self):
+        self.sleep_patch.stop()
+        self.downloads_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def _client(self, server: FilesServer) -> Directus:
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(server))
+        return Directus("http://directus.local", token="token", connection=connection)
+
+    async def test_upload_many(self):
+        server = FilesServer()
+        directus = self._client(server)
+
+        base_dir = os.path.join(self.tmp_dir.name, "upload")
+        paths = []
+        for relative_path in ["a.txt", "b.txt", "2024/c.txt", "2024/jan/d.txt"]:
+            path = os.path.join(base_dir, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(relative_path)
+            paths.append(path)
+
+        results = await directus.upload_many(paths, folder="Media", base_dir=base_dir, concurrency=2)
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(directus.folders.paths["Media/2024/jan"], "f-3")
+        # Uploads complete in any order
+        self.assertEqual(sorted(server.uploads), ["f-1", "f-1", "f-2", "f-3"])
+        # The folder tree is read once
+        self.assertEqual(server.requests.count(("SEARCH", "/folders")), 1)
+
+    async def test_folder_created_elsewhere(self):
+        server = FilesServer()
+        directus = self._client(server)
+        self.assertEqual(await directus.folders.get("Media"), "f-1")
+
+        server.folders["f-2"] = {"id": "f-2", "name": "Archive", "parent": "f-1"}
+
+        # A recent index does not reload for a missing folder
+        self.assertIsNone(await directus.folders.get("Media/Archive"))
+        self.assertEqual(server.requests.count(("SEARCH", "/folders")), 1)
+
+        directus.folders.loaded_at = datetime(2000, 1, 1)
+        self.assertEqual(await directus.folders.get("Media/Archive"), "f-2")
+        self.assertEqual(await directus.folders.get("Archive"), "f-2")
+        self.assertEqual(server.requests.count(("SEARCH", "/folders")), 2)
+
+    async def test_download_many(self):
+        server = FilesServer(failures=1)
+        directus = self._client(server)
+
+        results = await directus.download_many(["one", "missing", "two"], concurrency=2)
+
+        self.assertEqual([result.source for result in results], ["one", "missing", "two"])
+        self.assertEqual(results[0].result, "one.txt")
+        self.assertEqual(results[2].result, "two.txt")
+        self.assertFalse(results[1].ok)
+        self.assertEqual(results[1].error.response.status_code, 404)
+        # The transient failure was retried
+        self.assertEqual(sum(result.attempts for result in results), 4)
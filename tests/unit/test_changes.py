@@ -0,0 +1,98 @@
+import json
+import unittest
+
+import httpx
+
+from py_directus import Directus
+
+
+class TestChanges(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the change feed against a local stand-in transport.
+    """
+
+    async def asyncSetUp(self):
+        self.queries = []
+        self.activity = [
+            {"id": id, "action": "update", "collection": "articles" if id % 2 else "pages", "item": str(id)}
+            for id in range(1, 8)
+        ]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            query = json.loads(request.content)["query"]
+            self.queries.append((request.url.path, query))
+            conditions = json.loads(query["filter"])
+            conditions = conditions.get("_and", [conditions])
+
+            if request.url.path == "/revisions":
+                ids = conditions[0]["activity"]["_in"]
+                return httpx.Response(200, json={"data": [
+                    {"id": 100 + id, "activity": id, "data": {"id": id}, "delta": {"title": f"title {id}"}}
+                    for id in ids
+                ]})
+
+            entries = self.activity
+            for condition in conditions:
+                if "collection" in condition:
+                    entries = [entry for entry in entries if entry["collection"] in condition["collection"]["_in"]]
+                if "_gt" in condition.get("id", {}):
+                    entries = [entry for entry in entries if entry["id"] > condition["id"]["_gt"]]
+                if "_nin" in condition.get("id", {}):
+                    entries = [entry for entry in entries if entry["id"] not in condition["id"]["_nin"]]
+            entries = sorted(entries, key=lambda entry: entry["id"])
+            return httpx.Response(200, json={"data": entries[:query["limit"]]})
+
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.directus = Directus("http://directus.local", token="token", connection=connection)
+
+    async def asyncTearDown(self):
+        await self.directus.close_connection()
+
+    async def test_changes(self):
+        feed = self.directus.changes(["articles"], batch_size=2)
+        changes = [change async for change in feed]
+
+        self.assertEqual([change.id for change in changes], [1, 3, 5, 7])
+        self.assertEqual(feed.cursor, "7")
+
+        # Batches are requested after the last entry, never with an offset
+        self.assertEqual(len(self.queries), 3)
+        self.assertNotIn("offset", self.queries[-1][1])
+
+    async def test_resume(self):
+        feed = self.directus.changes(since="3")
+        self.assertEqual([change.id async for change in feed], [4, 5, 6, 7])
+
+        self.activity.append({"id": 8, "action": "create", "collection": "pages", "item": "8"})
+        self.assertEqual([change.id async for change in self.directus.changes(since=feed.cursor)], [8])
+
+    async def test_late_entries(self):
+        feed = self.directus.changes(overlap=3)
+        self.assertEqual(len([change async for change in feed]), 7)
+
+        # Entry 8 is committed after entry 9
+        self.activity.append({"id": 9, "action": "create", "collection": "pages", "item": "9"})
+        self.assertEqual([change.id async for change in feed], [9])
+        self.activity.append({"id": 8, "action": "create", "collection": "pages", "item": "8"})
+        self.assertEqual([change.id async for change in feed], [8])
+        self.assertEqual(feed.cursor, "9")
+
+        # Entries beyond the overlap are missed
+        self.activity.append({"id": 5, "action": "create", "collection": "pages", "item": "5"})
+        self.assertEqual([change.id async for change in feed], [])
+
+        # The entries given within the overlap are not requested again
+        self.assertEqual(json.loads(self.queries[-1][1]["filter"])["_and"][1:], [
+            {"id": {"_gt": 6}}, {"id": {"_nin": [7, 8, 9]}}
+        ])
+
+    async def test_revisions(self):
+        changes = [change async for change in self.directus.changes(["pages"], revisions=True)]
+
+        self.assertEqual([change.delta for change in changes], [{"title": f"title {id}"} for id in (2, 4, 6)])
+        self.assertEqual(changes[0].data, {"id": 2})
+        self.assertEqual(changes[0].cursor, "2")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import json
+import unittest
+
+import httpx
+
+from py_directus import Directus, F
+from py_directus.containment import ContainmentCache
+
+
+CATEGORIES = [
+    {"id": 1, "name": "Chairs", "parent": None, "position": 3},
+    {"id": 2, "name": "Tables", "parent": None, "position": 1},
+    {"id": 3, "name": "Stools", "parent": 1, "position": 2},
+]
+
+
+class TestContainmentCache(unittest.IsolatedAsyncioTestCase):
+    """
+    Test answering queries from cached complete results against a local stand-in transport.
+    """
+
+    async def asyncSetUp(self):
+        self.requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+
+            if request.method == "SEARCH":
+                query = json.loads(request.content)["query"]
+                limit = query.get("limit", 100)
+                return httpx.Response(200, json={"data": CATEGORIES if limit == -1 else CATEGORIES[:limit]})
+            if request.method == "PATCH":
+                return httpx.Response(200, json={"data": CATEGORIES[0]})
+
+            return httpx.Response(200, json={"data": CATEGORIES[0]})
+
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.directus = await Directus(
+            "http://directus.local", token="token", connection=connection, containment_cache=True
+        )
+
+    async def asyncTearDown(self):
+        await self.directus.clear_cache(True)
+        await self.directus.close_connection()
+
+    async def test_narrower_queries(self):
+        await self.directus.collection("categories").limit(-1).read(cache=True)
+
+        response = await self.directus.collection("categories").filter(parent__null=True) \
+            .sort("position").fields("id", "name").read(cache=True)
+        self.assertEqual(response.items, [{"id": 2, "name": "Tables"}, {"id": 1, "name": "Chairs"}])
+
+        response = await self.directus.collection("categories").sort("position", asc=False).limit(1).read(cache=True)
+        self.assertEqual(response.items, [CATEGORIES[0]])
+
+        response = await self.directus.collection("categories").read(3, cache=True)
+        self.assertEqual(response.item["name"], "Stools")
+
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_incomplete_result(self):
+        # A limited result may miss items of a narrower query
+        await self.directus.collection("categories").limit(2).read(cache=True)
+        await self.directus.collection("categories").filter(id=3).read(cache=True)
+
+        self.assertEqual(len(self.requests), 2)
+
+    async def test_broader_filter(self):
+        await self.directus.collection("categories").filter(parent__null=True).limit(-1).read(cache=True)
+
+        response = await self.directus.collection("categories") \
+            .filter(F(parent__null=True) & F(position__gt=1)).read(cache=True)
+        self.assertEqual([item["id"] for item in response.items], [1])
+        self.assertEqual(len(self.requests), 1)
+
+        # Not narrowing the cached filter
+        await self.directus.collection("categories").filter(position__gt=1).read(cache=True)
+        self.assertEqual(len(self.requests), 2)
+
+    async def test_unsupported_queries(self):
+        await self.directus.collection("categories").fields("id", "position").limit(-1).read(cache=True)
+
+        # Fields which are not part of the cached result
+        await self.directus.collection("categories").fields("id", "name").read(cache=True)
+        # Text sorted by the collation of the database
+        await self.directus.collection("categories").sort("name").limit(-1).read(cache=True)
+        self.assertEqual(len(self.requests), 3)
+
+    async def test_uncached_reads(self):
+        # Only the reads asking for caching keep their results, pages after a cursor are never kept
+        await self.directus.collection("categories").limit(-1).read()
+        await self.directus.collection("categories").sort("position").after([1, 2]).read(cache=True)
+        await self.directus.collection("categories").filter(id=3).read(cache=True)
+
+        self.assertEqual(len(self.requests), 3)
+
+    def test_max_items(self):
+        containment = ContainmentCache(max_items=4)
+
+        self.assertTrue(containment.add("categories", {"limit": -1}, CATEGORIES))
+        self.assertTrue(containment.add("products", {"limit": -1}, CATEGORIES[:2]))
+
+        # The oldest result is dropped
+        self.assertIsNone(containment.get("categories", {"filter": {"id": {"_eq": 1}}}))
+        self.assertIsNotNone(containment.get("products", {"filter": {"id": {"_eq": 1}}}))
+
+        self.assertFalse(containment.add("categories", {"limit": -1}, CATEGORIES * 2))
+
+    async def test_invalidation(self):
+        await self.directus.collection("categories").limit(-1).read(cache=True)
+        await self.directus.collection("categories").update(1, {"name": "Seats"})
+        await self.directus.collection("categories").filter(id=1).read(cache=True)
+
+        self.assertEqual(len(self.requests), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
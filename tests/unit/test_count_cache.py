@@ -0,0 +1,90 @@
+import asyncio
+import json
+import unittest
+
+import httpx
+
+from py_directus import Directus, F
+from py_directus.count_cache import CountCache
+
+
+class TestCountCache(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the count cache against a local stand-in transport.
+    """
+
+    async def asyncSetUp(self):
+        self.queries = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "SEARCH":
+                query = json.loads(request.content)["query"]
+                self.queries.append(query)
+                await asyncio.sleep(0.01)
+
+                if query.get("meta") == "filter_count":
+                    return httpx.Response(200, json={"data": [], "meta": {"filter_count": 42}})
+                return httpx.Response(200, json={"data": [{"id": 1}]})
+
+            return httpx.Response(200, json={"data": {"id": 1}})
+
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.directus = Directus("http://directus.local", token="token", connection=connection, count_cache=True)
+
+    async def asyncTearDown(self):
+        await self.directus.close_connection()
+
+    async def test_count(self):
+        request = self.directus.collection("articles").filter(status="published").sort("title").page(3)
+        self.assertEqual(await request.count(), 42)
+
+        # Only the filter count is requested, without items
+        query = self.queries[0]
+        self.assertEqual(query["meta"], "filter_count")
+        self.assertEqual(query["limit"], 0)
+        self.assertNotIn("sort", query)
+        self.assertNotIn("page", query)
+
+        # The page query does not compute counts
+        await request.read()
+        self.assertNotIn("meta", self.queries[-1])
+
+    async def test_shared_count(self):
+        first = self.directus.collection("articles").filter(F(status="published") & F(featured=True)).page(1)
+        second = self.directus.collection("articles").filter(featured=True, status="published") \
+            .fields("id", "title").sort("date_created").page(5)
+
+        # Semantically equal filters share the count, concurrent reads a single request
+        counts = await asyncio.gather(first.count(), first.count(), second.count())
+        self.assertEqual(counts, [42, 42, 42])
+        self.assertEqual(await second.count(), 42)
+        self.assertEqual(len(self.queries), 1)
+
+        await self.directus.collection("articles").filter(status="draft").count()
+        self.assertEqual(len(self.queries), 2)
+
+    async def test_invalidation(self):
+        request = self.directus.collection("articles").filter(status="published")
+        await request.count()
+
+        await self.directus.collection("articles").create({"status": "published"})
+        await request.count()
+        self.assertEqual(len(self.queries), 2)
+
+        # Without the cache
+        await request.count(cache=False)
+        self.assertEqual(len(self.queries), 3)
+
+    async def test_expiration(self):
+        self.directus.counts = CountCache(timeout=0)
+
+        request = self.directus.collection("articles")
+        await request.count()
+        await asyncio.sleep(0.01)
+        await request.count()
+
+        self.assertEqual(len(self.queries), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
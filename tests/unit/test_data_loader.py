@@ -0,0 +1,115 @@
+import json
+import asyncio
+import unittest
+
+import httpx
+
+from py_directus import Directus
+from py_directus.directus_response import DirectusException
+from py_directus.predicate import compile_filter
+
+
+class TestDataLoader(unittest.IsolatedAsyncioTestCase):
+    """
+    Test batched reads by id against a local stand-in transport.
+    """
+
+    async def asyncSetUp(self):
+        self.queries = []
+        self.fail = False
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "PATCH":
+                return httpx.Response(200, json={"data": {"id": 42, **json.loads(request.content)}})
+
+            query = json.loads(request.content)["query"]
+            self.queries.append(query)
+
+            if self.fail:
+                return httpx.Response(500, json={"errors": [{"message": "failure"}]})
+
+            query_filter = json.loads(query["filter"])
+            conditions = query_filter.get("_and", [query_filter])
+            ids = next(condition["id"]["_in"] for condition in conditions if "id" in condition)
+            items = [
+                {"id": id, "name": f"item {id}", "status": "draft" if id == 7 else "published"}
+                for id in ids if id != 404
+            ]
+            return httpx.Response(200, json={"data": list(filter(compile_filter(query_filter), items))})
+
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.directus = Directus("http://directus.local", token="token", connection=connection)
+
+    async def asyncTearDown(self):
+        await self.directus.close_connection()
+
+    def _read(self, id, **kwargs):
+        return self.directus.collection("items").read(id, batch=True, **kwargs)
+
+    async def test_batch(self):
+        responses = await asyncio.gather(*[self._read(id) for id in [*range(250), 3, 3]])
+
+        self.assertEqual([len(json.loads(query["filter"])["id"]["_in"]) for query in self.queries], [100, 100, 50])
+        self.assertEqual(responses[42].item["name"], "item 42")
+        self.assertEqual(responses[-1].item["name"], "item 3")
+
+        # Outside a loader scope, items are only shared by the reads of the same batch
+        await self._read(42)
+        self.assertEqual(len(self.queries), 4)
+
+    async def test_scope(self):
+        with self.directus.loader_scope():
+            await self._read(42)
+            await asyncio.gather(self._read(42), self._read(43))
+            self.assertEqual(len(self.queries), 2)
+
+            self.directus.clear_loaders()
+            await self._read(42)
+            self.assertEqual(len(self.queries), 3)
+
+            # Writes forget the loaded items of the collection
+            await self.directus.collection("items").update(42, {"name": "renamed"})
+            await self._read(42)
+            self.assertEqual(len(self.queries), 4)
+
+        # Loaded items are not kept past the scope
+        await self._read(43)
+        self.assertEqual(len(self.queries), 5)
+
+    async def test_missing_item(self):
+        # As a regular read by id
+        with self.assertRaises(DirectusException) as context:
+            await self._read(404)
+        self.assertEqual(context.exception.status_code, 403)
+
+    async def test_filter(self):
+        published = self.directus.collection("items").filter(status="published")
+
+        with self.assertRaises(DirectusException):
+            await published.read(7, batch=True)
+        self.assertEqual((await published.read(8, batch=True)).item["id"], 8)
+        self.assertEqual((await self._read(7)).item["status"], "draft")
+
+        # Reads with other filters are batched separately
+        await asyncio.gather(published.read(1, batch=True), self._read(2))
+        self.assertEqual(len(self.queries), 5)
+
+    async def test_fields(self):
+        await asyncio.gather(
+            self.directus.collection("items").fields("name").read(1, batch=True),
+            self.directus.collection("items").fields("name").read(2, batch=True),
+            self.directus.collection("items").read(3, batch=True)
+        )
+
+        # Reads with different fields are batched separately, the key is always requested
+        self.assertEqual(sorted(query.get("fields", "") for query in self.queries), ["", "name,id"])
+
+    async def test_failure(self):
+        self.fail = True
+
+        results = await asyncio.gather(self._read(1), self._read(2), return_exceptions=True)
+        self.assertTrue(all(isinstance(result, DirectusException) for result in results))
+
+        # Failed loads are requested again
+        self.fail = False
+        self.assertEqual((await self._read(1)).item["id"], 1)
@@ -0,0 +1,166 @@
+import json
+import unittest
+from datetime import datetime
+
+import httpx
+
+from py_directus import Directus
+from py_directus.entity_cache import EntityCache
+from py_directus.predicate import compile_filter
+
+
+class TestEntityCache(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the normalized cache of items against a local stand-in transport.
+    """
+
+    async def asyncSetUp(self):
+        self.requests = []
+        self.items = {
+            1: {"id": 1, "name": "first", "status": "published"},
+            2: {"id": 2, "name": "second", "status": "draft"},
+        }
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append((request.method, request.url.path))
+
+            if request.method == "SEARCH":
+                query = json.loads(request.content)["query"]
+                if "aggregate" in query:
+                    return httpx.Response(200, json={"data": [{"count": len(self.items)}]})
+                items = filter(compile_filter(json.loads(query.get("filter", "{}"))), self.items.values())
+                return httpx.Response(200, json={"data": list(items)})
+            if request.method == "PATCH":
+                id = int(request.url.path.rsplit("/", 1)[-1])
+                self.items[id].update(json.loads(request.content))
+                return httpx.Response(200, json={"data": self.items[id]})
+            if request.method == "DELETE":
+                del self.items[int(request.url.path.rsplit("/", 1)[-1])]
+                return httpx.Response(204)
+
+            id = int(request.url.path.rsplit("/", 1)[-1])
+            return httpx.Response(200, json={"data": self.items[id]})
+
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.directus = await Directus(
+            "http://directus.local", token="token", connection=connection, entity_cache=True
+        )
+
+    async def asyncTearDown(self):
+        await self.directus.clear_cache(True)
+        await self.directus.close_connection()
+
+    async def test_read_by_id_from_list(self):
+        await self.directus.collection("items").read(cache=True)
+        response = await self.directus.collection("items").read(2, cache=True)
+
+        self.assertEqual(response.item, {"id": 2, "name": "second", "status": "draft"})
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_fields(self):
+        await self.directus.collection("items").fields("id", "name").read(cache=True)
+
+        # Only the requested fields are known
+        self.assertEqual((await self.directus.collection("items").fields("name").read(1, cache=True)).item,
+                         {"name": "first"})
+        await self.directus.collection("items").read(1, cache=True)
+        self.assertEqual(len(self.requests), 2)
+
+        # The query gets the fields it requested, not every field of the merged item
+        response = await self.directus.collection("items").fields("name", "id").read(cache=True)
+        self.assertEqual(response.items[0], {"id": 1, "name": "first"})
+        self.assertEqual(len(self.requests), 2)
+
+    async def test_uncached_reads(self):
+        # Only the reads asking for caching store their items
+        await self.directus.collection("items").read()
+        await self.directus.collection("items").read(1)
+        self.assertEqual(len(self.directus.entities), 0)
+
+    async def test_update_invalidates_queries(self):
+        await self.directus.collection("items").read(cache=True)
+        await self.directus.collection("items").update(1, {"name": "renamed"})
+
+        # The updated item is served from the cache
+        response = await self.directus.collection("items").read(1, cache=True)
+        self.assertEqual(response.item["name"], "renamed")
+        self.assertEqual(len(self.requests), 2)
+
+        # A query the updated item no longer matches is requested again
+        published = self.directus.collection("items").filter(status="published")
+        await published.read(cache=True)
+        await self.directus.collection("items").update(1, {"status": "draft"})
+
+        self.assertFalse((await published.read(cache=True)).items)
+        self.assertEqual(len(self.requests), 5)
+
+    async def test_delete_invalidates_queries(self):
+        await self.directus.collection("items").read(cache=True)
+        await self.directus.collection("items").delete(1)
+
+        response = await self.directus.collection("items").read(cache=True)
+        self.assertEqual([item["id"] for item in response.items], [2])
+        self.assertEqual(len(self.requests), 3)
+
+    async def test_aggregation(self):
+        # Not normalized, cached as a whole response
+        for _ in range(2):
+            response = await self.directus.collection("items").aggregate(count="*").read(cache=True)
+            self.assertEqual(response.items, [{"count": 2}])
+
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(len(self.directus.entities), 0)
+
+    def test_merge_keeps_related_items(self):
+        entities = EntityCache()
+        entities.write("articles", [{"id": 1, "author": {"id": 5, "name": "Alice"}}], "id,author.*")
+        entities.write("articles", [{"id": 1, "author": 5, "title": "Title"}])
+
+        self.assertEqual(
+            entities.read("articles", 1, "*,author.*"), {"id": 1, "author": {"id": 5, "name": "Alice"}, "title": "Title"}
+        )
+        # Relations read through `*` are given as their key, as Directus does
+        self.assertEqual(entities.read("articles", 1), {"id": 1, "author": 5, "title": "Title"})
+
+        entities.write("articles", [{"id": 1, "author": 6}])
+        self.assertEqual(entities.read("articles", 1, "author")["author"], 6)
+        self.assertIsNone(entities.read("articles", 1, "author.name"))
+
+    def test_nested_fields(self):
+        entities = EntityCache()
+        entities.write("articles", [{"id": 1, "author": {"name": "Alice"}}], "id,author.name")
+
+        self.assertEqual(entities.read("articles", 1, "id,author.name"), {"id": 1, "author": {"name": "Alice"}})
+        self.assertIsNone(entities.read("articles", 1, "id,author.email"))
+
+        # Every field of the item, with the related items as ids
+        entities.write("articles", [{"id": 2, "title": "Title", "author": 5}])
+        self.assertIsNone(entities.read("articles", 2, "*,author.*"))
+
+        # Fields of the same related item read by different queries
+        entities.write("articles", [{"id": 3, "author": {"id": 5, "name": "Alice"}}], "id,author.id,author.name")
+        entities.write("articles", [{"id": 3, "author": {"id": 5, "email": "alice@example.com"}}], "author.id,author.email")
+        self.assertEqual(
+            entities.read("articles", 3, "author.name,author.email"),
+            {"author": {"name": "Alice", "email": "alice@example.com"}}
+        )
+
+    def test_max_entries(self):
+        entities = EntityCache(max_entries=2)
+        entities.write("articles", [{"id": 1}, {"id": 2}])
+        entities.read("articles", 1)
+        entities.write("articles", [{"id": 3}])
+
+        # The least recently used item is dropped
+        self.assertEqual(len(entities), 2)
+        self.assertIsNone(entities.read("articles", 2))
+        self.assertIsNotNone(entities.read("articles", 1))
+
+        entities = EntityCache(timeout=60)
+        entities.write("articles", [{"id": 1}])
+        entities._entities[("articles", "1")].updated = datetime(2000, 1, 1)
+        entities.write("articles", [{"id": 2}])
+        self.assertEqual(len(entities), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import json
+import unittest
+from typing import List, Optional, Union
+
+import httpx
+
+from py_directus import Directus, F
+from py_directus.models import DirectusModel
+from py_directus.models.base import DirectusConfigDict
+from py_directus.planner import plan_fetch
+
+
+class Customer(DirectusModel):
+    model_config = DirectusConfigDict(collection="customers")
+
+    id: Optional[int] = None
+    name: Optional[str] = None
+
+
+class Product(DirectusModel):
+    model_config = DirectusConfigDict(collection="products")
+
+    id: Optional[int] = None
+    name: Optional[str] = None
+
+
+class Line(DirectusModel):
+    model_config = DirectusConfigDict(collection="order_lines")
+
+    id: Optional[int] = None
+    quantity: Optional[int] = None
+    product: Optional[Union[int, Product]] = None
+
+
+class Order(DirectusModel):
+    model_config = DirectusConfigDict(collection="orders")
+
+    id: Optional[int] = None
+    customer: Optional[Union[int, Customer]] = None
+    lines: Optional[List[Union[int, Line]]] = None
+
+
+class TestFetchPlanner(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the planning and the execution of relational fetches against a local stand-in transport.
+    """
+
+    async def asyncSetUp(self):
+        self.requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            query = json.loads(request.content)["query"]
+            self.requests.append((request.url.path, query))
+
+            if request.url.path == "/items/orders":
+                return httpx.Response(200, json={"data": [
+                    {"id": 1, "customer": {"id": 7, "name": "Alice"}, "lines": [10, 11]},
+                    {"id": 2, "customer": {"id": 8, "name": "Bob"}, "lines": [11, 12]},
+                ]})
+
+            ids = json.loads(query["filter"])["id"]["_in"]
+            return httpx.Response(200, json={"data": [
+                {"id": id, "quantity": 1, "product": {"id": id * 10, "name": f"product {id}"}} for id in ids
+            ]})
+
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.directus = Directus("http://directus.local", token="token", connection=connection)
+
+    async def asyncTearDown(self):
+        await self.directus.close_connection()
+
+    def test_inline(self):
+        plan = plan_fetch(Order, ["customer", "lines", "lines.product"])
+
+        self.assertEqual(plan.fields, [
+            "id", "customer.id", "customer.name",
+            "lines.id", "lines.quantity", "lines.product.id", "lines.product.name",
+        ])
+        self.assertEqual(plan.batched, [])
+
+        # Relations not included are left as ids
+        self.assertEqual(plan_fetch(Order, []).fields, ["id", "customer", "lines"])
+
+    def test_batched(self):
+        plan = plan_fetch(Order, ["customer", "lines.product"], fanout={"lines": 200})
+
+        self.assertEqual(plan.fields, ["id", "customer.id", "customer.name", "lines"])
+        self.assertEqual(len(plan.batched), 1)
+        self.assertEqual(plan.batched[0].path, ("lines",))
+        self.assertEqual(plan.batched[0].collection, "order_lines")
+        self.assertEqual(plan.batched[0].plan.fields, ["id", "quantity", "product.id", "product.name"])
+
+        # Relations with `deep` parameters are inlined
+        plan = plan_fetch(Order, ["lines"], fanout={"lines": 200}, inline=["lines"])
+        self.assertEqual(plan.batched, [])
+
+    def test_deep(self):
+        request = self.directus.collection(Order) \
+            .deep(lines={"_sort": ["-quantity"], "_limit": 5}) \
+            .deep(lines__product={"_filter": F(name__contains="chair")})
+
+        self.assertEqual(request.params["deep"], {"lines": {
+            "_sort": ["-quantity"], "_limit": 5, "product": {"_filter": {"name": {"_contains": "chair"}}}
+        }})
+        self.assertEqual(request._get_deep_paths(), ["lines", "lines.product"])
+
+    async def test_read_inline(self):
+        response = await self.directus.collection(Order).include("customer").read()
+
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(self.requests[0][1]["fields"], "id,customer.id,customer.name,lines")
+        self.assertEqual(response.items[0].customer.name, "Alice")
+
+    async def test_read_batched(self):
+        response = await self.directus.collection(Order) \
+            .include("customer", "lines.product", fanout={"lines": 200}).read()
+
+        # The lines of every order are fetched with a single second query
+        self.assertEqual([path for path, _ in self.requests], ["/items/orders", "/items/order_lines"])
+        self.assertEqual(sorted(json.loads(self.requests[1][1]["filter"])["id"]["_in"]), [10, 11, 12])
+
+        orders = response.items
+        self.assertEqual([line.id for line in orders[1].lines], [11, 12])
+        self.assertEqual(orders[1].lines[1].product.name, "product 12")
+
+    async def test_read_batched_again(self):
+        request = self.directus.collection(Order).include("lines", fanout={"lines": 200})
+
+        # Every read fetches the related items again, even within a loader scope
+        with self.directus.loader_scope():
+            await request.read()
+            await request.read()
+
+        self.assertEqual([path for path, _ in self.requests], ["/items/orders", "/items/order_lines"] * 2)
+
+    def test_requires_model(self):
+        with self.assertRaises(TypeError):
+            self.directus.collection("orders").include("lines")._get_params()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import json
+import unittest
+from typing import List, Optional, Union
+
+import httpx
+from pydantic import Field
+
+from py_directus import Directus
+from py_directus.models import DirectusModel
+from py_directus.models.base import DirectusConfigDict
+from py_directus.projection import get_model_fields
+
+
+class Author(DirectusModel):
+    model_config = DirectusConfigDict(collection="authors")
+
+    id: Optional[int] = None
+    name: Optional[str] = None
+    country: Optional[Union[int, 'Country']] = None
+
+
+class Country(DirectusModel):
+    model_config = DirectusConfigDict(collection="countries")
+
+    id: Optional[int] = None
+    code: Optional[str] = None
+
+
+class Article(DirectusModel):
+    model_config = DirectusConfigDict(collection="articles")
+
+    id: Optional[int] = None
+    title: Optional[str] = None
+    published_on: Optional[str] = Field(default=None, alias="date_published")
+    author: Optional[Union[int, Author]] = None
+    tags: Optional[List[Union[int, Country]]] = None
+
+
+class AutoArticle(Article):
+    model_config = DirectusConfigDict(collection="articles", auto_fields=True)
+
+
+Author.model_rebuild()
+
+
+class TestFieldProjection(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the fields derived from the models.
+    """
+
+    async def asyncSetUp(self):
+        self.bodies = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.bodies.append(json.loads(request.content))
+            return httpx.Response(200, json={"data": []})
+
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.directus = Directus("http://directus.local", token="token", connection=connection)
+
+    async def asyncTearDown(self):
+        await self.directus.close_connection()
+
+    def test_model_fields(self):
+        self.assertEqual(
+            get_model_fields(Article),
+            ("id", "title", "date_published", "author.*", "tags.*")
+        )
+        self.assertEqual(
+            get_model_fields(Article, depth=1),
+            ("id", "title", "date_published", "author.id", "author.name", "author.country.*", "tags.id", "tags.code")
+        )
+
+    async def test_auto_fields(self):
+        await self.directus.collection(Article).read()
+        await self.directus.collection(Article).auto_fields().read()
+        await self.directus.collection(Article).auto_fields().fields("id").read()
+        await self.directus.collection(AutoArticle).read()
+
+        self.assertNotIn("fields", self.bodies[0]["query"])
+        self.assertEqual(self.bodies[1]["query"]["fields"], "id,title,date_published,author.*,tags.*")
+        self.assertEqual(self.bodies[2]["query"]["fields"], "id")
+        self.assertEqual(self.bodies[3]["query"]["fields"], self.bodies[1]["query"]["fields"])
@@ -0,0 +1,166 @@
+import os
+import hashlib
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+import httpx
+
+from py_directus import Directus
+from py_directus.storage import get_partial_path
+
+
+ASSET = os.urandom(200 * 1024)
+ASSET_ETAG = '"v1"'
+
+
+def asset_handler(request: httpx.Request) -> httpx.Response:
+    headers = {"content-disposition": 'attachment; filename="asset.bin"', "etag": ASSET_ETAG}
+
+    range_header = request.headers.get("range")
+    # A range of another version of the asset is answered with the whole asset
+    if range_header and request.headers.get("if-range") == ASSET_ETAG:
+        start = int(range_header.split("=")[1].rstrip("-"))
+        return httpx.Response(206, content=ASSET[start:], headers=headers)
+
+    return httpx.Response(200, content=ASSET, headers=headers)
+
+
+class TestStreamingDownload(unittest.IsolatedAsyncioTestCase):
+    """
+    Test streaming asset downloads against a local stand-in transport.
+    """
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.downloads_patch = mock.patch("platformdirs.user_downloads_dir", return_value=self.tmp_dir.name)
+        self.downloads_patch.start()
+
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(asset_handler))
+        self.directus = Directus("http://directus.local", token="token", connection=connection)
+
+    async def asyncTearDown(self):
+        await self.directus.close_connection()
+        self.downloads_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def _read_download(self, name):
+        with open(os.path.join(self.tmp_dir.name, "py_directus", name), "rb") as f:
+            return f.read()
+
+    async def test_stream_download(self):
+        progress = []
+
+        response = await self.directus.download_file(
+            "file-id", stream=True, chunk_size=16 * 1024, progress=lambda done, total: progress.append((done, total))
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._read_download("asset.bin"), ASSET)
+        self.assertEqual(progress[-1], (len(ASSET), len(ASSET)))
+        self.assertTrue(all(done - prev <= 16 * 1024 for (prev, _), (done, _) in zip(progress, progress[1:])))
+
+    async def _write_partial(self, content, validator=None):
+        params_digest = hashlib.md5(json.dumps({"download": ""}, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+        partial_path = await get_partial_path(f"file-id_{params_digest}")
+
+        with open(partial_path, "wb") as f:
+            f.write(content)
+        if validator:
+            with open(f"{partial_path}.validator", "w") as f:
+                f.write(validator)
+
+        return partial_path
+
+    async def test_stream_download_resume(self):
+        partial_path = await self._write_partial(ASSET[:1000], ASSET_ETAG)
+
+        response = await self.directus.download_file("file-id", stream=True)
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.request.headers["range"], "bytes=1000-")
+        self.assertEqual(response.request.headers["if-range"], ASSET_ETAG)
+        self.assertEqual(self._read_download("asset.bin"), ASSET)
+        self.assertFalse(os.path.exists(partial_path))
+        self.assertFalse(os.path.exists(f"{partial_path}.validator"))
+
+    async def test_stream_download_changed(self):
+        # A partial file of a previous version of the asset
+        partial_path = await self._write_partial(b"x" * 1000, '"v0"')
+
+        response = await self.directus.download_file("file-id", stream=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._read_download("asset.bin"), ASSET)
+        self.assertFalse(os.path.exists(f"{partial_path}.validator"))
+
+        # Without a known version, the partial file is not resumed
+        await self._write_partial(b"x" * 1000)
+
+        response = await self.directus.download_file("file-id", stream=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("range", response.request.headers)
+
+
+class TestRangedDownload(unittest.IsolatedAsyncioTestCase):
+    """
+    Test multi-connection ranged downloads against a local stand-in transport.
+    """
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.downloads_patch = mock.patch("platformdirs.user_downloads_dir", return_value=self.tmp_dir.name)
+        self.downloads_patch.start()
+        self.part_size_patch = mock.patch("py_directus.directus.DOWNLOAD_MIN_PART_SIZE", 32 * 1024)
+        self.part_size_patch.start()
+
+        self.ranges = []
+        self.accept_ranges = True
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            headers = {"content-disposition": 'attachment; filename="asset.bin"', "etag": '"v1"'}
+
+            if request.method == "HEAD":
+                if self.accept_ranges:
+                    headers["accept-ranges"] = "bytes"
+                return httpx.Response(200, headers={**headers, "content-length": str(len(ASSET))})
+
+            range_header = request.headers.get("range")
+            if range_header and self.accept_ranges:
+                start, end = [int(position) for position in range_header.split("=")[1].split("-")]
+                self.ranges.append((start, end))
+                return httpx.Response(206, content=ASSET[start:end + 1], headers=headers)
+
+            return httpx.Response(200, content=ASSET, headers=headers)
+
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.directus = Directus("http://directus.local", token="token", connection=connection)
+
+    async def asyncTearDown(self):
+        await self.directus.close_connection()
+        self.part_size_patch.stop()
+        self.downloads_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def _read_download(self, name):
+        with open(os.path.join(self.tmp_dir.name, "py_directus", name), "rb") as f:
+            return f.read()
+
+    async def test_ranged_download(self):
+        response = await self.directus.download_file("file-id", connections=4)
+
+        self.assertEqual(response.request.method, "HEAD")
+        self.assertEqual(self._read_download("asset.bin"), ASSET)
+        self.assertEqual(len(self.ranges), 4)
+        self.assertEqual(sum(end - start + 1 for start, end in self.ranges), len(ASSET))
+
+    async def test_ranged_download_fallback(self):
+        self.accept_ranges = False
+
+        response = await self.directus.download_file("file-id", connections=4)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._read_download("asset.bin"), ASSET)
+        self.assertEqual(self.ranges, [])
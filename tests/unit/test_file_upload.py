@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+from email.parser import BytesParser
+from email.policy import HTTP
+
+import httpx
+
+from py_directus import Directus
+
+try:
+    from starlette.datastructures import UploadFile, Headers
+except ImportError:
+    UploadFile = None
+
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02\x00\x00\x00"
+
+
+class TestStreamingUpload(unittest.IsolatedAsyncioTestCase):
+    """
+    Test streamed multipart uploads against a local stand-in transport.
+    """
+
+    async def asyncSetUp(self):
+        self.requests = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append((request, await request.aread()))
+            return httpx.Response(200, json={"data": {"id": "file-id"}})
+
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.directus = Directus("http://directus.local", token="token", connection=connection)
+
+    async def asyncTearDown(self):
+        await self.directus.close_connection()
+
+    def _parse_body(self):
+        request, body = self.requests[-1]
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {request.headers['content-type']}\r\n\r\n".encode('utf-8') + body
+        )
+        return request, {part.get_param("name", header="content-disposition"): part for part in message.iter_parts()}
+
+    async def test_upload_path(self):
+        content = PNG_HEADER + os.urandom(100 * 1024)
+
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
+            f.write(content)
+
+        try:
+            response = await self.directus.upload_file(f.name, chunk_size=4096)
+        finally:
+            os.remove(f.name)
+
+        request, parts = self._parse_body()
+
+        self.assertEqual(response.item["id"], "file-id")
+        self.assertEqual(int(request.headers["content-length"]), len(self.requests[-1][1]))
+        self.assertEqual(list(parts), ["title", "file"])
+        self.assertEqual(parts["file"].get_content_type(), "image/png")
+        self.assertEqual(parts["file"].get_payload(decode=True), content)
+
+    async def test_upload_async_iterator(self):
+        chunks = [b"hello ", b"streamed ", b"world"]
+
+        async def produce():
+            for chunk in chunks:
+                yield chunk
+
+        await self.directus.upload_file(produce(), filename="hello.txt")
+
+        request, parts = self._parse_body()
+
+        self.assertEqual(request.headers["transfer-encoding"], "chunked")
+        self.assertEqual(parts["title"].get_payload(), "hello")
+        self.assertEqual(parts["file"].get_content_type(), "text/plain")
+        self.assertEqual(parts["file"].get_payload(decode=True), b"".join(chunks))
+
+    @unittest.skipIf(UploadFile is None, "starlette is not installed")
+    async def test_upload_starlette_file(self):
+        content = os.urandom(10 * 1024)
+
+        with tempfile.SpooledTemporaryFile() as f:
+            f.write(content)
+            f.seek(0)
+
+            upload = UploadFile(
+                f, size=len(content), filename="blob.bin",
+                headers=Headers({"content-type": "application/octet-stream"})
+            )
+            await self.directus.upload_file(upload)
+
+        request, parts = self._parse_body()
+
+        self.assertEqual(parts["file"].get_filename(), "blob.bin")
+        self.assertEqual(parts["file"].get_payload(decode=True), content)
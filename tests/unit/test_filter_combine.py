@@ -0,0 +1,92 @@
+import random
+import unittest
+from functools import reduce
+
+from py_directus import F
+
+
+def evaluate(query: dict, record: dict) -> bool:
+    """
+    Minimal reference evaluation of `_and`/`_or`/`_eq`/`_gt` filter queries.
+    """
+    results = []
+
+    for key, value in query.items():
+        if key == "_and":
+            results.append(all(evaluate(sub_query, record) for sub_query in value))
+        elif key == "_or":
+            results.append(any(evaluate(sub_query, record) for sub_query in value))
+        else:
+            for operator, operand in value.items():
+                if operator == "_eq":
+                    results.append(record[key] == operand)
+                elif operator == "_gt":
+                    results.append(record[key] > operand)
+
+    return all(results)
+
+
+def nested(queries: list, operator: str) -> dict:
+    """
+    The binary nesting `combine` produced before chains were flattened.
+    """
+    return reduce(lambda left, right: {operator: [left, right]}, queries)
+
+
+class TestFilterCombine(unittest.TestCase):
+    """
+    Test that combined filters are flattened without changing their meaning.
+    """
+
+    def test_flatten_chain(self):
+        chained = F(a=1) & F(b=2) & F(c__gt=3) & F(d=4)
+
+        self.assertEqual(
+            chained.query,
+            {"_and": [{"a": {"_eq": 1}}, {"b": {"_eq": 2}}, {"c": {"_gt": 3}}, {"d": {"_eq": 4}}]}
+        )
+
+        # Multiple keyword arguments are a chain as well
+        self.assertEqual(len((F(a=1, b=2) & F(c=3)).query["_and"]), 3)
+
+    def test_mixed_operators(self):
+        self.assertEqual(
+            ((F(a=1) & F(b=2)) | F(c=3) | F(d=4)).query,
+            {"_or": [{"_and": [{"a": {"_eq": 1}}, {"b": {"_eq": 2}}]}, {"c": {"_eq": 3}}, {"d": {"_eq": 4}}]}
+        )
+
+    def test_operands_not_modified(self):
+        first = F(a=1) & F(b=2)
+        first_query = {"_and": list(first.query["_and"])}
+
+        first & F(c=3)
+
+        self.assertEqual(first.query, first_query)
+
+    def test_empty_operands(self):
+        self.assertEqual((F() & F(a=1)).query, {"a": {"_eq": 1}})
+        self.assertEqual((F(a=1) | F()).query, {"a": {"_eq": 1}})
+
+    def test_semantic_equivalence(self):
+        rng = random.Random(0)
+        fields = ["a", "b", "c"]
+
+        def random_filter(depth: int) -> F:
+            if depth == 0 or rng.random() < 0.3:
+                field = rng.choice(fields)
+                return F(**{f"{field}__gt": rng.randint(0, 3)}) if rng.random() < 0.5 else F(**{field: rng.randint(0, 3)})
+
+            operands = [random_filter(depth - 1) for _ in range(rng.randint(2, 4))]
+            operator = rng.choice(["_and", "_or"])
+
+            flattened = reduce(lambda left, right: left & right if operator == "_and" else left | right, operands)
+            reference = nested([operand.query for operand in operands], operator)
+
+            for _ in range(20):
+                record = {field: rng.randint(0, 3) for field in fields}
+                self.assertEqual(evaluate(flattened.query, record), evaluate(reference, record))
+
+            return flattened
+
+        for _ in range(200):
+            random_filter(3)
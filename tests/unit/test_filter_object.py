@@ -41,3 +41,20 @@ class TestFilterObject(unittest.TestCase):
         complex_filter = F(age=23) & (F(name="John") | F(name="Jane"))
 
         print(json.dumps(complex_filter.query, indent=2))
+
+    def test_parse_key(self):
+        self.assertEqual(F.parse_key("age"), ("age", "_eq"))
+        self.assertEqual(F.parse_key("age__gt"), ("age", "_gt"))
+        self.assertEqual(F.parse_key("user__name__istarts_with"), ("user.name", "_istarts_with"))
+        self.assertEqual(F.parse_key("tags__nin"), ("tags", "_nin"))
+        self.assertEqual(F.parse_key("area__intersects_bbox"), ("area", "_intersects_bbox"))
+        self.assertEqual(F.parse_key("__or"), (None, "_or"))
+        self.assertEqual(F.parse_key("name__gt__x"), ("name.gt.x", "_eq"))
+
+    def test_filter_query(self):
+        self.assertEqual(F(user__role__name__in=["admin"]).query, {"user": {"role": {"name": {"_in": ["admin"]}}}})
+        self.assertEqual(
+            F(name__contains="John", age__gt=23).query,
+            {"_and": [{"name": {"_contains": "John"}}, {"age": {"_gt": 23}}]}
+        )
+        self.assertEqual(F().query, {})
@@ -0,0 +1,116 @@
+import json
+import random
+import unittest
+
+import httpx
+
+from py_directus import Directus, F
+from py_directus.optimizer import optimize_filter
+
+
+def evaluate(query: dict, record: dict) -> bool:
+    """
+    Minimal reference evaluation of the filter queries used in these tests.
+    """
+    results = []
+
+    for key, value in query.items():
+        if key == "_and":
+            results.append(all(evaluate(sub_query, record) for sub_query in value))
+        elif key == "_or":
+            results.append(any(evaluate(sub_query, record) for sub_query in value))
+        else:
+            for operator, operand in value.items():
+                if operator == "_eq":
+                    results.append(record[key] == operand)
+                elif operator == "_in":
+                    results.append(record[key] in operand)
+                elif operator == "_gt":
+                    results.append(record[key] > operand)
+
+    return all(results)
+
+
+class TestFilterOptimizer(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the filter optimizer rewrites.
+    """
+
+    def test_merge_equalities(self):
+        self.assertEqual(
+            (F(status="draft") | F(status="review") | F(status__in=["draft", "archived"])).optimized().query,
+            {"status": {"_in": ["archived", "draft", "review"]}}
+        )
+        self.assertEqual(
+            (F(user__role=2) | F(user__role=1) | F(age__gt=3)).optimized().query,
+            {"_or": [{"user": {"role": {"_in": [1, 2]}}}, {"age": {"_gt": 3}}]}
+        )
+
+        # Null equalities never match `_in`
+        self.assertEqual(
+            (F(parent=None) | F(parent=1)).optimized().query,
+            {"_or": [{"parent": {"_eq": None}}, {"parent": {"_eq": 1}}]}
+        )
+
+    def test_set_values(self):
+        self.assertEqual(F(id__in=[3, 1, 3, 2]).optimized().query, {"id": {"_in": [1, 2, 3]}})
+        self.assertEqual(F(id__nin=["b", "a", "b"]).optimized().query, {"id": {"_nin": ["a", "b"]}})
+        self.assertEqual(F(flag__in=[1, True]).optimized().query, {"flag": {"_in": [True, 1]}})
+
+    def test_collapse_groups(self):
+        self.assertEqual(optimize_filter({"_and": [{"_and": [{"a": {"_eq": 1}}]}]}), {"a": {"_eq": 1}})
+        self.assertEqual(
+            optimize_filter({"_and": [{"a": {"_eq": 1}}, {"a": {"_eq": 1}}, {"_and": [{"b": {"_eq": 2}}]}]}),
+            {"_and": [{"a": {"_eq": 1}}, {"b": {"_eq": 2}}]}
+        )
+
+    def test_tautologies(self):
+        self.assertEqual(optimize_filter({"_and": [{}, {"a": {"_eq": 1}}, {"b": {}}]}), {"a": {"_eq": 1}})
+        self.assertEqual(optimize_filter({"_or": [{}, {"a": {"_eq": 1}}]}), {})
+        self.assertEqual(optimize_filter({"_and": []}), {})
+
+        # Operator values are never rewritten
+        self.assertEqual(optimize_filter({"data": {"_eq": {}}}), {"data": {"_eq": {}}})
+
+    def test_semantic_equivalence(self):
+        rng = random.Random(0)
+        fields = ["a", "b"]
+
+        def random_query(depth: int) -> dict:
+            if depth == 0 or rng.random() < 0.3:
+                field = rng.choice(fields)
+                operator = rng.choice(["_eq", "_eq", "_in", "_gt"])
+                value = [rng.randint(0, 3) for _ in range(3)] if operator == "_in" else rng.randint(0, 3)
+                return {field: {operator: value}}
+
+            operands = [random_query(depth - 1) for _ in range(rng.randint(1, 4))]
+            operands += rng.sample(operands, k=rng.randint(0, len(operands))) + [{}] * rng.randint(0, 1)
+            return {rng.choice(["_and", "_or"]): operands}
+
+        for _ in range(300):
+            query = random_query(3)
+            optimized = optimize_filter(query)
+
+            self.assertLessEqual(len(json.dumps(optimized)), len(json.dumps(query)))
+            for _ in range(20):
+                record = {field: rng.randint(0, 3) for field in fields}
+                self.assertEqual(evaluate(optimized, record), evaluate(query, record), (query, optimized))
+
+    async def test_request_optimize(self):
+        bodies = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            bodies.append(json.loads(request.content))
+            return httpx.Response(200, json={"data": []})
+
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        directus = Directus("http://directus.local", token="token", connection=connection)
+
+        request = directus.collection("posts").filter(F(id=1) | F(id=2) | F(id=1))
+
+        await request.read()
+        await request.optimize().read()
+        await connection.aclose()
+
+        self.assertEqual(len(json.loads(bodies[0]["query"]["filter"])["_or"]), 3)
+        self.assertEqual(json.loads(bodies[1]["query"]["filter"]), {"id": {"_in": [1, 2]}})
@@ -0,0 +1,81 @@
+import json
+import unittest
+from unittest import mock
+
+import httpx
+
+from py_directus import Directus
+from py_directus.transformation import ImageFileTransform, image_presets
+
+
+class TestImagePresets(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the image preset registry, srcset and warmup helpers.
+    """
+
+    async def asyncSetUp(self):
+        image_presets.register("thumb", fit="cover", width=320, height=320, quality=70)
+        image_presets.register("card", fit="cover", width=640, img_format="webp")
+        image_presets.register("hero", width=1280, quality=80)
+
+        self.url_patch = mock.patch("py_directus.directus_url", "http://directus.local")
+        self.url_patch.start()
+
+        self.requests = []
+        self.settings = {"storage_asset_presets": [{"key": "legacy", "width": 100}, {"key": "thumb", "width": 1}]}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+
+            if request.url.path == "/settings":
+                if request.method == "PATCH":
+                    self.settings.update(json.loads(request.content))
+                return httpx.Response(200, json={"data": self.settings})
+
+            if request.url.path == "/files":
+                return httpx.Response(200, json={"data": {"id": "file-id"}})
+
+            return httpx.Response(200, content=b"image")
+
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.directus = Directus("http://directus.local", token="token", connection=connection)
+
+    async def asyncTearDown(self):
+        await self.directus.close_connection()
+        self.url_patch.stop()
+        for key in ["thumb", "card", "hero"]:
+            image_presets.unregister(key)
+
+    def test_preset_parameters(self):
+        self.assertEqual(ImageFileTransform(preset="card", width=10).parameters, {"key": "card"})
+        self.assertEqual(Directus.get_file_url("file-id", preset="thumb"), "http://directus.local/assets/file-id?key=thumb")
+
+        with self.assertRaises(KeyError):
+            ImageFileTransform(preset="missing")
+
+    def test_srcset(self):
+        self.assertEqual(
+            Directus.get_srcset("file-id", "hero", "thumb"),
+            "http://directus.local/assets/file-id?key=thumb 320w, http://directus.local/assets/file-id?key=hero 1280w"
+        )
+        self.assertEqual(Directus.get_srcset("file-id").count("w,"), 2)
+
+    async def test_sync_image_presets(self):
+        await self.directus.sync_image_presets()
+
+        presets = {preset["key"]: preset for preset in self.settings["storage_asset_presets"]}
+
+        self.assertEqual(sorted(presets), ["card", "hero", "legacy", "thumb"])
+        self.assertEqual(presets["thumb"], {"key": "thumb", "fit": "cover", "width": 320, "height": 320, "quality": 70})
+        self.assertEqual(presets["card"]["format"], "webp")
+
+    async def test_upload_warmup(self):
+        await self.directus.upload_file(self._async_bytes(), filename="image.png", warmup=["thumb", "card"])
+        await self.directus.gather_warmups()
+
+        asset_requests = [request for request in self.requests if request.url.path == "/assets/file-id"]
+        self.assertEqual(sorted(request.url.params["key"] for request in asset_requests), ["card", "thumb"])
+
+    @staticmethod
+    async def _async_bytes():
+        yield b"\x89PNG\r\n\x1a\n"
@@ -0,0 +1,141 @@
+import json
+import unittest
+from http import HTTPStatus
+
+import httpx
+
+try:
+    from fastapi import Depends, FastAPI
+    from fastapi.testclient import TestClient
+    from py_directus.fast_api.pagination import CursorPage, CursorParams, paginate
+except ImportError:
+    FastAPI = None
+
+from py_directus import Directus
+from py_directus.keyset import decode_cursor, encode_cursor
+from py_directus.predicate import compile_filter, sort_items
+
+
+# Three articles a day
+ARTICLES = [
+    {"id": id, "title": f"Article {id}", "date": f"2024-01-{(id + 2) // 3:02d}"}
+    for id in range(1, 11)
+]
+
+
+def create_handler(queries):
+    def handler(request: httpx.Request) -> httpx.Response:
+        query = json.loads(request.content)["query"]
+        queries.append(query)
+
+        items = list(filter(compile_filter(json.loads(query.get("filter", "{}"))), ARTICLES))
+        items = sort_items(items, query.get("sort"))
+        return httpx.Response(200, json={"data": items[:query.get("limit", 100)]})
+
+    return handler
+
+
+class TestKeysetPagination(unittest.IsolatedAsyncioTestCase):
+    """
+    Test keyset pagination against a local stand-in transport.
+    """
+
+    async def asyncSetUp(self):
+        self.queries = []
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(create_handler(self.queries)))
+        self.directus = Directus("http://directus.local", token="token", connection=connection)
+
+    async def asyncTearDown(self):
+        await self.directus.close_connection()
+
+    async def test_pages(self):
+        cursor, ids = None, []
+
+        while True:
+            request = self.directus.collection("articles").sort("date", asc=False).limit(4).after(cursor)
+            items = (await request.read()).items_as_dict() or []
+            ids += [item["id"] for item in items]
+
+            if len(items) < 4:
+                break
+            cursor = request.get_cursor(items[-1])
+
+        # Articles of the same day are ordered by their id
+        self.assertEqual(ids, [10, 7, 8, 9, 4, 5, 6, 1, 2, 3])
+        self.assertEqual(self.queries[-1]["sort"], ["-date", "id"])
+        self.assertTrue(all("offset" not in query for query in self.queries))
+
+    async def test_values(self):
+        request = self.directus.collection("articles").fields("title").sort("date").after(["2024-01-02", 5])
+        items = (await request.read()).items_as_dict()
+
+        self.assertEqual([item["id"] for item in items], [6, 7, 8, 9, 10])
+        self.assertEqual(self.queries[-1]["fields"], "title,date,id")
+
+    async def test_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            self.directus.collection("articles").sort("date").after("not a cursor")
+
+        # A cursor of other sort fields
+        with self.assertRaises(ValueError):
+            self.directus.collection("articles").sort("title").after(encode_cursor(["date", "id"], ["2024-01-01", 1]))
+
+    def test_null_sort_value(self):
+        request = self.directus.collection("articles").sort("published_on").after(None)
+
+        # No cursor is given for a position the next page could not be requested after
+        with self.assertRaises(ValueError):
+            request.get_cursor({"id": 1, "published_on": None})
+        self.assertTrue(request.get_cursor({"id": 1, "published_on": "2024-01-01"}))
+
+    def test_cursor_encoding(self):
+        cursor = encode_cursor(["-date", "id"], ["2024-01-01", 3])
+        self.assertEqual(decode_cursor(cursor), (["-date", "id"], ["2024-01-01", 3]))
+        self.assertNotIn("=", cursor)
+
+
+@unittest.skipIf(FastAPI is None, "FastAPI is not installed")
+class TestCursorEndpoint(unittest.TestCase):
+    """
+    Test a list endpoint paginated by cursor.
+    """
+
+    def setUp(self):
+        directus = Directus(
+            "http://directus.local", connection=httpx.AsyncClient(transport=httpx.MockTransport(create_handler([])))
+        )
+
+        app = FastAPI()
+
+        @app.get("/articles", response_model=CursorPage[dict])
+        async def articles(params: CursorParams = Depends()):
+            return await paginate(directus.collection("articles").sort("date"), params)
+
+        @app.get("/recent", response_model=CursorPage[dict])
+        async def recent(params: CursorParams = Depends()):
+            return await paginate(directus.collection("articles"), params)
+
+        self.client = TestClient(app)
+
+    def test_pages(self):
+        first = self.client.get("/articles", params={"limit": 6}).json()
+        self.assertEqual([item["id"] for item in first["items"]], [1, 2, 3, 4, 5, 6])
+
+        second = self.client.get("/articles", params={"limit": 6, "cursor": first["next_cursor"]}).json()
+        self.assertEqual([item["id"] for item in second["items"]], [7, 8, 9, 10])
+        self.assertIsNone(second["next_cursor"])
+
+    def test_invalid_cursor(self):
+        from py_directus.fast_api.exceptions import ApiException
+
+        with self.assertRaises(ApiException):
+            self.client.get("/articles", params={"cursor": "not a cursor"})
+
+        # A cursor of other sort fields than the default ones
+        with self.assertRaises(ApiException) as context:
+            self.client.get("/recent", params={"cursor": encode_cursor(["date", "id"], ["2024-01-01", 1])})
+        self.assertEqual(context.exception.status_code, HTTPStatus.BAD_REQUEST)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+from py_directus import F
+from py_directus.predicate import UnsupportedQuery, compile_filter, sort_items
+
+
+ITEMS = [
+    {"id": 1, "name": "Chair", "price": "12.50", "stock": 0, "author": {"id": 7, "name": "Alice"},
+     "tags": [{"id": 1, "name": "wood"}], "date_created": "2024-01-02T10:00:00"},
+    {"id": 2, "name": "table", "price": "99.00", "stock": None, "author": None,
+     "tags": [], "date_created": "2024-01-01T10:00:00"},
+    {"id": 3, "name": "Armchair", "price": "150.00", "stock": 4, "author": {"id": 8, "name": "Bob"},
+     "tags": [{"id": 2, "name": "leather"}, {"id": 1, "name": "wood"}], "date_created": "2024-01-03T10:00:00"},
+]
+
+
+class TestPredicate(unittest.TestCase):
+    """
+    Test the local evaluation of filters and sorts.
+    """
+
+    def _ids(self, query):
+        predicate = compile_filter(query)
+        return [item["id"] for item in ITEMS if predicate(item)]
+
+    def test_operators(self):
+        self.assertEqual(self._ids(F(id=2)), [2])
+        self.assertEqual(self._ids(F(price__gt=50)), [2, 3])
+        self.assertEqual(self._ids(F(id__in=[1, 3])), [1, 3])
+        self.assertEqual(self._ids(F(name__contains="hair")), [1, 3])
+        self.assertEqual(self._ids(F(name__icontains="CHAIR")), [1, 3])
+        self.assertEqual(self._ids(F(name__starts_with="t")), [2])
+        self.assertEqual(self._ids(F(date_created__between=["2024-01-02", "2024-01-04"])), [1, 3])
+        self.assertEqual(self._ids(F(stock__null=True)), [2])
+        self.assertEqual(self._ids(F(stock__nnull=True)), [1, 3])
+
+        # Null values match no comparison, as in SQL
+        self.assertEqual(self._ids(F(stock__neq=0)), [3])
+
+    def test_logical(self):
+        self.assertEqual(self._ids(F(price__lt=100) & F(stock__nnull=True)), [1])
+        self.assertEqual(self._ids(F(id=1) | F(id=3)), [1, 3])
+        self.assertEqual(self._ids({}), [1, 2, 3])
+
+    def test_relations(self):
+        self.assertEqual(self._ids(F(author__name="Bob")), [3])
+        self.assertEqual(self._ids(F(author=7)), [1])
+        self.assertEqual(self._ids(F(author__null=True)), [2])
+
+        # To-many relations match when any related item matches
+        self.assertEqual(self._ids(F(tags__name="wood")), [1, 3])
+        self.assertEqual(self._ids({"tags": {"_none": {"name": {"_eq": "leather"}}}}), [1, 2])
+
+    def test_unsupported(self):
+        with self.assertRaises(UnsupportedQuery):
+            compile_filter(F(date_created__lte="$NOW"))
+
+        with self.assertRaises(UnsupportedQuery):
+            compile_filter({"location": {"_intersects": {"type": "Point", "coordinates": [0, 0]}}})
+
+        # Fields the items do not hold
+        with self.assertRaises(UnsupportedQuery):
+            compile_filter(F(status="published"))(ITEMS[0])
+
+    def test_collation(self):
+        # Text matching only when ignoring case or accents is left to the database collation
+        for query in (F(name="chair"), F(name__in=["TABLE"]), F(name__contains="chair"), F(author__name="Böb")):
+            with self.assertRaises(UnsupportedQuery):
+                self._ids(query)
+
+        # Text ordering too, except for dates and times
+        with self.assertRaises(UnsupportedQuery):
+            self._ids(F(name__gt="B"))
+
+        # Compared by code point when not strict
+        predicate = compile_filter(F(name="chair") | F(name__gt="s"), strict=False)
+        self.assertEqual([item["id"] for item in ITEMS if predicate(item)], [2])
+
+    def test_sort(self):
+        self.assertEqual([item["id"] for item in sort_items(ITEMS, ["-id"])], [3, 2, 1])
+        self.assertEqual([item["id"] for item in sort_items(ITEMS, ["date_created"])], [2, 1, 3])
+
+        # The order of text (decimals included) and null values depends on the database
+        with self.assertRaises(UnsupportedQuery):
+            sort_items(ITEMS, ["name"])
+
+        with self.assertRaises(UnsupportedQuery):
+            sort_items(ITEMS, ["price"])
+
+        with self.assertRaises(UnsupportedQuery):
+            sort_items(ITEMS, ["stock"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import json
+import unittest
+
+import httpx
+
+from py_directus import Directus, Param
+
+
+class TestPreparedQuery(unittest.IsolatedAsyncioTestCase):
+    """
+    Test prepared queries against a local stand-in transport.
+    """
+
+    async def asyncSetUp(self):
+        self.bodies = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            self.bodies.append(body)
+            filter_query = json.loads(body["query"]["filter"])
+            return httpx.Response(200, json={"data": [{"id": filter_query["_and"][0]["id"]["_eq"]}]})
+
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.directus = await Directus("http://directus.local", token="token", connection=connection)
+
+    async def asyncTearDown(self):
+        await self.directus.clear_cache()
+        await self.directus.close_connection()
+
+    def _request(self, **values):
+        return self.directus.collection("posts").fields("id", "title").filter(
+            id=values["id"], tags__in=values["tags"]
+        ).limit(values["limit"])
+
+    async def test_same_body_as_request(self):
+        prepared = self._request(id=Param("id"), tags=Param("tags"), limit=Param("limit")).prepare()
+
+        self.assertEqual(prepared.param_names, {"id", "tags", "limit"})
+
+        values = {"id": 7, "tags": ["a\"b", "c\\d"], "limit": 10}
+        await prepared.read(**values)
+        await self._request(**values).read()
+
+        # Same query, the filter string only differs in whitespace
+        prepared_query, request_query = [
+            {**body["query"], "filter": json.loads(body["query"]["filter"])} for body in self.bodies
+        ]
+        self.assertEqual(prepared_query, request_query)
+        self.assertEqual(json.loads(self.bodies[0]["query"]["filter"])["_and"][1], {"tags": {"_in": values["tags"]}})
+
+    async def test_missing_values(self):
+        prepared = self._request(id=Param("id"), tags=Param("tags"), limit=5).prepare()
+
+        with self.assertRaises(TypeError):
+            prepared.bind(id=1)
+
+        with self.assertRaises(ValueError):
+            Param("not a name")
+
+    async def test_immutable(self):
+        request = self._request(id=Param("id"), tags=[], limit=5)
+        prepared = request.prepare()
+
+        request.filter(title="changed").limit(1)
+        await prepared.read(id=1)
+
+        self.assertEqual(self.bodies[0]["query"]["limit"], 5)
+        self.assertNotIn("changed", self.bodies[0]["query"]["filter"])
+
+    async def test_cache(self):
+        prepared = self._request(id=Param("id"), tags=[], limit=5).prepare()
+
+        first = await prepared.read(cache=True, id=1)
+        cached = await prepared.read(cache=True, id=1)
+        other = await prepared.read(cache=True, id=2)
+
+        self.assertEqual(len(self.bodies), 2)
+        self.assertEqual(cached.item_as_dict(), first.item_as_dict())
+        self.assertEqual(other.item_as_dict(), {"id": 2})
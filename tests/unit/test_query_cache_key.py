@@ -0,0 +1,101 @@
+import json
+import logging
+import unittest
+
+import httpx
+
+from py_directus import Directus, F
+from py_directus.aggregator import Agg
+from py_directus.cache import SimpleMemoryCache
+from py_directus.query import normalize_query
+
+
+class TestQueryCacheKey(unittest.IsolatedAsyncioTestCase):
+    """
+    Test canonical query normalization and the cache keys built from it.
+    """
+
+    async def asyncSetUp(self):
+        self.requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            return httpx.Response(200, json={"data": [{"id": 1}]})
+
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.directus = await Directus("http://directus.local", token="token", connection=connection)
+
+    async def asyncTearDown(self):
+        await self.directus.clear_cache()
+        await self.directus.close_connection()
+
+    def _key(self, request) -> str:
+        return request._get_query_string_key()
+
+    def test_equal_queries(self):
+        first = self.directus.collection("posts").fields("id", "title").filter(status="published", author=1)
+        second = self.directus.collection("posts").fields("title", "id", "id").filter(author=1).filter(
+            F(status="published")
+        )
+
+        self.assertEqual(self._key(first), self._key(second))
+
+        first = self.directus.collection("posts").filter(F(id=1) | F(id=2))
+        second = self.directus.collection("posts").filter(F(id__in=[2, 1]))
+
+        self.assertEqual(self._key(first), self._key(second))
+
+        first = self.directus.collection("posts").aggregate(Agg(sum=["price", "tax"]))
+        second = self.directus.collection("posts").aggregate(Agg(sum=["tax", "price"]))
+
+        self.assertEqual(self._key(first), self._key(second))
+
+    def test_different_queries(self):
+        first = self.directus.collection("posts").sort("date").sort("title")
+        second = self.directus.collection("posts").sort("title").sort("date")
+
+        self.assertNotEqual(self._key(first), self._key(second))
+        self.assertNotEqual(
+            self._key(self.directus.collection("posts").filter(id=1)),
+            self._key(self.directus.collection("posts").filter(id=2))
+        )
+
+    def test_normalize_query(self):
+        self.assertEqual(
+            normalize_query({"fields": "b,a", "filter": F(b=1) & F(a=1), "sort": ["-b", "a"]}),
+            {
+                "fields": ["a", "b"],
+                "filter": {"_and": [{"a": {"_eq": 1}}, {"b": {"_eq": 1}}]},
+                "sort": ["-b", "a"]
+            }
+        )
+
+    def test_fixed_size_key(self):
+        cache = SimpleMemoryCache("client")
+
+        short_key = cache._get_query_key("posts")
+        long_key = cache._get_query_key(json.dumps({"filter": {"id": {"_in": list(range(1000))}}}))
+
+        self.assertEqual(len(short_key), len(long_key))
+
+    async def test_cache_hit(self):
+        await self.directus.collection("posts").fields("id", "title").filter(a=1, b=2).read(cache=True)
+        response = await self.directus.collection("posts").fields("title", "id").filter(b=2, a=1).read(cache=True)
+
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(response.item_as_dict(), {"id": 1})
+
+    async def test_debug_query(self):
+        logger = logging.getLogger("py_directus.cache")
+        previous_level = logger.level
+
+        await self.directus.cache.add("posts_query", "content")
+        self.assertIsNone(self.directus.cache.get_query(self.directus.cache._get_query_key("posts_query")))
+
+        logger.setLevel(logging.DEBUG)
+        try:
+            await self.directus.cache.add("posts_query", "content")
+        finally:
+            logger.setLevel(previous_level)
+
+        self.assertEqual(self.directus.cache.get_query(self.directus.cache._get_query_key("posts_query")), "posts_query")
@@ -0,0 +1,139 @@
+import json
+import unittest
+from typing import Optional
+
+import httpx
+
+from py_directus import Directus, F
+from py_directus.models import DirectusModel
+from py_directus.models.base import DirectusConfigDict
+from py_directus.replica import Replica
+
+
+class Language(DirectusModel):
+    model_config = DirectusConfigDict(collection="languages")
+
+    code: Optional[str] = None
+    name: Optional[str] = None
+    direction: Optional[str] = None
+    position: Optional[int] = None
+    date_created: Optional[str] = None
+    date_updated: Optional[str] = None
+
+
+class TestReplica(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the in-memory replica of a collection against a local stand-in transport.
+    """
+
+    async def asyncSetUp(self):
+        self.queries = []
+        self.languages = {
+            "en": {"code": "en", "name": "English", "direction": "ltr", "position": 1,
+                   "date_created": "2024-01-01T00:00:00", "date_updated": None},
+            "el": {"code": "el", "name": "Greek", "direction": "ltr", "position": 2,
+                   "date_created": "2024-01-01T00:00:00", "date_updated": "2024-01-02T00:00:00"},
+            "ar": {"code": "ar", "name": "Arabic", "direction": "rtl", "position": 3,
+                   "date_created": "2024-01-03T00:00:00", "date_updated": None},
+        }
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            query = json.loads(request.content)["query"]
+            self.queries.append(query)
+
+            if "aggregate" in query:
+                return httpx.Response(200, json={"data": [{"count": len(self.languages)}]})
+            if "filter" in query:
+                since = json.loads(query["filter"])["_or"][0]["date_updated"]["_gte"]
+                return httpx.Response(200, json={"data": [
+                    language for language in self.languages.values()
+                    if max(filter(None, [language["date_updated"], language["date_created"]])) >= since
+                ]})
+
+            return httpx.Response(200, json={"data": list(self.languages.values())})
+
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.directus = Directus("http://directus.local", token="token", connection=connection)
+        self.replica = await self.directus.replicate(Language, key="code", indexes=["direction"])
+
+    async def asyncTearDown(self):
+        await self.directus.close_connection()
+
+    async def test_lookups(self):
+        self.assertEqual(self.replica.get("el").name, "Greek")
+        self.assertIsNone(self.replica.get("fr"))
+        self.assertIn("ar", self.replica)
+
+        self.assertEqual([language.code for language in self.replica.filter(direction="ltr")], ["en", "el"])
+        self.assertEqual(self.replica.first(F(direction="rtl") | F(code="xx")).code, "ar")
+        self.assertEqual(self.replica.filter(direction="ltr", position__gt=1)[0].code, "el")
+
+        languages = self.replica.find(sort=["-position"], limit=2)
+        self.assertEqual([language.code for language in languages], ["ar", "el"])
+
+        # Loaded once
+        self.assertEqual(len(self.queries), 1)
+
+    async def test_indexes(self):
+        self.assertEqual(self.replica._candidates({"direction": {"_eq": "rtl"}}), {"ar"})
+        self.assertEqual(self.replica._candidates({"direction": {"_in": ["rtl", "ltr"]}}), {"ar", "en", "el"})
+        self.assertIsNone(self.replica._candidates({"name": {"_eq": "Greek"}}))
+
+    async def test_aggregate(self):
+        self.assertEqual(self.replica.aggregate(count="*"), {"count": 3})
+        self.assertEqual(
+            self.replica.aggregate(query=F(direction="ltr"), sum="position", max="position"),
+            {"sum": {"position": 3}, "max": {"position": 2}}
+        )
+        self.assertEqual(self.replica.aggregate(countDistinct="direction"), {"countDistinct": {"direction": 2}})
+
+    async def test_refresh(self):
+        self.languages["fr"] = {"code": "fr", "name": "French", "direction": "ltr", "position": 4,
+                                "date_created": "2024-02-01T00:00:00", "date_updated": None}
+        self.languages["el"] = {**self.languages["el"], "name": "Ελληνικά", "date_updated": "2024-02-02T00:00:00"}
+
+        await self.replica.refresh()
+
+        # Only the changed items are requested
+        self.assertEqual(json.loads(self.queries[1]["filter"])["_or"][0]["date_updated"]["_gte"], "2024-01-03T00:00:00")
+        self.assertEqual(self.replica.get("el").name, "Ελληνικά")
+        self.assertEqual(len(self.replica.filter(direction="ltr")), 3)
+
+        # Deleted items are noticed by the count, the replica is loaded again
+        del self.languages["fr"]
+        await self.replica.refresh()
+        self.assertNotIn("fr", self.replica)
+
+    async def test_events(self):
+        self.replica.apply_event({"event": "update", "data": [{"code": "ar", "direction": "ltr"}]})
+        self.assertEqual(self.replica.filter(direction="rtl"), [])
+        self.assertEqual(self.replica.get("ar").name, "Arabic")
+
+        self.replica.apply_event({"event": "delete", "data": ["en"]})
+        self.assertEqual(len(self.replica), 2)
+
+    async def test_numeric_keys(self):
+        replica = Replica(self.directus, "products", indexes=["price"])
+        replica._swap([{"id": 1, "price": "5.00"}, {"id": 2, "price": "5.5"}, {"id": "3", "price": "12"}])
+
+        # Decimals returned as strings are found by numbers and by their other notations
+        self.assertEqual(replica._candidates({"price": {"_eq": 5}}), {1})
+        self.assertEqual(replica._candidates({"price": {"_in": ["5.50", 12.0]}}), {2, "3"})
+        self.assertEqual([item["id"] for item in replica.filter(price=5)], [1])
+        self.assertIn("3", replica)
+        self.assertEqual(replica.aggregate(countDistinct="price"), {"countDistinct": {"price": 3}})
+
+    async def test_text_keys(self):
+        replica = Replica(self.directus, "postcodes", key="code", indexes=["code"])
+        replica._swap([{"code": "01234"}, {"code": "1234"}, {"code": "1e3"}, {"code": "1000"}])
+
+        # Items are kept by their primary key as is, zero-padded codes are text
+        self.assertEqual(len(replica), 4)
+        self.assertEqual(replica.get("01234"), {"code": "01234"})
+        self.assertEqual(replica.filter(code="01234"), [{"code": "01234"}])
+        self.assertEqual(replica.filter(code="1e3"), [{"code": "1e3"}])
+        self.assertNotIn(1234, replica)
+
+
+if __name__ == '__main__':
+    unittest.main()
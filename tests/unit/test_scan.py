@@ -0,0 +1,132 @@
+import asyncio
+import json
+import unittest
+
+import httpx
+
+from py_directus import Directus
+from py_directus.keyset import keyset_filter
+from py_directus.predicate import compile_filter, sort_items
+from py_directus.scan import partition_range
+
+
+# Two entries a day, 9 days
+ACTIVITY = [
+    {"id": id, "action": "update", "timestamp": f"2024-01-{(id + 1) // 2:02d}T00:00:00+00:00",
+     "revision": {"id": 100 + id}}
+    for id in range(1, 19)
+]
+
+
+class TestScan(unittest.IsolatedAsyncioTestCase):
+    """
+    Test partitioned scans against a local stand-in transport.
+    """
+
+    async def asyncSetUp(self):
+        self.queries = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            query = json.loads(request.content)["query"]
+            self.queries.append(query)
+
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+
+            items = list(filter(compile_filter(json.loads(query.get("filter", "{}"))), ACTIVITY))
+
+            if "aggregate" in query:
+                field = json.loads(query["aggregate"])["min"]
+                values = [item[field] for item in items]
+                return httpx.Response(200, json={"data": [
+                    {"min": {field: min(values, default=None)}, "max": {field: max(values, default=None)}}
+                ]})
+
+            items = sort_items(items, query.get("sort"))
+            return httpx.Response(200, json={"data": items[:query["limit"]]})
+
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.directus = Directus("http://directus.local", token="token", connection=connection)
+
+    async def asyncTearDown(self):
+        await self.directus.close_connection()
+
+    async def test_scan_ordered(self):
+        scan = self.directus.collection("directus_activity").scan("id", partitions=4, batch_size=2)
+        items = [item async for item in scan]
+
+        self.assertEqual([item["id"] for item in items], list(range(1, 19)))
+
+        # Batches are requested after the last item, never with an offset
+        self.assertTrue(all("offset" not in query and "page" not in query for query in self.queries))
+
+    async def test_scan_unordered(self):
+        scan = self.directus.collection("directus_activity").filter(action="update") \
+            .scan("id", start=5, end=14, partitions=3, ordered=False, batch_size=3)
+        items = [item async for item in scan]
+
+        self.assertEqual(sorted(item["id"] for item in items), list(range(5, 15)))
+
+    async def test_scan_timestamps(self):
+        # Entries with the same timestamp are told apart by their id
+        scan = self.directus.collection("directus_activity").fields("action") \
+            .scan("timestamp", partitions=3, batch_size=3)
+        items = [item async for item in scan]
+
+        self.assertEqual([item["id"] for item in items], list(range(1, 19)))
+        self.assertIn("timestamp", self.queries[-1]["fields"])
+
+    async def test_scan_related_field(self):
+        scan = self.directus.collection("directus_activity").fields("id") \
+            .scan("revision.id", start=101, end=118, partitions=3, batch_size=2)
+        items = [item async for item in scan]
+
+        self.assertEqual([item["id"] for item in items], list(range(1, 19)))
+        self.assertEqual(self.queries[-1]["fields"], "id,revision.id")
+
+    async def test_concurrency(self):
+        scan = self.directus.collection("directus_activity").scan(
+            "id", start=1, end=18, partitions=6, concurrency=2, ordered=False, batch_size=1
+        )
+        self.assertEqual(len([item async for item in scan]), 18)
+        self.assertEqual(self.max_in_flight, 2)
+
+    async def test_empty(self):
+        scan = self.directus.collection("directus_activity").filter(action="delete").scan("id")
+        self.assertEqual([item async for item in scan], [])
+
+
+class TestPartitions(unittest.TestCase):
+
+    def test_partition_integers(self):
+        self.assertEqual(partition_range(1, 10, 3), [(1, 5, False), (5, 9, False), (9, 10, True)])
+        self.assertEqual(partition_range(3, 3, 4), [(3, 3, True)])
+
+    def test_partition_dates(self):
+        self.assertEqual(
+            partition_range("2024-01-01T00:00:00Z", "2024-01-03T00:00:00Z", 2),
+            [
+                ("2024-01-01T00:00:00+00:00", "2024-01-02T00:00:00+00:00", False),
+                ("2024-01-02T00:00:00+00:00", "2024-01-03T00:00:00+00:00", True),
+            ]
+        )
+
+        with self.assertRaises(ValueError):
+            partition_range(1, "2024-01-01", 2)
+
+    def test_keyset_filter(self):
+        self.assertEqual(
+            keyset_filter(["-date", "id"], ["2024-01-01", 3]).query,
+            {"_or": [
+                {"date": {"_lt": "2024-01-01"}},
+                {"_and": [{"date": {"_eq": "2024-01-01"}}, {"id": {"_gt": 3}}]},
+            ]}
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import hashlib
+import tempfile
+import unittest
+
+import httpx
+
+from py_directus import Directus
+from py_directus.storage import FileSystemStorage, MemoryStorage, ContentAddressedStorage, LocalS3Storage
+
+
+ASSET = os.urandom(100 * 1024)
+
+
+def asset_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, content=ASSET, headers={"content-disposition": 'attachment; filename="asset.bin"'})
+
+
+class TestStorageBackends(unittest.IsolatedAsyncioTestCase):
+    """
+    Test downloads into the different storage backends.
+    """
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(asset_handler))
+        self.directus = Directus("http://directus.local", token="token", connection=connection)
+
+    async def asyncTearDown(self):
+        await self.directus.close_connection()
+        self.tmp_dir.cleanup()
+
+    async def test_file_system_storage(self):
+        storage = FileSystemStorage(self.tmp_dir.name)
+
+        for stream in [False, True]:
+            await self.directus.download_file("file-id", stream=stream, storage=storage)
+
+        names = sorted(name for name in os.listdir(self.tmp_dir.name) if not name.startswith("."))
+
+        # Existing files are never overwritten
+        self.assertEqual(len(names), 2)
+        self.assertIn("asset.bin", names)
+        for name in names:
+            self.assertEqual(await storage.open(name), ASSET)
+
+    async def test_memory_storage(self):
+        self.directus.storage = MemoryStorage()
+
+        await self.directus.download_file("file-id")
+        await self.directus.download_file("file-id", stream=True, connections=4)
+
+        self.assertEqual(len(self.directus.storage.files), 2)
+        self.assertEqual(await self.directus.storage.open("asset.bin"), ASSET)
+
+    async def test_content_addressed_storage(self):
+        storage = ContentAddressedStorage(self.tmp_dir.name)
+
+        results = await self.directus.download_many(["one", "two"], storage=storage)
+
+        digest = hashlib.sha256(ASSET).hexdigest()
+        self.assertEqual([result.result for result in results], [digest, digest])
+        self.assertEqual(os.listdir(os.path.join(self.tmp_dir.name, digest[:2])), [digest])
+
+    async def test_local_s3_storage(self):
+        storage = LocalS3Storage(self.tmp_dir.name, "bucket", prefix="assets/")
+
+        await self.directus.download_file("file-id", stream=True, storage=storage)
+        await self.directus.download_file("file-id", storage=storage)
+
+        self.assertEqual(await storage.open("asset.bin"), ASSET)
+        self.assertEqual(await storage.head("asset.bin"), {
+            "Key": "assets/asset.bin", "ETag": f'"{hashlib.md5(ASSET).hexdigest()}"', "Size": len(ASSET)
+        })
+
+        self.assertTrue(await storage.delete("asset.bin"))
+        self.assertFalse(await storage.exists("asset.bin"))
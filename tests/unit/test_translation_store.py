@@ -0,0 +1,107 @@
+import json
+import unittest
+
+import httpx
+
+from py_directus import Directus
+from py_directus.predicate import compile_filter, sort_items
+from py_directus.utils import parse_translations
+
+
+class TestTranslationStore(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the incremental translation store against a local stand-in transport.
+    """
+
+    async def asyncSetUp(self):
+        self.requests = []
+        self.activity = [{"id": 10, "item": "1", "collection": "directus_translations"}]
+        self.rows = {
+            "1": {"id": "1", "key": "hello", "language": "en-GB", "value": "Hello"},
+            "2": {"id": "2", "key": "hello", "language": "el-GR", "value": "Γεια"},
+            "3": {"id": "3", "key": "bye", "language": "en-GB", "value": "Bye"},
+        }
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            query = json.loads(request.content)["query"]
+            self.requests.append((request.url.path, query))
+
+            if request.url.path == "/activity":
+                activity = list(filter(compile_filter(json.loads(query["filter"])), self.activity))
+                activity = sort_items(activity, query["sort"])
+                return httpx.Response(200, json={"data": activity[:query["limit"]] if query["limit"] > 0 else activity})
+
+            if "filter" in query:
+                ids = json.loads(query["filter"])["id"]["_in"]
+                return httpx.Response(200, json={"data": [self.rows[id] for id in ids if id in self.rows]})
+
+            return httpx.Response(200, json={"data": list(self.rows.values())})
+
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.directus = Directus("http://directus.local", token="token", connection=connection)
+        self.store = await self.directus.translation_store(default_language="en-GB", fallbacks={"el-CY": ["el-GR"]})
+
+    async def asyncTearDown(self):
+        await self.directus.close_connection()
+
+    async def test_lookup(self):
+        self.assertEqual(self.store.translate("hello", "el-GR"), "Γεια")
+        self.assertEqual(self.store.translate("bye", "el-GR"), "Bye")
+        self.assertEqual(self.store.translate("hello", "el-CY"), "Γεια")
+        self.assertEqual(self.store.translate("hello", "el"), "Γεια")
+        self.assertEqual(self.store.translate("missing", "el-GR"), "missing")
+        self.assertEqual(self.store.fallback_chain("el-CY"), ("el-CY", "el-GR", "el", "en-GB"))
+
+        # Records grouped by key, as with `get_translations(clean=True)`
+        self.assertEqual(self.store["hello"], {"en-GB": "Hello", "el-GR": "Γεια"})
+        self.assertEqual(sorted(self.store), ["bye", "hello"])
+
+    async def test_refresh(self):
+        self.assertEqual(await self.store.refresh(), 0)
+
+        self.rows["3"] = {**self.rows["3"], "value": "Goodbye"}
+        self.rows["4"] = {"id": "4", "key": "bye", "language": "el-GR", "value": "Αντίο"}
+        del self.rows["2"]
+        self.activity += [
+            {"id": id, "item": item, "collection": "directus_translations"}
+            for id, item in [(11, "3"), (12, "4"), (13, "2")]
+        ]
+
+        self.assertEqual(await self.store.refresh(), 3)
+
+        # Only the changed records are requested
+        self.assertEqual(sorted(json.loads(self.requests[-1][1]["filter"])["id"]["_in"]), ["2", "3", "4"])
+        self.assertEqual(self.store.translate("bye", "el-GR"), "Αντίο")
+        self.assertEqual(self.store.translate("bye", "en-GB"), "Goodbye")
+        self.assertEqual(self.store.translate("hello", "el-GR"), "Hello")
+
+        self.assertEqual(await self.store.refresh(), 0)
+
+    async def test_late_activity(self):
+        self.rows["5"] = {"id": "5", "key": "thanks", "language": "en-GB", "value": "Thanks"}
+        self.activity.append({"id": 12, "item": "5", "collection": "directus_translations"})
+        self.assertEqual(await self.store.refresh(), 1)
+
+        # Activity 11 is committed after activity 12
+        self.rows["6"] = {"id": "6", "key": "yes", "language": "en-GB", "value": "Yes"}
+        self.activity.append({"id": 11, "item": "6", "collection": "directus_translations"})
+        self.assertEqual(await self.store.refresh(), 1)
+        self.assertEqual(self.store.translate("yes", "en-GB"), "Yes")
+
+        # The activities already applied are not read again
+        self.assertEqual(await self.store.refresh(), 0)
+        self.assertIn({"id": {"_nin": [10, 11, 12]}}, json.loads(self.requests[-1][1]["filter"])["_and"])
+
+    def test_parse_translations(self):
+        # Records of the same key which are not consecutive
+        translations = parse_translations([
+            {"key": "hello", "language": "en-GB", "value": "Hello"},
+            {"key": "bye", "language": "en-GB", "value": "Bye"},
+            {"key": "hello", "language": "el-GR", "value": "Γεια"},
+        ])
+
+        self.assertEqual(translations, {"hello": {"en-GB": "Hello", "el-GR": "Γεια"}, "bye": {"en-GB": "Bye"}})
+
+
+if __name__ == '__main__':
+    unittest.main()
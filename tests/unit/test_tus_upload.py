@@ -0,0 +1,151 @@
+import os
+import json
+import base64
+import tempfile
+import unittest
+from unittest import mock
+
+import httpx
+
+from py_directus import Directus
+from py_directus.tus import TusUpload, TusError
+
+
+class TusServer:
+    """
+    In-memory stand-in for the Directus TUS endpoint.
+    """
+
+    def __init__(self, fail_patches=(), expire_patches=()):
+        self.uploads = {}
+        self.metadata = {}
+        self.patches = []
+        self.fail_patches = set(fail_patches)
+        # Patches answered as if the upload expired in between
+        self.expire_patches = set(expire_patches)
+        # Records of `directus_files`, by the TUS upload id
+        self.files = {}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+
+        if request.method == "POST" and path == "/files/tus":
+            upload_id = f"tus-{len(self.files) + 1}"
+            self.uploads[upload_id] = bytearray()
+            self.files[upload_id] = {"id": f"file-{len(self.files) + 1}", "tus_id": upload_id}
+            self.metadata[upload_id] = {
+                key: base64.b64decode(value).decode('utf-8')
+                for key, value in (
+                    item.split(" ") for item in request.headers["upload-metadata"].split(",") if item
+                )
+            }
+            return httpx.Response(201, headers={"Location": f"/files/tus/{upload_id}"})
+
+        if path.startswith("/files/tus/"):
+            upload = self.uploads.get(path.rsplit("/", 1)[-1])
+
+            if upload is None:
+                return httpx.Response(409 if request.method == "PATCH" else 404)
+
+            if request.method == "HEAD":
+                return httpx.Response(200, headers={"Upload-Offset": str(len(upload))})
+
+            if request.method == "PATCH":
+                offset = int(request.headers["upload-offset"])
+                self.patches.append(offset)
+
+                if len(self.patches) in self.fail_patches:
+                    return httpx.Response(503)
+                if len(self.patches) in self.expire_patches:
+                    del self.uploads[path.rsplit("/", 1)[-1]]
+                    return httpx.Response(409)
+                if offset != len(upload):
+                    return httpx.Response(409)
+
+                upload.extend(request.content)
+                return httpx.Response(204, headers={"Upload-Offset": str(len(upload))})
+
+        if request.method == "SEARCH" and path == "/files":
+            tus_id = json.loads(json.loads(request.content)["query"]["filter"])["tus_id"]["_eq"]
+            return httpx.Response(200, json={"data": [self.files[tus_id]] if tus_id in self.files else []})
+
+        return httpx.Response(404)
+
+
+class TestTusUpload(unittest.IsolatedAsyncioTestCase):
+    """
+    Test resumable chunked uploads against a local stand-in TUS server.
+    """
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, "large.bin")
+        self.state_path = os.path.join(self.tmp_dir.name, "state.json")
+        self.content = os.urandom(10 * 1000)
+
+        with open(self.file_path, "wb") as f:
+            f.write(self.content)
+
+        self.sleep_patch = mock.patch("py_directus.utils.asyncio.sleep", new=mock.AsyncMock())
+        self.sleep_patch.start()
+
+    async def asyncTearDown(self):
+        self.sleep_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def _client(self, server: TusServer) -> Directus:
+        connection = httpx.AsyncClient(transport=httpx.MockTransport(server))
+        return Directus("http://directus.local", token="token", connection=connection)
+
+    async def test_upload(self):
+        server = TusServer()
+        directus = self._client(server)
+
+        response = await directus.upload_file_resumable(
+            self.file_path, chunk_size=3000, state_path=self.state_path, content_type="application/octet-stream"
+        )
+
+        # The file is found by its TUS upload id
+        self.assertEqual(response.item.id, "file-1")
+        self.assertEqual(bytes(server.uploads["tus-1"]), self.content)
+        self.assertEqual(server.patches, [0, 3000, 6000, 9000])
+        self.assertEqual(server.metadata["tus-1"]["filename_download"], "large.bin")
+        self.assertFalse(os.path.exists(self.state_path))
+
+    async def test_retry_failed_chunk(self):
+        server = TusServer(fail_patches={2})
+        directus = self._client(server)
+
+        await TusUpload(directus, self.file_path, chunk_size=3000, state_path=self.state_path).upload()
+
+        self.assertEqual(bytes(server.uploads["tus-1"]), self.content)
+        # Only the failed chunk is sent again
+        self.assertEqual(server.patches, [0, 3000, 3000, 6000, 9000])
+
+    async def test_resume_interrupted_upload(self):
+        server = TusServer(fail_patches={3, 4})
+        directus = self._client(server)
+
+        with self.assertRaises(TusError):
+            await TusUpload(
+                directus, self.file_path, chunk_size=3000, state_path=self.state_path, retries=1
+            ).upload()
+
+        self.assertTrue(os.path.exists(self.state_path))
+
+        await TusUpload(directus, self.file_path, chunk_size=3000, state_path=self.state_path).upload()
+
+        self.assertEqual(len(server.uploads), 1)
+        self.assertEqual(bytes(server.uploads["tus-1"]), self.content)
+        self.assertEqual(server.patches, [0, 3000, 6000, 6000, 6000, 9000])
+
+    async def test_expired_upload(self):
+        server = TusServer(expire_patches={2})
+        directus = self._client(server)
+
+        await TusUpload(directus, self.file_path, chunk_size=3000, state_path=self.state_path).upload()
+
+        # The upload is created again and sent from the start
+        self.assertEqual(len(server.uploads), 1)
+        self.assertEqual(bytes(server.uploads["tus-2"]), self.content)
+        self.assertEqual(server.patches, [0, 3000, 0, 3000, 6000, 9000])